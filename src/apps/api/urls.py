@@ -1,18 +1,40 @@
-from django.urls import path, include
+from django.urls import path, include, re_path
 from rest_framework.routers import DefaultRouter
 
-from apps.books.views import BookViewSet
-from apps.imports.views import ImportJobViewSet, ImportErrorViewSet
+from apps.books.async_views import BookAutocompleteView, BookDetailView
+from apps.books.views import BookCacheStatsView, BookViewSet
+from apps.imports.async_views import ImportJobListView, ImportJobStatusView
+from apps.imports.streams import import_job_events
+from apps.imports.views import ImportErrorViewSet, ImportJobViewSet, ImportStatsView
 
 router = DefaultRouter()
 router.register("books", BookViewSet, basename="books")
 router.register("imports/jobs", ImportJobViewSet, basename="imports-jobs")
 router.register("imports/errors", ImportErrorViewSet, basename="imports-errors")
 
+# Hot read paths are served by async views; writes on the same URLs go to the viewsets
+DETAIL_WRITES = {"put": "update", "patch": "partial_update", "delete": "destroy"}
+
 urlpatterns = [
+    re_path(r"^books/autocomplete/$", BookAutocompleteView.as_view()),
+    re_path(r"^books/bulk/$", BookViewSet.as_view({"post": "bulk"})),
+    re_path(r"^books/isbn-lookup/$", BookViewSet.as_view({"post": "isbn_lookup"})),
+    re_path(r"^books/export/$", BookViewSet.as_view({"get": "export"})),
+    re_path(r"^books/(?P<pk>[^/.]+)/$", BookDetailView.as_view(drf_view=BookViewSet.as_view(DETAIL_WRITES))),
+    re_path(r"^imports/jobs/$", ImportJobListView.as_view(drf_view=ImportJobViewSet.as_view({"post": "create"}))),
+    re_path(
+        r"^imports/jobs/(?P<pk>[^/.]+)/$",
+        ImportJobStatusView.as_view(drf_view=ImportJobViewSet.as_view(DETAIL_WRITES))
+    ),
+
     path("", include(router.urls)),
 
     # custom actions
     path("imports/jobs/<int:pk>/retry/", ImportJobViewSet.as_view({"post": "retry"})),
     path("imports/jobs/<int:pk>/cancel/", ImportJobViewSet.as_view({"post": "cancel"})),
+    path("imports/jobs/<int:pk>/errors/summary/", ImportJobViewSet.as_view({"get": "error_summary"})),
+    path("imports/jobs/<int:pk>/errors/export/", ImportJobViewSet.as_view({"get": "export_errors"})),
+    path("imports/jobs/<int:pk>/events/", import_job_events),
+    path("imports/stats/", ImportStatsView.as_view()),
+    path("books/cache/stats/", BookCacheStatsView.as_view()),
 ]
@@ -0,0 +1,59 @@
+from django.conf import settings
+from rest_framework.exceptions import ValidationError
+from apps.core.async_views import AsyncReadView, api_error, api_response
+
+from .autocomplete import autocomplete
+from .models import Book
+from .response_cache import BookResponseCache, metrics
+from .serializers import BookDetailSerializer
+
+
+class BookDetailView(AsyncReadView):
+    """
+    GET /api/books/<pk>/ - same payload as BookViewSet.retrieve, served async.
+    ``?fields=`` loads and returns only those fields.
+    """
+
+    async def read(self, request, pk):
+        try:
+            fields = BookDetailSerializer.requested_fields(request.GET)
+        except ValidationError as exc:
+            return api_response(exc.detail, status=400)
+
+        responses = BookResponseCache()
+        version, data = await responses.aget(request)
+        if metrics.record("miss" if data is None else "hit"):
+            await metrics.aflush()
+        if data is not None:
+            return api_response(data, headers={"X-Cache": "HIT"})
+
+        if fields is None:
+            books = Book.objects.defer("search_vector")
+        else:
+            books = Book.objects.only(*BookDetailSerializer.columns(fields))
+        book = await books.filter(pk=pk).afirst() if pk.isdigit() else None
+        if book is None:
+            return api_error("Not found.", 404)
+        data = BookDetailSerializer(book, context={"request": request, "fields": fields}).data
+        await responses.astore(request, version, data)
+        return api_response(data, headers={"X-Cache": "MISS"})
+
+
+class BookAutocompleteView(AsyncReadView):
+    """
+    GET /api/books/autocomplete/?q=<prefix>&limit=<n> - title and author completions
+    for a typeahead. Read-only; one prefix index range scan per field, or a cache hit.
+    """
+
+    http_method_names = ["get", "options"]
+
+    async def read(self, request):
+        try:
+            limit = int(request.GET.get("limit", settings.BOOK_AUTOCOMPLETE_LIMIT))
+        except ValueError:
+            return api_error("limit must be an integer.", 400)
+        limit = max(1, min(limit, settings.BOOK_AUTOCOMPLETE_MAX_LIMIT))
+
+        query = request.GET.get("q", "")
+        completions = await autocomplete(query, limit)
+        return api_response({"query": query, **completions}, headers={"Cache-Control": "private, max-age=10"})
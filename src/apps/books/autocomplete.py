@@ -0,0 +1,75 @@
+import hashlib
+import logging
+from typing import List
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models.functions import Lower
+
+from .models import Book
+
+logger = logging.getLogger(__name__)
+
+# Prefixes longer than this are cut; nobody types a whole title into a typeahead
+MAX_PREFIX_LENGTH = 100
+
+COMPLETION_FIELDS = ('title', 'author')
+
+
+def normalize_prefix(prefix: str) -> str:
+    return ' '.join(prefix.split()).lower()[:MAX_PREFIX_LENGTH]
+
+
+def cache_key(prefix: str, limit: int) -> str:
+    # Hashed: prefixes are user input and may contain anything memcached/redis dislike
+    digest = hashlib.md5(prefix.encode()).hexdigest()
+    return f'books:autocomplete:{limit}:{digest}'
+
+
+async def _completions(field: str, prefix: str, limit: int) -> List[str]:
+    """
+    Distinct values of ``field`` starting with ``prefix``, case-insensitively, A-Z.
+
+    ``lower(field) LIKE 'prefix%' ORDER BY lower(field) LIMIT n`` is a range scan
+    of the ``lower(field) text_pattern_ops`` index (manage_book_search --install),
+    so its cost depends on ``limit``, not on the size of the catalog.
+    """
+    key = f'{field}_key'
+    queryset = (
+        Book.objects.annotate(**{key: Lower(field)})
+        .filter(**{f'{key}__startswith': prefix})
+        .order_by(key, field)
+        .values_list(field, flat=True)
+        .distinct()[:limit]
+    )
+    values, seen = [], set()
+    async for value in queryset:
+        # 'Le Guin' and 'le guin' complete to the same thing
+        if value.lower() not in seen:
+            seen.add(value.lower())
+            values.append(value)
+    return values
+
+
+async def autocomplete(prefix: str, limit: int) -> dict:
+    """Top ``limit`` title and author completions for ``prefix``, cached for a few seconds."""
+    prefix = normalize_prefix(prefix)
+    if len(prefix) < settings.BOOK_AUTOCOMPLETE_MIN_LENGTH:
+        return {'titles': [], 'authors': []}
+
+    key = cache_key(prefix, limit)
+    try:
+        cached = await cache.aget(key)
+    except Exception as exc:
+        logger.warning(f"Autocomplete cache unavailable: {exc}")
+        cached = None
+    if cached is not None:
+        return cached
+
+    completions = {
+        f'{field}s': await _completions(field, prefix, limit) for field in COMPLETION_FIELDS
+    }
+    try:
+        await cache.aset(key, completions, timeout=settings.BOOK_AUTOCOMPLETE_CACHE_TTL)
+    except Exception as exc:
+        logger.warning(f"Autocomplete cache unavailable: {exc}")
+    return completions
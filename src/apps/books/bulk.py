@@ -0,0 +1,143 @@
+from typing import Dict, List, Optional
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Book
+from .response_cache import coalesced_catalog_changes
+from .serializers import BookBulkSerializer
+
+OPERATIONS = ('create', 'update', 'delete')
+
+
+class BookBulkWriter:
+    """
+    Applies a batch of book creates, updates and deletes in one transaction.
+
+    Each operation is ``{"op": "create", "data": {...}}``, ``{"op": "update",
+    "id": 1, "data": {...}}`` (partial) or ``{"op": "delete", "id": 1}``.
+    Fields are validated per item without queries; the targeted ids and every
+    ISBN are then checked with one lookup each instead of an ``exists()`` per
+    row. Invalid items are reported and skipped, the rest are written with a
+    set-based DELETE, ``bulk_update`` and ``bulk_create`` (in that order, so an
+    ISBN freed by a delete can be reused) and a single catalog version bump.
+    """
+
+    def __init__(self, operations: List[dict], batch_size: int = 500):
+        self.operations = operations
+        self.batch_size = batch_size
+        self.results: List[Optional[dict]] = [None] * len(operations)
+
+    def run(self) -> dict:
+        """Validate and apply; returns per-operation results and totals."""
+        items = self._parse()
+        with transaction.atomic(), coalesced_catalog_changes():
+            self._check_catalog(items)
+            self._apply([item for item in items if self.results[item['index']] is None])
+
+        totals = {status: 0 for status in ('created', 'updated', 'deleted', 'error')}
+        for result in self.results:
+            totals[result['status']] += 1
+        return {
+            'created': totals['created'],
+            'updated': totals['updated'],
+            'deleted': totals['deleted'],
+            'errors': totals['error'],
+            'results': self.results,
+        }
+
+    def _error(self, index: int, op, errors) -> None:
+        self.results[index] = {'index': index, 'op': op, 'status': 'error', 'errors': errors}
+
+    def _parse(self) -> List[dict]:
+        """Operations whose shape and fields are valid, with validated data."""
+        items, targeted, isbns = [], {}, {}
+        for index, operation in enumerate(self.operations):
+            op = operation.get('op') if isinstance(operation, dict) else None
+            if op not in OPERATIONS:
+                self._error(index, op, {'op': [f"Must be one of: {', '.join(OPERATIONS)}."]})
+                continue
+
+            book_id = operation.get('id')
+            if op != 'create':
+                if not isinstance(book_id, int) or isinstance(book_id, bool):
+                    self._error(index, op, {'id': ["An integer book id is required."]})
+                    continue
+                if book_id in targeted:
+                    self._error(index, op, {'id': [f"Book {book_id} is already changed by item {targeted[book_id]}."]})
+                    continue
+
+            data = {}
+            if op != 'delete':
+                serializer = BookBulkSerializer(data=operation.get('data'), partial=op == 'update')
+                if not serializer.is_valid():
+                    self._error(index, op, serializer.errors)
+                    continue
+                data = serializer.validated_data
+                isbn = data.get('isbn')
+                if isbn is not None and isbn in isbns:
+                    self._error(index, op, {'isbn': [f"ISBN {isbn} is already used by item {isbns[isbn]}."]})
+                    continue
+                if isbn is not None:
+                    isbns[isbn] = index
+
+            if op != 'create':
+                targeted[book_id] = index
+            items.append({'index': index, 'op': op, 'id': book_id, 'data': data})
+        return items
+
+    def _check_catalog(self, items: List[dict]) -> None:
+        """Missing books and ISBNs taken by a book this batch does not delete: two queries."""
+        ids = {item['id'] for item in items if item['op'] != 'create'}
+        # Locked, so updates cannot overwrite a concurrent edit with stale values
+        books = Book.objects.select_for_update().defer('search_vector').in_bulk(ids) if ids else {}
+        isbns = {item['data']['isbn'] for item in items if 'isbn' in item['data']}
+        owners: Dict[str, int] = dict(
+            Book.objects.filter(isbn__in=isbns).values_list('isbn', 'id')
+        ) if isbns else {}
+        deleted = {item['id'] for item in items if item['op'] == 'delete'}
+
+        for item in items:
+            if item['op'] != 'create':
+                item['book'] = books.get(item['id'])
+                if item['book'] is None:
+                    self._error(item['index'], item['op'], {'id': [f"Book {item['id']} not found."]})
+                    continue
+            owner = owners.get(item['data'].get('isbn'))
+            if owner is not None and owner != item['id'] and owner not in deleted:
+                self._error(item['index'], item['op'], {'isbn': ["Book with this ISBN already exists."]})
+
+    def _apply(self, items: List[dict]) -> None:
+        deletes = [item for item in items if item['op'] == 'delete']
+        updates = [item for item in items if item['op'] == 'update']
+        creates = [item for item in items if item['op'] == 'create']
+
+        if deletes:
+            Book.objects.filter(pk__in=[item['id'] for item in deletes]).delete()
+            for item in deletes:
+                self.results[item['index']] = {
+                    'index': item['index'], 'op': 'delete', 'status': 'deleted', 'id': item['id']
+                }
+
+        if updates:
+            # bulk_update skips auto_now
+            now = timezone.now()
+            fields = {'updated_at'}
+            for item in updates:
+                for name, value in item['data'].items():
+                    setattr(item['book'], name, value)
+                    fields.add(name)
+                item['book'].updated_at = now
+            Book.objects.bulk_update([item['book'] for item in updates], sorted(fields), batch_size=self.batch_size)
+            for item in updates:
+                self.results[item['index']] = {
+                    'index': item['index'], 'op': 'update', 'status': 'updated', 'id': item['id']
+                }
+
+        if creates:
+            books = Book.objects.bulk_create(
+                [Book(**item['data']) for item in creates], batch_size=self.batch_size
+            )
+            for item, book in zip(creates, books):
+                self.results[item['index']] = {
+                    'index': item['index'], 'op': 'create', 'status': 'created', 'id': book.pk
+                }
@@ -0,0 +1,97 @@
+import csv
+import io
+import json
+import zlib
+from itertools import islice
+from typing import Iterable, Iterator, Union
+from django.db.models import QuerySet
+from apps.core.renderers import orjson
+from apps.core.utils import keyset_iterator
+
+from .models import Book
+
+EXPORT_FIELDS = ['id', 'title', 'author', 'isbn', 'publication_year', 'created_at', 'updated_at']
+
+
+def _dumps(record: dict) -> str:
+    if orjson is not None:
+        return orjson.dumps(record).decode()
+    # Byte for byte what orjson writes
+    return json.dumps(record, ensure_ascii=False, separators=(',', ':'))
+
+
+def gzip_stream(chunks: Iterable[Union[str, bytes]], level: int = 6) -> Iterator[bytes]:
+    """Gzip a stream of chunks incrementally; only the compressor's window is held."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode() if isinstance(chunk, str) else chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+class CatalogExporter:
+    """
+    Stream every Book of ``queryset`` as CSV or NDJSON in constant memory.
+
+    Rows are read by primary-key keyset in batches of ``batch_size``, each
+    through a server-side cursor, as ``values_list`` tuples; every chunk the
+    stream yields holds one batch of encoded rows.
+    """
+
+    FORMATS = {
+        'csv': 'text/csv',
+        'ndjson': 'application/x-ndjson',
+    }
+
+    def __init__(self, queryset: QuerySet = None, batch_size: int = 5000):
+        self.queryset = Book.objects.all() if queryset is None else queryset
+        self.batch_size = batch_size
+
+    def iter_rows(self) -> Iterator[tuple]:
+        return keyset_iterator(
+            self.queryset,
+            ordering=('pk',),
+            batch_size=self.batch_size,
+            values=EXPORT_FIELDS,
+            server_side=True,
+        )
+
+    def iter_batches(self) -> Iterator[list]:
+        rows = self.iter_rows()
+        while True:
+            batch = list(islice(rows, self.batch_size))
+            if not batch:
+                return
+            yield batch
+
+    def stream(self, output: str = 'csv', compress: bool = False) -> Iterator[Union[str, bytes]]:
+        chunks = self._ndjson() if output == 'ndjson' else self._csv()
+        return gzip_stream(chunks) if compress else chunks
+
+    def filename(self, output: str = 'csv', compress: bool = False) -> str:
+        return f"books.{output}{'.gz' if compress else ''}"
+
+    @staticmethod
+    def _record(row: tuple) -> dict:
+        record = dict(zip(EXPORT_FIELDS, row))
+        record['created_at'] = record['created_at'].isoformat()
+        record['updated_at'] = record['updated_at'].isoformat()
+        return record
+
+    def _csv(self) -> Iterator[str]:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(EXPORT_FIELDS)
+        yield buffer.getvalue()
+        for batch in self.iter_batches():
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerows(
+                [*row[:5], row[5].isoformat(), row[6].isoformat()] for row in batch
+            )
+            yield buffer.getvalue()
+
+    def _ndjson(self) -> Iterator[str]:
+        for batch in self.iter_batches():
+            yield ''.join(_dumps(self._record(row)) + '\n' for row in batch)
@@ -0,0 +1,25 @@
+from rest_framework import filters
+
+from .search import SEARCH_RANK, search_books
+
+
+class BookSearchFilter(filters.SearchFilter):
+    """``?search=`` through the book search backend (full-text on PostgreSQL)."""
+
+    def filter_queryset(self, request, queryset, view):
+        query = ' '.join(self.get_search_terms(request))
+
+        def fallback(queryset, query):
+            # DRF's per-term icontains, as before full-text search existed
+            return super(BookSearchFilter, self).filter_queryset(request, queryset, view)
+
+        return search_books(queryset, query, fallback=fallback)
+
+
+class BookOrderingFilter(filters.OrderingFilter):
+    """Ranked searches default to best match first rather than the view's ordering."""
+
+    def get_ordering(self, request, queryset, view):
+        if not request.query_params.get(self.ordering_param) and SEARCH_RANK in queryset.query.annotations:
+            return [f'-{SEARCH_RANK}']
+        return super().get_ordering(request, queryset, view)
@@ -0,0 +1,116 @@
+import re
+from base64 import b64encode
+from typing import Dict, List, Optional
+from django.db import connections
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+from .models import BARE_ISBN, Book
+from .search import normalize_isbn
+from .serializers import BookListSerializer
+
+# Above this many candidate ISBNs PostgreSQL gets one array parameter, other databases several queries
+IN_LIST_LIMIT = 500
+
+OUTPUTS = ('books', 'bitmap')
+
+
+def isbn10_to_13(isbn10: str) -> str:
+    body = '978' + isbn10[:9]
+    check = (10 - sum(int(digit) * (3 if i % 2 else 1) for i, digit in enumerate(body)) % 10) % 10
+    return f'{body}{check}'
+
+
+def isbn13_to_10(isbn13: str) -> Optional[str]:
+    """Only 978-prefixed ISBN-13s have an ISBN-10"""
+    if not isbn13.startswith('978'):
+        return None
+    body = isbn13[3:12]
+    check = (11 - sum(int(digit) * (10 - i) for i, digit in enumerate(body)) % 11) % 11
+    return f"{body}{'X' if check == 10 else check}"
+
+
+def bare_isbn(value: str) -> str:
+    """``value`` as BARE_ISBN compares it"""
+    return re.sub(r'[ -]', '', value.strip()).upper()
+
+
+def isbn_variants(value: str) -> List[str]:
+    """The bare forms a book may be stored under: as sent, and its ISBN-10/13 counterpart."""
+    bare = bare_isbn(value)
+    if normalize_isbn(bare) is None:
+        return [bare] if bare else []
+    counterpart = isbn10_to_13(bare) if len(bare) == 10 else isbn13_to_10(bare)
+    return [form for form in (bare, counterpart) if form]
+
+
+def isbn_filter(candidates: List[str], vendor: str) -> Q:
+    if vendor == 'postgresql' and len(candidates) > IN_LIST_LIMIT:
+        # One array parameter, hash semi-joined against the bare isbn index, instead
+        # of thousands of bind parameters in an IN list
+        return Q(bare_isbn__in=RawSQL('SELECT unnest(%s::text[])', (candidates,)))
+    return Q(bare_isbn__in=candidates)
+
+
+def lookup_isbns(isbns: List[str], fields: Optional[List[str]] = None, queryset=None) -> List[Optional[dict]]:
+    """
+    The book (as ``values()`` of BookListSerializer's fields) for each of
+    ``isbns``, in order; None where the catalog has none.
+
+    Stored and requested ISBNs are compared bare, so ``978-0-441-01359-3``
+    finds a book stored as ``9780441013593`` and the other way round. Every
+    variant of every ISBN is matched by one ``BARE_ISBN IN (...)`` query;
+    very long lists become an array join on PostgreSQL and batches of
+    IN_LIST_LIMIT elsewhere.
+    """
+    queryset = Book.objects.all() if queryset is None else queryset
+    vendor = connections[queryset.db].vendor
+    variants = [isbn_variants(isbn) for isbn in isbns]
+    candidates = list(dict.fromkeys(form for forms in variants for form in forms))
+
+    if vendor == 'postgresql':
+        batches = [candidates]
+    else:
+        batches = [candidates[i:i + IN_LIST_LIMIT] for i in range(0, len(candidates), IN_LIST_LIMIT)]
+
+    fields = list(dict.fromkeys([*(fields or BookListSerializer.Meta.fields), 'isbn']))
+    books: Dict[str, dict] = {}
+    for batch in batches:
+        if batch:
+            rows = queryset.annotate(bare_isbn=BARE_ISBN).filter(isbn_filter(batch, vendor)).order_by()
+            for row in rows.values(*fields, 'bare_isbn'):
+                books[row.pop('bare_isbn')] = row
+    return [next((books[form] for form in forms if form in books), None) for forms in variants]
+
+
+def found_bitmap(matches: List[Optional[dict]]) -> str:
+    """Base64 of one bit per requested ISBN, most significant bit first, set when found."""
+    bits = bytearray((len(matches) + 7) // 8)
+    for i, match in enumerate(matches):
+        if match is not None:
+            bits[i // 8] |= 0x80 >> (i % 8)
+    return b64encode(bytes(bits)).decode()
+
+
+def lookup_response(isbns: List[str], output: str = 'books') -> dict:
+    if output == 'bitmap':
+        matches = lookup_isbns(isbns, fields=['isbn'])
+        return {
+            'requested': len(isbns),
+            'found': sum(match is not None for match in matches),
+            'bitmap': found_bitmap(matches),
+        }
+
+    # Keyed by ISBN: a repeated one is looked up, and counted, once
+    isbns = list(dict.fromkeys(isbns))
+    matches = lookup_isbns(isbns)
+    found = [(isbn, match) for isbn, match in zip(isbns, matches) if match is not None]
+    return {
+        'requested': len(isbns),
+        'found': len(found),
+        # Keyed by the ISBN as sent
+        'books': dict(zip(
+            (isbn for isbn, _ in found), BookListSerializer.from_values(match for _, match in found)
+        )),
+        'missing': [isbn for isbn, match in zip(isbns, matches) if match is None],
+    }
@@ -0,0 +1,83 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+from apps.books.models import Book
+from apps.books.serializers import BookListSerializer
+from apps.core.renderers import FastJSONRenderer, orjson
+
+
+class Rollback(Exception):
+    pass
+
+
+def serializer_page(queryset, renderer):
+    return renderer.render(BookListSerializer(list(queryset), many=True).data)
+
+
+def values_page(queryset, renderer):
+    return renderer.render(BookListSerializer.from_values(BookListSerializer.values_queryset(queryset)))
+
+
+PATHS = {
+    'serializer+json': (serializer_page, JSONRenderer),
+    'values+json': (values_page, JSONRenderer),
+    'values+orjson': (values_page, FastJSONRenderer),
+}
+
+
+def run_paths(queryset, repeat):
+    """Best-of-``repeat`` seconds per page for each path; all must render the same bytes."""
+    timings, outputs = {}, {}
+    for name, (build, renderer_class) in PATHS.items():
+        renderer = renderer_class()
+        best = float('inf')
+        for _ in range(repeat):
+            started = time.perf_counter()
+            outputs[name] = build(queryset, renderer)
+            best = min(best, time.perf_counter() - started)
+        timings[name] = best
+    if len(set(outputs.values())) != 1:
+        raise CommandError("Serialization paths disagree; the fast path no longer matches the schema")
+    return timings, len(outputs['serializer+json'])
+
+
+class Command(BaseCommand):
+    help = "Time a book list page through the serializer and through the values()/orjson fast path"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--page-size', type=int, nargs='+', default=[20, 100, 1000])
+        parser.add_argument('--repeat', type=int, default=20, help="Runs per path; the best is kept")
+
+    def handle(self, *args, **options):
+        if orjson is None:
+            self.stdout.write(self.style.WARNING("orjson is not installed; values+orjson uses json"))
+
+        largest = max(options['page_size'])
+        try:
+            # Synthetic rows when the catalog is smaller than the largest page; rolled back
+            with transaction.atomic():
+                missing = largest - Book.objects.count()
+                if missing > 0:
+                    Book.objects.bulk_create(
+                        Book(title=f"Benchmark Book {i} – édition", author=f"Author {i % 97}",
+                             isbn=f"979{i:010d}", publication_year=1900 + i % 120 if i % 10 else None)
+                        for i in range(missing)
+                    )
+                self._report(options['page_size'], options['repeat'])
+                raise Rollback
+        except Rollback:
+            pass
+
+    def _report(self, page_sizes, repeat):
+        self.stdout.write(
+            f"{'rows':>6} " + ' '.join(f"{name + ' ms':>18}" for name in PATHS) + f" {'speedup':>8} {'bytes':>9}"
+        )
+        for page_size in page_sizes:
+            queryset = Book.objects.defer('search_vector').order_by('-created_at', '-pk')[:page_size]
+            timings, size = run_paths(queryset, repeat)
+            speedup = timings['serializer+json'] / timings['values+orjson']
+            self.stdout.write(
+                f"{page_size:>6} " + ' '.join(f"{timings[name] * 1000:>18.2f}" for name in PATHS) +
+                f" {speedup:>7.1f}x {size:>9}"
+            )
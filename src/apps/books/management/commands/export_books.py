@@ -0,0 +1,53 @@
+import sys
+from django.core.management.base import BaseCommand, CommandError
+from django_filters.rest_framework import DjangoFilterBackend
+from apps.books.export import CatalogExporter
+from apps.books.models import Book
+from apps.books.views import BookViewSet
+
+
+class Command(BaseCommand):
+    help = "Stream the book catalog to a CSV or NDJSON file (or stdout) in constant memory"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--format', choices=list(CatalogExporter.FORMATS), default='csv')
+        parser.add_argument('--output', default='-', help="File to write; '-' for stdout")
+        parser.add_argument('--gzip', action='store_true', help="Gzip the export")
+        parser.add_argument('--batch-size', type=int, default=5000)
+        # Same filters as GET /api/books/ and /api/books/export/
+        for field in BookViewSet.filterset_fields:
+            parser.add_argument(f"--{field.replace('_', '-')}", dest=field)
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError("--batch-size must be positive")
+
+        # Parsed and validated by the same FilterSet as the API's
+        queryset = Book.objects.all()
+        filterset = DjangoFilterBackend().get_filterset_class(BookViewSet(), queryset)(
+            {field: options[field] for field in BookViewSet.filterset_fields if options[field] is not None},
+            queryset=queryset,
+        )
+        if not filterset.is_valid():
+            raise CommandError('; '.join(
+                f"--{field.replace('_', '-')}: {' '.join(errors)}" for field, errors in filterset.errors.items()
+            ))
+        exporter = CatalogExporter(filterset.qs, batch_size=options['batch_size'])
+        chunks = exporter.stream(options['format'], compress=options['gzip'])
+
+        if options['output'] == '-':
+            for chunk in chunks:
+                if isinstance(chunk, bytes):
+                    sys.stdout.buffer.write(chunk)
+                else:
+                    self.stdout.write(chunk, ending='')
+            return
+
+        if options['gzip']:
+            f = open(options['output'], 'wb')
+        else:
+            f = open(options['output'], 'w', encoding='utf-8', newline='')
+        with f:
+            for chunk in chunks:
+                f.write(chunk)
+        self.stderr.write(f"Exported the catalog to {options['output']}")
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand
+
+from apps.books.search import BookSearchIndex
+
+
+class Command(BaseCommand):
+    help = "Install and backfill PostgreSQL full-text and trigram search for books"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--install', action='store_true',
+            help="Create pg_trgm, the search_vector trigger and the GIN indexes (built concurrently)"
+        )
+        parser.add_argument('--rebuild', action='store_true', help="Fill search_vector for rows missing it")
+        parser.add_argument('--all', action='store_true', help="With --rebuild, recompute every row")
+        parser.add_argument('--batch-size', type=int, default=10000)
+
+    def handle(self, *args, **options):
+        index = BookSearchIndex()
+
+        if not index.is_supported:
+            self.stdout.write(self.style.WARNING(
+                "Full-text search requires PostgreSQL; book search uses icontains"
+            ))
+            return
+
+        if options['install'] and index.install():
+            self.stdout.write(self.style.SUCCESS(f"Installed book search ({index.config})"))
+
+        if not index.is_installed():
+            self.stdout.write(self.style.WARNING("Book search is not installed; run with --install"))
+            return
+
+        if options['rebuild']:
+            updated = index.rebuild(options['batch_size'], only_missing=not options['all'])
+            self.stdout.write(f"Indexed {updated} books")
@@ -1,7 +1,49 @@
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.utils import timezone
 
+from .response_cache import catalog_changed
+
+
+class BookQuerySet(models.QuerySet):
+    """Set-based writes invalidate cached book responses like single saves do."""
+
+    def bulk_create(self, *args, **kwargs):
+        books = super().bulk_create(*args, **kwargs)
+        catalog_changed()
+        return books
+
+    def bulk_update(self, *args, **kwargs):
+        updated = super().bulk_update(*args, **kwargs)
+        catalog_changed()
+        return updated
+
+    def update(self, **kwargs):
+        updated = super().update(**kwargs)
+        catalog_changed()
+        return updated
+
+    def delete(self):
+        deleted = super().delete()
+        catalog_changed()
+        return deleted
+
+
+class BareISBN(models.Func):
+    """
+    An ISBN as lookups compare it: hyphens and spaces removed, upper case.
+
+    The literals are part of the SQL rather than bound parameters, so queries
+    repeat the ``books_isbn_bare`` index expression exactly and can use it.
+    """
+
+    template = "UPPER(REPLACE(REPLACE(%(expressions)s, '-', ''), ' ', ''))"
+    output_field = models.CharField()
+
+
+BARE_ISBN = BareISBN('isbn')
+
 
 class Book(models.Model):
     title = models.CharField(max_length=512)
@@ -17,13 +59,21 @@ class Book(models.Model):
     )
     created_at = models.DateTimeField(default=timezone.now)
     updated_at = models.DateTimeField(auto_now=True)
+    # Maintained by a database trigger on PostgreSQL (manage_book_search --install)
+    search_vector = SearchVectorField(null=True, blank=True, editable=False)
+
+    objects = BookQuerySet.as_manager()
 
     class Meta:
         db_table = 'books'
         indexes = [
             models.Index(fields=['isbn']),
-            models.Index(fields=['author']),
-            models.Index(fields=['created_at']),
+            models.Index(BARE_ISBN, name='books_isbn_bare'),
+            # One per ordering the API offers, with the cursor pagination tie-breaker
+            models.Index(fields=['title', 'id']),
+            models.Index(fields=['author', 'id']),
+            models.Index(fields=['publication_year', 'id']),
+            models.Index(fields=['created_at', 'id']),
         ]
         ordering = ['-created_at']
 
@@ -32,4 +82,10 @@ class Book(models.Model):
 
     def save(self, *args, **kwargs):
         self.full_clean()
-        super().save(*args, **kwargs)
\ No newline at end of file
+        super().save(*args, **kwargs)
+        catalog_changed()
+
+    def delete(self, *args, **kwargs):
+        deleted = super().delete(*args, **kwargs)
+        catalog_changed()
+        return deleted
\ No newline at end of file
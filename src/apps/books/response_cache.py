@@ -0,0 +1,186 @@
+import hashlib
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional, Tuple
+from uuid import uuid4
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+CATALOG_VERSION_KEY = 'books:catalog-version'
+METRIC_KEYS = {'hit': 'books:response-cache:hits', 'miss': 'books:response-cache:misses'}
+
+_batch = threading.local()
+
+
+def bump_catalog_version() -> None:
+    """Invalidate every cached book response at once; old entries just age out."""
+    try:
+        # A fresh token rather than INCR: an evicted counter restarting at 1 could
+        # make entries from an older catalog current again
+        cache.set(CATALOG_VERSION_KEY, uuid4().hex, timeout=None)
+    except Exception as exc:
+        logger.warning(f"Could not bump the book catalog version: {exc}")
+
+
+def catalog_changed() -> None:
+    """Record a Book write; the version is bumped once the transaction commits."""
+    if getattr(_batch, 'active', False):
+        _batch.dirty = True
+        return
+    transaction.on_commit(bump_catalog_version)
+
+
+@contextmanager
+def coalesced_catalog_changes():
+    """
+    Collapse the Book writes inside the block into one version bump per
+    flush_catalog_changes() call, and one at the end. Used by imports, which
+    would otherwise bump the version for every row.
+    """
+    _batch.active, _batch.dirty = True, False
+    try:
+        yield
+    finally:
+        _batch.active = False
+        if _batch.dirty:
+            _batch.dirty = False
+            transaction.on_commit(bump_catalog_version)
+
+
+def flush_catalog_changes() -> None:
+    if getattr(_batch, 'active', False) and _batch.dirty:
+        _batch.dirty = False
+        transaction.on_commit(bump_catalog_version)
+
+
+class CacheMetrics:
+    """
+    Hit/miss counters shared by all workers through the cache.
+
+    Counted in process and added to the shared counters every ``flush_every``
+    events or ``flush_seconds``, so a request does not pay an extra round trip.
+    """
+
+    def __init__(self, flush_every: int = 50, flush_seconds: float = 10.0):
+        self.flush_every = flush_every
+        self.flush_seconds = flush_seconds
+        self._lock = threading.Lock()
+        self._pending = {'hit': 0, 'miss': 0}
+        self._flushed_at = time.monotonic()
+
+    def record(self, outcome: str) -> bool:
+        """Count a hit or miss; True when the caller should flush."""
+        with self._lock:
+            self._pending[outcome] += 1
+            return (
+                sum(self._pending.values()) >= self.flush_every or
+                time.monotonic() - self._flushed_at >= self.flush_seconds
+            )
+
+    def _take(self) -> dict:
+        with self._lock:
+            pending, self._pending = self._pending, {'hit': 0, 'miss': 0}
+            self._flushed_at = time.monotonic()
+        return {outcome: count for outcome, count in pending.items() if count}
+
+    def flush(self) -> None:
+        for outcome, count in self._take().items():
+            try:
+                cache.add(METRIC_KEYS[outcome], 0, timeout=None)
+                cache.incr(METRIC_KEYS[outcome], count)
+            except Exception as exc:
+                logger.warning(f"Could not record book cache metrics: {exc}")
+
+    async def aflush(self) -> None:
+        for outcome, count in self._take().items():
+            try:
+                await cache.aadd(METRIC_KEYS[outcome], 0, timeout=None)
+                await cache.aincr(METRIC_KEYS[outcome], count)
+            except Exception as exc:
+                logger.warning(f"Could not record book cache metrics: {exc}")
+
+    def snapshot(self) -> dict:
+        """Totals across workers, this process's unflushed counts included."""
+        self.flush()
+        counts = cache.get_many(list(METRIC_KEYS.values()))
+        hits = counts.get(METRIC_KEYS['hit'], 0)
+        misses = counts.get(METRIC_KEYS['miss'], 0)
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': round(hits / (hits + misses), 4) if hits + misses else None,
+            'catalog_version': cache.get(CATALOG_VERSION_KEY),
+        }
+
+
+metrics = CacheMetrics()
+
+
+class BookResponseCache:
+    """
+    Serialized book list/detail responses, keyed by URL and tagged with the
+    catalog version.
+
+    As with the import status snapshots, an entry is only served while it was
+    built under the current version, and both come back from one ``get_many``.
+    Any Book write bumps the version (``catalog_changed``), so invalidation is a
+    single SET however many entries exist.
+    """
+
+    @staticmethod
+    def key(request) -> str:
+        # Normalized: parameter order, blank values and surrounding spaces do not matter
+        params = sorted(
+            (name, value.strip())
+            for name, values in request.GET.lists()
+            for value in values if value.strip()
+        )
+        # Absolute, because next/previous links in the payload are
+        raw = f"{request.build_absolute_uri(request.path)}?{params}"
+        return f'books:response:{hashlib.md5(raw.encode()).hexdigest()}'
+
+    def get(self, request) -> Tuple[Optional[str], Optional[dict]]:
+        """Current catalog version and the cached payload, if built under it."""
+        key = self.key(request)
+        try:
+            cached = cache.get_many([CATALOG_VERSION_KEY, key])
+        except Exception as exc:
+            logger.warning(f"Book response cache unavailable: {exc}")
+            return None, None
+        return self._current(key, cached)
+
+    async def aget(self, request) -> Tuple[Optional[str], Optional[dict]]:
+        key = self.key(request)
+        try:
+            cached = await cache.aget_many([CATALOG_VERSION_KEY, key])
+        except Exception as exc:
+            logger.warning(f"Book response cache unavailable: {exc}")
+            return None, None
+        return self._current(key, cached)
+
+    def store(self, request, version: Optional[str], data) -> None:
+        try:
+            cache.set(self.key(request), {'version': version, 'data': data},
+                      timeout=settings.BOOK_RESPONSE_CACHE_TTL)
+        except Exception as exc:
+            logger.warning(f"Book response cache unavailable: {exc}")
+
+    async def astore(self, request, version: Optional[str], data) -> None:
+        try:
+            await cache.aset(self.key(request), {'version': version, 'data': data},
+                             timeout=settings.BOOK_RESPONSE_CACHE_TTL)
+        except Exception as exc:
+            logger.warning(f"Book response cache unavailable: {exc}")
+
+    @staticmethod
+    def _current(key: str, cached: dict) -> Tuple[Optional[str], Optional[dict]]:
+        version = cached.get(CATALOG_VERSION_KEY)
+        entry = cached.get(key)
+        if entry is None or entry['version'] != version:
+            return version, None
+        return version, entry['data']
@@ -0,0 +1,184 @@
+import logging
+import re
+from typing import Callable, Optional
+from django.conf import settings
+from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramWordSimilarity
+from django.db import connection, connections
+from django.db.models import F, FloatField, Q, QuerySet, Value
+from django.db.models.functions import Cast, Coalesce, Greatest
+
+from .models import BARE_ISBN
+
+logger = logging.getLogger(__name__)
+
+# Annotation holding the relevance of each hit; the default ordering of a search
+SEARCH_RANK = 'search_rank'
+
+ISBN_RE = re.compile(r'\d{9}[\dX]|\d{13}')
+CONFIG_RE = re.compile(r'[a-z_]+')
+
+
+def normalize_isbn(query: str) -> Optional[str]:
+    """The bare ISBN-10/13 when ``query`` is one (hyphens and spaces allowed), else None"""
+    candidate = re.sub(r'[\s-]', '', query).upper()
+    return candidate if ISBN_RE.fullmatch(candidate) else None
+
+
+def is_valid_isbn(isbn: str) -> bool:
+    """Whether a bare ISBN-10/13 (as ``normalize_isbn`` returns it) has a correct check digit"""
+    if len(isbn) == 10:
+        digits = [10 if char == 'X' else int(char) for char in isbn]
+        return sum(digit * (10 - i) for i, digit in enumerate(digits)) % 11 == 0
+    return sum(int(char) * (3 if i % 2 else 1) for i, char in enumerate(isbn)) % 10 == 0
+
+
+def default_fallback(queryset: QuerySet, query: str) -> QuerySet:
+    return queryset.filter(
+        Q(title__icontains=query) |
+        Q(author__icontains=query) |
+        Q(isbn__icontains=query)
+    )
+
+
+def search_books(queryset: QuerySet, query: str,
+                 fallback: Callable[[QuerySet, str], QuerySet] = default_fallback) -> QuerySet:
+    """
+    Filter books matching ``query``, best match first where the database can rank.
+
+    A valid ISBN is first looked up exactly, however the catalog hyphenates it
+    (the ``books_isbn_bare`` index); without a hit, or for any other query, on
+    PostgreSQL the query matches the ``search_vector`` tsvector (GIN) or is
+    word-similar to the title or author (pg_trgm GIN), and is annotated with
+    ``search_rank``. Other databases use ``fallback``, i.e. the ``icontains`` scan.
+    """
+    query = query.strip()
+    if not query:
+        return queryset
+
+    isbn = normalize_isbn(query)
+    if isbn and is_valid_isbn(isbn):
+        exact = queryset.alias(bare_isbn=BARE_ISBN).filter(bare_isbn=isbn)
+        if exact.exists():
+            return exact
+
+    if connections[queryset.db].vendor != 'postgresql':
+        return fallback(queryset, query)
+    return full_text_search(queryset, query)
+
+
+def full_text_search(queryset: QuerySet, query: str) -> QuerySet:
+    search_query = SearchQuery(query, config=settings.BOOK_SEARCH_CONFIG, search_type='websearch')
+    matches = (
+        Q(search_vector=search_query) |
+        Q(title__trigram_word_similar=query) |
+        Q(author__trigram_word_similar=query)
+    )
+    digits = re.sub(r'[\s-]', '', query)
+    if digits.isdigit():
+        # Partial ISBNs; LIKE '%...%' is served by the isbn trigram index
+        matches |= Q(isbn__contains=digits)
+
+    # ts_rank and similarity are float4: cast so the rank survives a cursor round trip
+    rank = Cast(
+        Coalesce(SearchRank(F('search_vector'), search_query), Value(0.0)) +
+        Greatest(TrigramWordSimilarity(query, 'title'), TrigramWordSimilarity(query, 'author')),
+        FloatField()
+    )
+    return queryset.filter(matches).annotate(**{SEARCH_RANK: rank})
+
+
+class BookSearchIndex:
+    """
+    The PostgreSQL side of book search: the ``search_vector`` trigger, the GIN
+    indexes behind it and the prefix indexes behind autocomplete.
+
+    ``search_vector`` is maintained by a BEFORE INSERT/UPDATE trigger, so bulk
+    inserts and raw updates stay indexed without the application writing it.
+    On other backends every operation is a no-op.
+    """
+
+    FUNCTION = 'books_search_vector_update'
+    TRIGGER = 'books_search_vector_trigger'
+    INDEXES = {
+        'books_search_vector_gin': 'USING gin (search_vector)',
+        'books_title_trgm': 'USING gin (title gin_trgm_ops)',
+        'books_author_trgm': 'USING gin (author gin_trgm_ops)',
+        'books_isbn_trgm': 'USING gin (isbn gin_trgm_ops)',
+        # Case-insensitive prefix scans for autocomplete, in any collation
+        'books_title_prefix': '(lower(title) text_pattern_ops)',
+        'books_author_prefix': '(lower(author) text_pattern_ops)',
+    }
+
+    def __init__(self, table: str = 'books', config: Optional[str] = None):
+        self.table = table
+        self.config = config or settings.BOOK_SEARCH_CONFIG
+        if not CONFIG_RE.fullmatch(self.config):
+            raise ValueError(f"Invalid text search configuration: {self.config}")
+
+    @property
+    def is_supported(self) -> bool:
+        return connection.vendor == 'postgresql'
+
+    def is_installed(self) -> bool:
+        if not self.is_supported:
+            return False
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT 1 FROM pg_trigger t JOIN pg_class c ON c.oid = t.tgrelid "
+                "WHERE c.relname = %s AND t.tgname = %s",
+                [self.table, self.TRIGGER]
+            )
+            return cursor.fetchone() is not None
+
+    def install(self) -> bool:
+        """
+        Create the extension, trigger and indexes (idempotent).
+
+        Indexes are built CONCURRENTLY, so this must not run inside a transaction.
+        """
+        if not self.is_supported:
+            return False
+
+        with connection.cursor() as cursor:
+            cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+            cursor.execute(f"ALTER TABLE {self.table} ADD COLUMN IF NOT EXISTS search_vector tsvector")
+            cursor.execute(f"""
+                CREATE OR REPLACE FUNCTION {self.FUNCTION}() RETURNS trigger AS $$
+                BEGIN
+                    NEW.search_vector :=
+                        setweight(to_tsvector('{self.config}', coalesce(NEW.title, '')), 'A') ||
+                        setweight(to_tsvector('{self.config}', coalesce(NEW.author, '')), 'B') ||
+                        setweight(to_tsvector('simple', coalesce(NEW.isbn, '')), 'C');
+                    RETURN NEW;
+                END
+                $$ LANGUAGE plpgsql
+            """)
+            cursor.execute(f"DROP TRIGGER IF EXISTS {self.TRIGGER} ON {self.table}")
+            cursor.execute(
+                f"CREATE TRIGGER {self.TRIGGER} BEFORE INSERT OR UPDATE ON {self.table} "
+                f"FOR EACH ROW EXECUTE FUNCTION {self.FUNCTION}()"
+            )
+            for name, definition in self.INDEXES.items():
+                cursor.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {self.table} {definition}")
+
+        logger.info(f"Installed full-text search on {self.table} ({self.config})")
+        return True
+
+    def rebuild(self, batch_size: int = 10000, only_missing: bool = True) -> int:
+        """Recompute ``search_vector`` in primary-key batches by firing the trigger; returns rows touched"""
+        if not self.is_supported:
+            return 0
+
+        condition = "AND search_vector IS NULL" if only_missing else ""
+        updated = 0
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT coalesce(min(id), 0), coalesce(max(id), 0) FROM {self.table}")
+            low, high = cursor.fetchone()
+            for start in range(low, high + 1, batch_size):
+                cursor.execute(
+                    f"UPDATE {self.table} SET search_vector = NULL "
+                    f"WHERE id >= %s AND id < %s {condition}",
+                    [start, start + batch_size]
+                )
+                updated += cursor.rowcount
+        return updated
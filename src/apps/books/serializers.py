@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from apps.core.serializers import SparseFieldsetMixin
 from .models import Book
 
 
@@ -35,12 +36,38 @@ class BookImportSerializer(serializers.ModelSerializer):
         return value
 
 
-class BookListSerializer(serializers.ModelSerializer):
+class BookBulkSerializer(serializers.ModelSerializer):
+    """Field validation only: BookBulkWriter checks ISBN uniqueness for a whole batch at once."""
+
+    class Meta:
+        model = Book
+        fields = ['title', 'author', 'isbn', 'publication_year']
+        extra_kwargs = {'isbn': {'validators': []}}
+
+
+class BookListSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    """
+    Every list field is a plain column whose database value already is its
+    representation, so large pages can skip model instances and field
+    objects: ``from_values(values_queryset(qs))`` equals ``.data``. Both take
+    the ``?fields=`` subset, if any.
+    """
+
     class Meta:
         model = Book
         fields = ['id', 'title', 'author', 'isbn', 'publication_year']
 
+    @classmethod
+    def values_queryset(cls, queryset, fields=None):
+        return queryset.values(*(fields or cls.Meta.fields))
+
+    @classmethod
+    def from_values(cls, rows, fields=None):
+        # Only the requested fields: a paginator may have added its key fields to the rows
+        fields = fields or cls.Meta.fields
+        return [{field: row[field] for field in fields} for row in rows]
+
 
-class BookDetailSerializer(BookSerializer):
+class BookDetailSerializer(SparseFieldsetMixin, BookSerializer):
     class Meta(BookSerializer.Meta):
         fields = BookSerializer.Meta.fields + ['created_at', 'updated_at']
\ No newline at end of file
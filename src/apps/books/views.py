@@ -1,8 +1,22 @@
-from rest_framework import viewsets, filters
+from django.conf import settings
+from django.db import IntegrityError
+from django.http import StreamingHttpResponse
+from rest_framework import status, viewsets
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.views import APIView
 from django_filters.rest_framework import DjangoFilterBackend
-from django.db.models import Q
+from apps.core.pagination import KeysetCursorPagination
+from apps.core.renderers import FastJSONRenderer
 
+from .bulk import BookBulkWriter
+from .export import CatalogExporter
+from .filters import BookOrderingFilter, BookSearchFilter
+from .isbn_lookup import OUTPUTS, lookup_response
 from .models import Book
+from .response_cache import BookResponseCache, metrics
+from .search import search_books
 from .serializers import (
     BookSerializer,
     BookListSerializer,
@@ -16,8 +30,13 @@ class BookViewSet(viewsets.ModelViewSet):
     Avoids multiple endpoints & increases maintainability.
     """
 
-    queryset = Book.objects.all().order_by("-created_at")
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    # search_vector is only read by the database
+    queryset = Book.objects.defer("search_vector").order_by("-created_at")
+    filter_backends = [DjangoFilterBackend, BookSearchFilter, BookOrderingFilter]
+    # The catalog is too large for COUNT(*) and OFFSET on every page
+    pagination_class = KeysetCursorPagination
+    # Ahead of, not instead of, the configured renderers
+    renderer_classes = [FastJSONRenderer, *api_settings.DEFAULT_RENDERER_CLASSES]
 
     # filters
     filterset_fields = ["author", "publication_year"]
@@ -25,6 +44,113 @@ class BookViewSet(viewsets.ModelViewSet):
     ordering_fields = ["title", "author", "publication_year", "created_at"]
     ordering = ["-created_at"]
 
+    def list(self, request, *args, **kwargs):
+        # Served from the response cache until the next Book write
+        responses = BookResponseCache()
+        version, data = responses.get(request)
+        if metrics.record("miss" if data is None else "hit"):
+            metrics.flush()
+        if data is not None:
+            return Response(data, headers={"X-Cache": "HIT"})
+
+        response = self.list_values(request)
+        if response.status_code == 200:
+            responses.store(request, version, response.data)
+        response["X-Cache"] = "MISS"
+        return response
+
+    def list_values(self, request):
+        """
+        The list action without model instances or serializer fields: a page is
+        read as values() dicts of BookListSerializer's fields, same payload.
+        With ``?fields=`` only those columns are selected.
+        """
+        fields = BookListSerializer.requested_fields(request.query_params)
+        queryset = BookListSerializer.values_queryset(self.filter_queryset(self.get_queryset()), fields)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(BookListSerializer.from_values(page, fields))
+        return Response(BookListSerializer.from_values(queryset, fields))
+
+    def bulk(self, request):
+        """
+        POST a JSON array of up to BOOK_BULK_MAX_OPERATIONS create/update/delete
+        operations; applied in one transaction, with a result per operation.
+        """
+        operations = request.data
+        if not isinstance(operations, list) or not operations:
+            return Response(
+                {"detail": "Expected a non-empty JSON array of operations."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(operations) > settings.BOOK_BULK_MAX_OPERATIONS:
+            return Response(
+                {"detail": f"At most {settings.BOOK_BULK_MAX_OPERATIONS} operations per request."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            result = BookBulkWriter(operations).run()
+        except IntegrityError:
+            # A concurrent write took an ISBN between the check and the insert
+            return Response(
+                {"detail": "A conflicting change was made meanwhile; nothing was applied. Retry."},
+                status=status.HTTP_409_CONFLICT
+            )
+        return Response(result)
+
+    def isbn_lookup(self, request):
+        """
+        POST {"isbns": [...]} (up to BOOK_ISBN_LOOKUP_MAX): which of them the
+        catalog holds, in one indexed query. ``?output=bitmap`` answers with a
+        found/not-found bitmap instead of the books.
+        """
+        output = request.query_params.get("output", "books")
+        if output not in OUTPUTS:
+            return Response(
+                {"detail": f"Unsupported output '{output}'. Use one of: {', '.join(OUTPUTS)}."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        isbns = request.data.get("isbns") if isinstance(request.data, dict) else None
+        if not isinstance(isbns, list) or not isbns or not all(isinstance(isbn, str) for isbn in isbns):
+            return Response(
+                {"detail": "Expected a non-empty 'isbns' list of strings."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(isbns) > settings.BOOK_ISBN_LOOKUP_MAX:
+            return Response(
+                {"detail": f"At most {settings.BOOK_ISBN_LOOKUP_MAX} ISBNs per request."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return Response(lookup_response(isbns, output))
+
+    def export(self, request):
+        """
+        Stream the whole catalog as CSV (default) or NDJSON, optionally gzipped
+        (``?compress=gzip``), filtered like the list by ``filterset_fields``.
+        """
+        output = request.query_params.get("output", "csv")
+        if output not in CatalogExporter.FORMATS:
+            return Response(
+                {"detail": f"Unsupported output '{output}'. Use one of: {', '.join(CatalogExporter.FORMATS)}."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        compress = request.query_params.get("compress", "")
+        if compress not in ("", "gzip"):
+            return Response(
+                {"detail": f"Unsupported compression '{compress}'. Use gzip."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        queryset = DjangoFilterBackend().filter_queryset(request, Book.objects.all(), self)
+        exporter = CatalogExporter(queryset)
+        response = StreamingHttpResponse(
+            exporter.stream(output, compress=bool(compress)),
+            content_type="application/gzip" if compress else CatalogExporter.FORMATS[output]
+        )
+        response["Content-Disposition"] = f'attachment; filename="{exporter.filename(output, bool(compress))}"'
+        return response
+
     def get_serializer_class(self):
         """
         Choose serializer dynamically based on action.
@@ -41,9 +167,14 @@ class BookViewSet(viewsets.ModelViewSet):
         if self.action == "search":
             query = self.request.query_params.get("q")
             if query:
-                qs = qs.filter(
-                    Q(title__icontains=query) |
-                    Q(author__icontains=query) |
-                    Q(isbn__icontains=query)
-                )
+                qs = search_books(qs, query)
         return qs
+
+
+class BookCacheStatsView(APIView):
+    """Hit/miss counters of the book response cache, across all workers."""
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(metrics.snapshot())
@@ -0,0 +1,141 @@
+import math
+from typing import Optional, Tuple
+from asgiref.sync import sync_to_async
+from django.views import View
+from rest_framework.exceptions import APIException, Throttled
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+from apps.core.pagination import estimated_count
+
+
+def _authenticate(request):
+    # Same authentication classes as the DRF API (session or token)
+    drf_request = Request(
+        request, authenticators=[auth() for auth in api_settings.DEFAULT_AUTHENTICATION_CLASSES]
+    )
+    try:
+        return drf_request.user
+    except APIException:
+        return None
+
+
+async def authenticate(request):
+    """The authenticated user of a plain Django request, or None."""
+    user = await sync_to_async(_authenticate)(request)
+    if user is None or not user.is_authenticated:
+        return None
+    return user
+
+
+def _throttle(request, user, view) -> Tuple[bool, Optional[float]]:
+    """``(throttled, wait)`` under the view's DRF throttle classes, as APIView.check_throttles."""
+    drf_request = Request(request)
+    drf_request.user = user
+    waits = []
+    for throttle_class in view.throttle_classes:
+        throttle = throttle_class()
+        if not throttle.allow_request(drf_request, view):
+            waits.append(throttle.wait())
+    if not waits:
+        return False, None
+    return True, max((wait for wait in waits if wait is not None), default=None)
+
+
+def api_response(data, status=200, headers=None):
+    """A DRF Response rendered by JSONRenderer, exactly as the sync API would send it."""
+    response = Response(data, status=status, headers=headers)
+    response.accepted_renderer = JSONRenderer()
+    response.accepted_media_type = JSONRenderer.media_type
+    response.renderer_context = {}
+    return response
+
+
+def api_error(detail, status):
+    return api_response({'detail': detail}, status=status)
+
+
+class InvalidPage(Exception):
+    pass
+
+
+async def paginate(request, queryset, page_size=None):
+    """
+    Async counterpart of EstimatedCountPagination: the page's objects and the
+    ``count``/``count_estimated``/``next``/``previous`` envelope, using the async ORM.
+    """
+    page_size = page_size or api_settings.PAGE_SIZE
+    try:
+        page = int(request.GET.get('page', 1))
+    except ValueError:
+        raise InvalidPage
+    count, count_estimated = await sync_to_async(estimated_count)(queryset)
+    if page < 1 or (page > 1 and not count_estimated and (page - 1) * page_size >= count):
+        raise InvalidPage
+
+    offset = (page - 1) * page_size
+    # One row past the page tells whether another follows, estimated count or not
+    objects = [obj async for obj in queryset[offset:offset + page_size + 1]]
+    has_next = len(objects) > page_size
+    objects = objects[:page_size]
+    if page > 1 and not objects:
+        raise InvalidPage
+
+    url = request.build_absolute_uri()
+    next_url = replace_query_param(url, 'page', page + 1) if has_next else None
+    if page == 1:
+        previous_url = None
+    elif page == 2:
+        previous_url = remove_query_param(url, 'page')
+    else:
+        previous_url = replace_query_param(url, 'page', page - 1)
+
+    return objects, {
+        'count': count, 'count_estimated': count_estimated, 'next': next_url, 'previous': previous_url
+    }
+
+
+class AsyncReadView(View):
+    """
+    Natively async GET for a hot read path, on the same URL as a DRF view.
+
+    Subclasses implement ``read()``; authentication and throttles match the DRF
+    API and every other method is handed to ``drf_view`` (e.g.
+    ``ViewSet.as_view({...})``), so writes keep their serializers, permissions,
+    throttles and CSRF handling. A slow client or a long poll then waits on the
+    event loop instead of holding a worker thread. Reads skip DRF's content
+    negotiation: they always answer JSON.
+    """
+
+    drf_view = None
+    throttle_classes = api_settings.DEFAULT_THROTTLE_CLASSES
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        view = super().as_view(**initkwargs)
+        # As APIView: CSRF is DRF's business (SessionAuthentication enforces it for
+        # session users), else token clients are refused before reaching drf_view
+        view.csrf_exempt = True
+        return view
+
+    async def get(self, request, *args, **kwargs):
+        user = await authenticate(request)
+        if user is None:
+            return api_error("Authentication credentials were not provided.", 401)
+        request.user = user
+
+        throttled, wait = await sync_to_async(_throttle)(request, user, self)
+        if throttled:
+            headers = {"Retry-After": str(math.ceil(wait))} if wait else None
+            return api_response({'detail': Throttled(wait).detail}, status=429, headers=headers)
+        return await self.read(request, *args, **kwargs)
+
+    async def read(self, request, *args, **kwargs):
+        raise NotImplementedError
+
+    async def _write(self, request, *args, **kwargs):
+        return await sync_to_async(self.drf_view)(request, *args, **kwargs)
+
+    post = put = patch = delete = _write
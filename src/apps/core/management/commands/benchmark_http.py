@@ -0,0 +1,104 @@
+import asyncio
+import statistics
+import time
+from urllib.parse import urlsplit
+from django.core.management.base import BaseCommand, CommandError
+
+
+async def _client(host, port, request, deadline, timeout, latencies, errors):
+    """One keep-alive connection issuing requests back to back until the deadline."""
+    reader = writer = None
+    while time.monotonic() < deadline:
+        started = time.monotonic()
+        try:
+            if writer is None:
+                reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout)
+            writer.write(request)
+            await writer.drain()
+            head = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), timeout)
+            status = int(head.split(b' ', 2)[1])
+            headers = dict(
+                line.split(b':', 1) for line in head.split(b'\r\n')[1:] if b':' in line
+            )
+            headers = {key.strip().lower(): value.strip() for key, value in headers.items()}
+            length = int(headers.get(b'content-length', 0))
+            if length:
+                await asyncio.wait_for(reader.readexactly(length), timeout)
+            if headers.get(b'connection', b'').lower() == b'close' or b'content-length' not in headers:
+                writer.close()
+                writer = None
+            if status >= 400:
+                errors['http'] += 1
+            else:
+                latencies.append(time.monotonic() - started)
+        except asyncio.TimeoutError:
+            errors['timeout'] += 1
+            writer = None
+        except (OSError, asyncio.IncompleteReadError, ValueError, IndexError):
+            errors['connection'] += 1
+            writer = None
+            await asyncio.sleep(0.05)
+    if writer is not None:
+        writer.close()
+
+
+async def run_level(url, headers, concurrency, duration, timeout):
+    parts = urlsplit(url)
+    path = parts.path + (f'?{parts.query}' if parts.query else '')
+    lines = [f'GET {path} HTTP/1.1', f'Host: {parts.netloc}', 'Connection: keep-alive'] + list(headers)
+    request = ('\r\n'.join(lines) + '\r\n\r\n').encode()
+
+    latencies, errors = [], {'http': 0, 'timeout': 0, 'connection': 0}
+    deadline = time.monotonic() + duration
+    await asyncio.gather(*(
+        _client(parts.hostname, parts.port or 80, request, deadline, timeout, latencies, errors)
+        for _ in range(concurrency)
+    ))
+
+    ordered = sorted(latencies)
+
+    def percentile(p):
+        return round(ordered[min(len(ordered) - 1, int(len(ordered) * p))] * 1000, 1) if ordered else None
+
+    return {
+        'concurrency': concurrency,
+        'requests': len(latencies),
+        'rps': round(len(latencies) / duration, 1),
+        'p50_ms': percentile(0.50),
+        'p95_ms': percentile(0.95),
+        'p99_ms': percentile(0.99),
+        'mean_ms': round(statistics.mean(ordered) * 1000, 1) if ordered else None,
+        **errors,
+    }
+
+
+class Command(BaseCommand):
+    help = "Load a running server with N concurrent keep-alive clients to compare WSGI and ASGI capacity"
+
+    def add_arguments(self, parser):
+        parser.add_argument('url', help="e.g. http://127.0.0.1:8000/api/imports/jobs/42/")
+        parser.add_argument('--concurrency', type=int, nargs='+', default=[10, 100, 500, 1000])
+        parser.add_argument('--duration', type=float, default=10.0, help="Seconds per concurrency level")
+        parser.add_argument('--timeout', type=float, default=10.0, help="Per-request timeout in seconds")
+        parser.add_argument(
+            '--header', action='append', default=[],
+            help="Extra request header, e.g. 'Cookie: sessionid=...' (repeatable)"
+        )
+
+    def handle(self, *args, **options):
+        if not options['url'].startswith('http://'):
+            raise CommandError("Only plain http:// URLs are supported")
+
+        self.stdout.write(
+            f"{'clients':>8} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} "
+            f"{'http err':>9} {'timeouts':>9} {'conn err':>9}"
+        )
+        for concurrency in options['concurrency']:
+            result = asyncio.run(run_level(
+                options['url'], options['header'], concurrency, options['duration'], options['timeout']
+            ))
+            self.stdout.write(
+                f"{result['concurrency']:>8} {result['rps']:>9} {str(result['p50_ms']):>8} "
+                f"{str(result['p95_ms']):>8} {str(result['p99_ms']):>8} "
+                f"{result['http']:>9} {result['timeout']:>9} {result['connection']:>9}"
+            )
@@ -0,0 +1,294 @@
+import json
+import logging
+from datetime import datetime
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as BinasciiError
+from typing import Optional, Tuple
+from django.conf import settings
+from django.core.paginator import EmptyPage, Page, PageNotAnInteger, Paginator
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections
+from django.db.models import F
+from django.db.models.query import ValuesIterable
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+from apps.core.utils import _keyset_filter
+
+logger = logging.getLogger(__name__)
+
+
+def planner_estimate(queryset) -> Optional[int]:
+    """
+    PostgreSQL's row estimate for ``queryset``: ``pg_class.reltuples`` for a whole
+    table, the top plan node's rows from ``EXPLAIN`` otherwise. None elsewhere, or
+    when the table was never analyzed.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+
+    with connection.cursor() as cursor:
+        if not queryset.query.where and not queryset.query.distinct:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                [queryset.model._meta.db_table]
+            )
+            row = cursor.fetchone()
+            estimate = row[0] if row else -1
+        else:
+            sql, params = queryset.order_by().query.sql_with_params()
+            cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+            plan = cursor.fetchone()[0]
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            estimate = int(plan[0]['Plan']['Plan Rows'])
+    return estimate if estimate >= 0 else None
+
+
+def estimated_count(queryset) -> Tuple[int, bool]:
+    """
+    ``(count, is_estimate)``: the planner's estimate once it reaches
+    ``API_COUNT_ESTIMATE_THRESHOLD`` rows, an exact COUNT(*) below that.
+    """
+    try:
+        estimate = planner_estimate(queryset)
+    except Exception as exc:
+        logger.warning(f"Could not estimate row count: {exc}")
+        estimate = None
+    if estimate is not None and estimate >= settings.API_COUNT_ESTIMATE_THRESHOLD:
+        return estimate, True
+    return queryset.count(), False
+
+
+class EstimatedPage(Page):
+    def __init__(self, object_list, number, paginator, has_more=None):
+        super().__init__(object_list, number, paginator)
+        self.has_more = has_more
+
+    def has_next(self):
+        if self.has_more is None:
+            return super().has_next()
+        return self.has_more
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Django's Paginator with ``count`` from estimated_count().
+
+    With an estimated count, page bounds come from the rows themselves: a page
+    reads one extra row to know whether another follows, and only an empty page
+    past the first is out of range.
+    """
+
+    @cached_property
+    def _counted(self) -> Tuple[int, bool]:
+        return estimated_count(self.object_list)
+
+    @property
+    def count(self):
+        return self._counted[0]
+
+    @property
+    def count_estimated(self) -> bool:
+        return self._counted[1]
+
+    def validate_number(self, number):
+        if not self.count_estimated:
+            return super().validate_number(number)
+        # Only the lower bound; the estimate cannot say where the last page is
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger(_("That page number is not an integer"))
+        if number < 1:
+            raise EmptyPage(_("That page number is less than 1"))
+        return number
+
+    def page(self, number):
+        if not self.count_estimated:
+            return super().page(number)
+
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        rows = list(self.object_list[bottom:bottom + self.per_page + 1])
+        if number > 1 and not rows:
+            raise EmptyPage(_("That page contains no results"))
+        return EstimatedPage(rows[:self.per_page], number, self, has_more=len(rows) > self.per_page)
+
+
+class EstimatedCountPagination(PageNumberPagination):
+    """
+    Page-number pagination whose ``count`` is a planner estimate on large results.
+
+    Responses carry ``count_estimated`` so clients can show "about 1.2M" rather
+    than an exact figure.
+    """
+
+    django_paginator_class = EstimatedCountPaginator
+
+    def get_paginated_response(self, data):
+        return Response({
+            'count': self.page.paginator.count,
+            'count_estimated': self.page.paginator.count_estimated,
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema['properties']['count_estimated'] = {'type': 'boolean'}
+        return response_schema
+
+
+class CursorKeyEncoder(DjangoJSONEncoder):
+    # DjangoJSONEncoder drops microseconds past milliseconds, which would skip rows
+    def default(self, o):
+        if isinstance(o, datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+class KeysetCursorPagination(BasePagination):
+    """
+    Opaque-cursor pagination over the queryset's current ordering, by keyset.
+
+    Works with whatever ordering the OrderingFilter applied; the primary key is
+    appended as a tie-breaker (in the direction of the first field) so the order
+    is total. A cursor carries the ordering and the key of the row it points at,
+    and a page is ``WHERE key > cursor ORDER BY ... LIMIT page_size + 1``: no
+    COUNT, no OFFSET, so the last page costs the same as the first when an index
+    on (field, id) exists. Nullable fields sort NULLs last in both directions.
+    Pages may be ``values()`` dicts; the key fields are added to the rows.
+    """
+
+    cursor_query_param = 'cursor'
+    page_size = api_settings.PAGE_SIZE
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.ordering = self._ordering(queryset)
+        self.key_names = [field.lstrip('-') for field in self.ordering]
+        nullable = {
+            name for name in self.key_names
+            if name != 'pk' and name not in queryset.query.annotations
+            and queryset.model._meta.get_field(name).null
+        }
+        self.base_url = request.build_absolute_uri()
+
+        if queryset._iterable_class is ValuesIterable and queryset._fields:
+            # values() rows: the cursor key is read from them, so they must hold it
+            missing = [name for name in self.key_names if name not in queryset._fields]
+            if missing:
+                queryset = queryset.values(*queryset._fields, *missing)
+
+        cursor = self.decode_cursor(request)
+        reverse = cursor is not None and cursor['reverse']
+        ordering = [self._flip(field) for field in self.ordering] if reverse else self.ordering
+
+        queryset = queryset.order_by(*(self._order_expression(field, nullable, reverse) for field in ordering))
+        if cursor is not None:
+            queryset = queryset.filter(_keyset_filter(ordering, cursor['key'], nullable, nulls_first=reverse))
+
+        rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if reverse:
+            rows.reverse()
+
+        # Going back from a page means there was one after it, and vice versa
+        if reverse:
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, cursor is not None
+        self.first_key = self._key(rows[0]) if rows else None
+        self.last_key = self._key(rows[-1]) if rows else None
+        return rows
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_next_link(self):
+        if not self.has_next or self.last_key is None:
+            return None
+        return self.encode_cursor(self.last_key, reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if self.first_key is None:
+            # Paged past the end (rows deleted meanwhile); restart from the top
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.first_key, reverse=True)
+
+    def encode_cursor(self, key, reverse):
+        payload = json.dumps({'o': self.ordering, 'k': key, 'r': reverse}, cls=CursorKeyEncoder)
+        token = urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+        return replace_query_param(self.base_url, self.cursor_query_param, token)
+
+    def decode_cursor(self, request):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+        try:
+            payload = json.loads(urlsafe_b64decode(token + '=' * (-len(token) % 4)))
+            ordering, key, reverse = payload['o'], payload['k'], bool(payload['r'])
+        except (BinasciiError, ValueError, TypeError, KeyError):
+            raise NotFound(self.invalid_cursor_message)
+        # A cursor only means something under the ordering it was issued for
+        if ordering != self.ordering or not isinstance(key, list) or len(key) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return {'key': key, 'reverse': reverse}
+
+    @staticmethod
+    def _ordering(queryset):
+        ordering = [
+            field for field in (queryset.query.order_by or queryset.model._meta.ordering)
+            if isinstance(field, str)
+        ]
+        if not ordering:
+            ordering = ['pk']
+        if ordering[-1].lstrip('-') not in ('pk', queryset.model._meta.pk.name):
+            ordering.append('-pk' if ordering[0].startswith('-') else 'pk')
+        return ordering
+
+    @staticmethod
+    def _flip(field):
+        return field[1:] if field.startswith('-') else f'-{field}'
+
+    @staticmethod
+    def _order_expression(field, nullable, nulls_first):
+        name = field.lstrip('-')
+        if name not in nullable:
+            return field
+        expression = F(name)
+        descending = field.startswith('-')
+        if nulls_first:
+            return expression.desc(nulls_first=True) if descending else expression.asc(nulls_first=True)
+        return expression.desc(nulls_last=True) if descending else expression.asc(nulls_last=True)
+
+    def _key(self, obj):
+        if isinstance(obj, dict):
+            return [obj[name] for name in self.key_names]
+        # Annotations (e.g. a search rank) are plain attributes too
+        return [obj.pk if name == 'pk' else getattr(obj, name) for name in self.key_names]
@@ -0,0 +1,41 @@
+import logging
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # Optional: without it FastJSONRenderer is JSONRenderer
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer on orjson, when it is installed.
+
+    Same media type and, for API payloads, the same bytes as JSONRenderer:
+    compact, UTF-8, U+2028/U+2029 escaped, and values orjson does not know
+    (Decimal, lazy strings, querysets...) or formats differently (datetimes)
+    go through DRF's encoder. Indented output, ASCII-only settings and
+    anything orjson rejects (e.g. integers beyond 64 bits) fall back to
+    JSONRenderer.
+    """
+
+    options = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME if orjson else 0
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=self.encoder_class().default, option=self.options)
+        except orjson.JSONEncodeError as exc:
+            logger.debug(f"orjson could not render the response, using json: {exc}")
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # As JSONRenderer: keep the output a strict JavaScript subset
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
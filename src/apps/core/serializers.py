@@ -0,0 +1,48 @@
+from typing import List, Optional
+from rest_framework import serializers
+
+
+class SparseFieldsetMixin:
+    """
+    ``?fields=a,b`` sparse fieldsets for a ModelSerializer.
+
+    With ``context['fields']`` set, every other field is removed before
+    serialization, so a SerializerMethodField that was not asked for never runs.
+    ``columns()`` names the model fields the requested ones read, for views to
+    pass to ``.only()`` or ``.values()``; ``Meta.field_sources`` maps computed
+    fields to those columns (``[]`` for fields that read none).
+    """
+
+    fields_param = 'fields'
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        fields = self.context.get('fields')
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+    @classmethod
+    def requested_fields(cls, query_params) -> Optional[List[str]]:
+        """The field names in ``?fields=``, in order; None when absent or blank."""
+        names = [name.strip() for name in query_params.get(cls.fields_param, '').split(',') if name.strip()]
+        if not names:
+            return None
+        unknown = [name for name in names if name not in cls.Meta.fields]
+        if unknown:
+            raise serializers.ValidationError({
+                cls.fields_param: [f"Unknown field '{name}'. Choose from: {', '.join(cls.Meta.fields)}."
+                                   for name in unknown]
+            })
+        return list(dict.fromkeys(names))
+
+    @classmethod
+    def columns(cls, fields: List[str]) -> List[str]:
+        """Model fields behind ``fields``, primary key first."""
+        sources = getattr(cls.Meta, 'field_sources', {})
+        columns = [cls.Meta.model._meta.pk.name]
+        for name in fields:
+            for column in sources.get(name, [name]):
+                if column not in columns:
+                    columns.append(column)
+        return columns
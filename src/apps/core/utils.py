@@ -1,6 +1,11 @@
 import os
+import resource
+import tracemalloc
+from contextlib import contextmanager
+from itertools import islice
 import magic
 from django.core.exceptions import ValidationError
+from django.db.models import Q
 from django.utils import timezone
 from datetime import timedelta
 
@@ -29,12 +34,111 @@ def generate_unique_filename(original_filename):
     return f"{base_name}_{timestamp}_{unique_id}{extension}"
 
 
+def _keyset_filter(ordering, last_key, nullable=(), nulls_first=False):
+    """
+    Rows strictly after ``last_key`` in ``ordering``, as an OR of equal-prefix comparisons.
+
+    Fields named in ``nullable`` may hold NULL; they must be ordered with NULLs last,
+    or first when ``nulls_first`` is set.
+    """
+    condition = Q()
+    for i, field in enumerate(ordering):
+        name = field.lstrip('-')
+        value = last_key[i]
+        if value is None:
+            if not nulls_first:
+                # Nothing sorts after NULL on this field
+                continue
+            clause = Q(**{f'{name}__isnull': False})
+        else:
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            clause = Q(**{f'{name}__{lookup}': value})
+            if name in nullable and not nulls_first:
+                clause |= Q(**{f'{name}__isnull': True})
+        for previous, previous_value in zip(ordering[:i], last_key):
+            previous = previous.lstrip('-')
+            clause &= Q(**{f'{previous}__isnull': True} if previous_value is None else {previous: previous_value})
+        condition |= clause
+    return condition
+
+
+def keyset_iterator(queryset, ordering=('pk',), batch_size=1000, values=None, flat=False,
+                    server_side=False):
+    """
+    Iterate a queryset in bounded batches by keyset (``WHERE key > last``), never OFFSET.
+
+    ``ordering`` should match an index; the primary key is appended as a tie-breaker
+    when the last field is not unique. Ordering fields must be non-null local fields.
+    Rows inserted or deleted mid-iteration neither shift nor repeat the rest.
+
+    ``values`` projects each row with values_list (``flat`` for a single field) instead
+    of loading model instances. ``server_side`` streams each batch through
+    ``QuerySet.iterator()``, i.e. a server-side cursor on PostgreSQL.
+    """
+    model = queryset.model
+    ordering = list(ordering)
+    if ordering[-1].lstrip('-') not in ('pk', model._meta.pk.name):
+        ordering.append('pk')
+    key_names = [field.lstrip('-') for field in ordering]
+    queryset = queryset.order_by(*ordering)
+
+    if values is not None:
+        columns = key_names + [name for name in values if name not in key_names]
+        positions = [columns.index(name) for name in values]
+        queryset = queryset.values_list(*columns)
+
+        def key_of(row):
+            return row[:len(key_names)]
+
+        def value_of(row):
+            projected = tuple(row[position] for position in positions)
+            return projected[0] if flat else projected
+    else:
+        attnames = [
+            model._meta.pk.attname if name == 'pk' else model._meta.get_field(name).attname
+            for name in key_names
+        ]
+
+        def key_of(obj):
+            return tuple(getattr(obj, attname) for attname in attnames)
+
+        def value_of(obj):
+            return obj
+
+    last_key = None
+    while True:
+        batch = queryset if last_key is None else queryset.filter(_keyset_filter(ordering, last_key))
+        batch = batch[:batch_size]
+        rows = batch.iterator(chunk_size=batch_size) if server_side else batch
+
+        fetched = 0
+        for row in rows:
+            fetched += 1
+            last_key = key_of(row)
+            yield value_of(row)
+
+        if fetched < batch_size:
+            return
+
+
+def keyset_chunks(queryset, ordering=('pk',), batch_size=1000, values=None, flat=False):
+    """
+    Like keyset_iterator() but yield each batch as a list.
+
+    The next batch is only queried once the previous one is handed back, so the
+    caller may delete or update the rows it was given.
+    """
+    rows = keyset_iterator(queryset, ordering, batch_size, values, flat)
+    while True:
+        chunk = list(islice(rows, batch_size))
+        if not chunk:
+            return
+        yield chunk
+
+
 def chunked_queryset(queryset, chunk_size=1000):
-    """Split queryset into chunks for memory-efficient processing"""
-    total = queryset.count()
-    for start in range(0, total, chunk_size):
-        end = min(start + chunk_size, total)
-        yield queryset[start:end]
+    """Split queryset into primary-key ordered chunks for memory-efficient processing"""
+    return keyset_chunks(queryset, batch_size=chunk_size)
 
 
 def safe_string(value, max_length=None):
@@ -66,6 +170,44 @@ def calculate_processing_time(start_time, end_time=None):
         return f"{hours}h {minutes}m"
 
 
+def current_rss_bytes():
+    """Resident set size of this process, falling back to the high-water mark"""
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        # ru_maxrss is reported in KB on Linux
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class TracedMemory:
+    """Result holder for traced_memory()"""
+
+    def __init__(self):
+        self.peak_bytes = 0
+        self.current_bytes = 0
+
+
+@contextmanager
+def traced_memory():
+    """Measure peak Python heap allocations inside the block with tracemalloc"""
+    report = TracedMemory()
+    already_tracing = tracemalloc.is_tracing()
+    if not already_tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    baseline, _ = tracemalloc.get_traced_memory()
+
+    try:
+        yield report
+    finally:
+        current, peak = tracemalloc.get_traced_memory()
+        report.current_bytes = current - baseline
+        report.peak_bytes = peak - baseline
+        if not already_tracing:
+            tracemalloc.stop()
+
+
 class ProgressTracker:
     """Track and report progress for long-running tasks"""
 
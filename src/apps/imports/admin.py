@@ -1,11 +1,28 @@
 from django.contrib import admin
-from .models import ImportJob, ImportRowError
+from .models import (
+    ImportErrorSummary,
+    ImportJob,
+    ImportJobPerformance,
+    ImportProfile,
+    ImportRowError,
+    ImportStatsRollup
+)
 
 
 class ImportRowErrorInline(admin.TabularInline):
     model = ImportRowError
     extra = 0
-    readonly_fields = ['row_number', 'raw_data', 'error_message', 'created_at']
+    readonly_fields = ['row_number', 'code', 'raw_data', 'error_message', 'created_at']
+    can_delete = False
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+
+class ImportErrorSummaryInline(admin.TabularInline):
+    model = ImportErrorSummary
+    extra = 0
+    readonly_fields = ['code', 'count', 'row_ranges', 'ranges_truncated', 'sample_message', 'updated_at']
     can_delete = False
 
     def has_add_permission(self, request, obj=None):
@@ -17,17 +34,19 @@ class ImportJobAdmin(admin.ModelAdmin):
     list_display = [
         'filename',
         'status',
+        'is_bulk',
         'uploader',
         'processed_rows',
         'success_count',
         'error_count',
         'created_at'
     ]
-    list_filter = ['status', 'created_at']
+    list_filter = ['status', 'is_bulk', 'created_at']
     search_fields = ['filename', 'celery_task_id']
     readonly_fields = [
         'filename',
         'file_path',
+        'file_size',
         'status',
         'processed_rows',
         'success_count',
@@ -36,9 +55,10 @@ class ImportJobAdmin(admin.ModelAdmin):
         'created_at',
         'started_at',
         'finished_at',
-        'progress_percent'
+        'progress_percent',
+        'peak_memory_bytes'
     ]
-    inlines = [ImportRowErrorInline]
+    inlines = [ImportErrorSummaryInline, ImportRowErrorInline]
     ordering = ['-created_at']
     date_hierarchy = 'created_at'
 
@@ -47,8 +67,10 @@ class ImportJobAdmin(admin.ModelAdmin):
             'fields': (
                 'filename',
                 'file_path',
+                'file_size',
                 'uploader',
                 'status',
+                'is_bulk',
                 'celery_task_id'
             )
         }),
@@ -58,7 +80,8 @@ class ImportJobAdmin(admin.ModelAdmin):
                 'processed_rows',
                 'success_count',
                 'error_count',
-                'progress_percent'
+                'progress_percent',
+                'peak_memory_bytes'
             )
         }),
         ('Timestamps', {
@@ -82,19 +105,28 @@ class ImportJobAdmin(admin.ModelAdmin):
         return request.user.is_superuser
 
 
+@admin.register(ImportProfile)
+class ImportProfileAdmin(admin.ModelAdmin):
+    list_display = ['user', 'bulk_by_default']
+    list_filter = ['bulk_by_default']
+    search_fields = ['user__username', 'user__email']
+
+
 @admin.register(ImportRowError)
 class ImportRowErrorAdmin(admin.ModelAdmin):
     list_display = [
         'import_job',
         'row_number',
+        'code',
         'error_message',
         'created_at'
     ]
-    list_filter = ['import_job', 'created_at']
+    list_filter = ['code', 'import_job', 'created_at']
     search_fields = ['error_message', 'raw_data']
     readonly_fields = [
         'import_job',
         'row_number',
+        'code',
         'raw_data',
         'error_message',
         'created_at'
@@ -104,4 +136,38 @@ class ImportRowErrorAdmin(admin.ModelAdmin):
         return False
 
     def has_change_permission(self, request, obj=None):
-        return False
\ No newline at end of file
+        return False
+
+
+@admin.register(ImportJobPerformance)
+class ImportJobPerformanceAdmin(admin.ModelAdmin):
+    list_display = [
+        'import_job',
+        'rows',
+        'rows_per_second',
+        'queue_wait_seconds',
+        'duration_seconds',
+        'recorded_at'
+    ]
+    list_filter = ['recorded_at']
+    raw_id_fields = ['import_job']
+    ordering = ['-recorded_at']
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(ImportStatsRollup)
+class ImportStatsRollupAdmin(admin.ModelAdmin):
+    list_display = ['bucket_start', 'jobs', 'succeeded', 'failed', 'rows', 'bytes_processed']
+    date_hierarchy = 'bucket_start'
+    ordering = ['-bucket_start']
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,84 @@
+from asgiref.sync import sync_to_async
+from django.db.models import prefetch_related_objects
+from django.http import HttpResponseNotModified
+from django.utils.http import parse_etags
+from rest_framework.exceptions import ValidationError
+from apps.core.async_views import AsyncReadView, InvalidPage, api_error, api_response, paginate
+
+from .models import ImportJob
+from .serializers import ImportJobSerializer, ImportJobStatusSerializer, errors_preview_prefetch
+from .services.status_cache import StatusSnapshotCache
+
+
+class ImportJobListView(AsyncReadView):
+    """
+    GET /api/imports/jobs/ - the job list; ImportJobViewSet only takes the uploads.
+    ``?fields=`` selects only the columns those fields read; ``errors_preview``
+    is included when listed there or in ``?include=``.
+    """
+
+    async def read(self, request):
+        try:
+            fields = ImportJobSerializer.requested_fields(request.GET)
+        except ValidationError as exc:
+            return api_response(exc.detail, status=400)
+
+        include_errors_preview = "errors_preview" in request.GET.get("include", "").split(",")
+        jobs = ImportJob.objects.order_by("-created_at")
+        if fields is not None:
+            include_errors_preview = "errors_preview" in fields
+            jobs = jobs.only(*ImportJobSerializer.columns(fields))
+        try:
+            jobs, page = await paginate(request, jobs)
+        except InvalidPage:
+            return api_error("Invalid page.", 404)
+
+        if include_errors_preview:
+            # Async iteration cannot prefetch on Django 4.2; one extra query for the page
+            await sync_to_async(prefetch_related_objects)(
+                jobs, errors_preview_prefetch(ImportJobSerializer.ERRORS_PREVIEW_LIMIT)
+            )
+
+        serializer = ImportJobSerializer(
+            jobs, many=True,
+            context={"request": request, "include_errors_preview": include_errors_preview, "fields": fields}
+        )
+        return api_response({**page, "results": serializer.data})
+
+
+class ImportJobStatusView(AsyncReadView):
+    """
+    GET /api/imports/jobs/<pk>/ - job status for pollers, served from the status
+    snapshot cache with an ETag, so an unchanged job costs one cache read and a 304.
+    ``?fields=`` trims the snapshot, which is shared by every field selection.
+    """
+
+    async def read(self, request, pk):
+        try:
+            fields = ImportJobStatusSerializer.requested_fields(request.GET)
+        except ValidationError as exc:
+            return api_response(exc.detail, status=400)
+
+        snapshots = StatusSnapshotCache()
+        version, snapshot = await snapshots.aget(pk)
+        if snapshot is None:
+            job = None
+            if pk.isdigit():
+                job = await ImportJob.objects.filter(pk=pk).select_related("performance").prefetch_related(
+                    "error_summaries", errors_preview_prefetch(ImportJobStatusSerializer.ERRORS_PREVIEW_LIMIT)
+                ).afirst()
+            if job is None:
+                return api_error("Not found.", 404)
+
+            data = ImportJobStatusSerializer(job, context={"request": request}).data
+            snapshot = await snapshots.astore(job.pk, version, data, terminal=job.status in ImportJob.TERMINAL_STATUSES)
+
+        data, etag = snapshot["data"], snapshot["etag"]
+        if fields is not None:
+            data = {name: data[name] for name in fields}
+            etag = StatusSnapshotCache.etag_for(data)
+
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if etag in parse_etags(request.headers.get("If-None-Match", "")):
+            return HttpResponseNotModified(headers=headers)
+        return api_response(data, headers=headers)
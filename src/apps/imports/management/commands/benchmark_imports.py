@@ -0,0 +1,71 @@
+import json
+import tempfile
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.imports.services.benchmark import (
+    ImportBenchmark,
+    SyntheticCSVGenerator,
+    build_baseline,
+    compare_to_baseline,
+)
+
+
+class Command(BaseCommand):
+    help = "Benchmark CSV import throughput on generated files and record a baseline"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows', type=int, nargs='+', default=[10000],
+            help="File sizes to generate, e.g. --rows 10000 100000 1000000 10000000"
+        )
+        parser.add_argument('--mode', choices=ImportBenchmark.MODES, nargs='+', default=['task'])
+        parser.add_argument('--duplicate-rate', type=float, default=0.0)
+        parser.add_argument('--error-rate', type=float, default=0.0)
+        parser.add_argument('--non-ascii-rate', type=float, default=0.0)
+        parser.add_argument('--encoding', default='utf-8')
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--output', help="Write results as a JSON baseline to this path")
+        parser.add_argument('--compare', help="Fail if results regress against this JSON baseline")
+        parser.add_argument('--tolerance', type=float, default=0.1)
+        parser.add_argument('--keep-data', action='store_true', help="Keep imported books and jobs")
+
+    def handle(self, *args, **options):
+        results = []
+
+        with tempfile.TemporaryDirectory(prefix='bibliflow-bench-') as work_dir:
+            for rows in options['rows']:
+                for mode in options['mode']:
+                    generator = SyntheticCSVGenerator(
+                        rows=rows,
+                        duplicate_rate=options['duplicate_rate'],
+                        error_rate=options['error_rate'],
+                        non_ascii_rate=options['non_ascii_rate'],
+                        encoding=options['encoding'],
+                        seed=options['seed'],
+                    )
+                    result = ImportBenchmark(
+                        generator, mode=mode, keep_data=options['keep_data']
+                    ).run(work_dir)
+                    results.append(result)
+
+                    self.stdout.write(
+                        f"{mode:<8} rows={rows:<10} {result.rows_per_second:>10} rows/s "
+                        f"{result.queries_per_1k_rows:>8} queries/1k "
+                        f"peak_rss={result.peak_rss_mb}MB status={result.status}"
+                    )
+
+        if options['output']:
+            with open(options['output'], 'w') as file:
+                json.dump(build_baseline(results), file, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Baseline written to {options['output']}"))
+
+        if options['compare']:
+            with open(options['compare']) as file:
+                baseline = json.load(file)
+
+            regressions = compare_to_baseline(results, baseline, options['tolerance'])
+            for regression in regressions:
+                self.stdout.write(self.style.ERROR(f"Regression: {regression}"))
+            if regressions:
+                raise CommandError(f"{len(regressions)} benchmark regressions")
+            self.stdout.write(self.style.SUCCESS("No regressions against baseline"))
@@ -0,0 +1,52 @@
+from datetime import timedelta
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.imports.services.cleanup import ImportJobCleanup
+from apps.imports.services.partitions import PartitionManager
+
+
+class Command(BaseCommand):
+    help = "Partition import_row_errors by day on PostgreSQL and maintain its partitions"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--convert', action='store_true',
+            help="Convert the plain table into a partitioned one (existing rows become a legacy partition)"
+        )
+        parser.add_argument('--ahead', type=int, default=settings.IMPORT_ERROR_PARTITIONS_AHEAD)
+        parser.add_argument('--drop-older-than', type=int, help="Drop partitions older than this many days")
+        parser.add_argument('--detach-only', action='store_true', help="Detach expired partitions instead of dropping")
+
+    def handle(self, *args, **options):
+        manager = PartitionManager()
+
+        if not manager.is_supported:
+            self.stdout.write(self.style.WARNING(
+                "Partitioning requires PostgreSQL; import_row_errors stays a plain table"
+            ))
+            return
+
+        if options['convert'] and manager.convert():
+            self.stdout.write(self.style.SUCCESS("Converted import_row_errors to a partitioned table"))
+
+        if not manager.is_partitioned():
+            self.stdout.write(self.style.WARNING("import_row_errors is not partitioned; run with --convert"))
+            return
+
+        created = manager.ensure_partitions(options['ahead'])
+        self.stdout.write(f"Created {len(created)} partitions")
+
+        if options['drop_older_than'] is not None:
+            cutoff = timezone.now() - timedelta(days=options['drop_older_than'])
+            # As cleanup_completed_imports: never empty the errors of a job that is kept
+            expired = manager.drop_expired(
+                options['drop_older_than'], detach_only=options['detach_only'],
+                deletable_parents=ImportJobCleanup(cutoff).expired()
+            )
+            action = 'Detached' if options['detach_only'] else 'Dropped'
+            self.stdout.write(f"{action} {len(expired)} partitions")
+
+        for name, upper in manager.partitions():
+            self.stdout.write(f"{name:<40} {upper.isoformat() if upper else 'DEFAULT'}")
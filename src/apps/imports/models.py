@@ -1,5 +1,7 @@
-from django.db import models
+from django.db import models, transaction
 from django.utils import timezone
+from apps.imports.services.progress_events import progress_event, publish_progress
+from apps.imports.services.status_cache import bump_status_version, forget_status
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
@@ -7,19 +9,23 @@ User = get_user_model()
 
 class ImportJob(models.Model):
     PENDING = 'PENDING'
+    DEFERRED = 'DEFERRED'
     PROCESSING = 'PROCESSING'
     SUCCESS = 'SUCCESS'
     FAILURE = 'FAILURE'
 
     STATUS_CHOICES = [
         (PENDING, 'Pending'),
+        (DEFERRED, 'Deferred'),
         (PROCESSING, 'Processing'),
         (SUCCESS, 'Success'),
         (FAILURE, 'Failure'),
     ]
+    TERMINAL_STATUSES = [SUCCESS, FAILURE]
 
     filename = models.CharField(max_length=255)
     file_path = models.CharField(max_length=500)
+    file_size = models.BigIntegerField(default=0)
     uploader = models.ForeignKey(
         User,
         on_delete=models.CASCADE,
@@ -36,6 +42,8 @@ class ImportJob(models.Model):
     success_count = models.IntegerField(default=0)
     error_count = models.IntegerField(default=0)
     celery_task_id = models.CharField(max_length=255, null=True, blank=True)
+    is_bulk = models.BooleanField(default=False)
+    peak_memory_bytes = models.BigIntegerField(null=True, blank=True)
 
     created_at = models.DateTimeField(default=timezone.now)
     started_at = models.DateTimeField(null=True, blank=True)
@@ -47,12 +55,27 @@ class ImportJob(models.Model):
             models.Index(fields=['status']),
             models.Index(fields=['created_at']),
             models.Index(fields=['celery_task_id']),
+            models.Index(fields=['status', 'is_bulk']),
         ]
         ordering = ['-created_at']
 
     def __str__(self):
         return f'{self.filename} - {self.status}'
 
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # Cached status snapshots are only served for the current version, and SSE
+        # subscribers get the new progress, both once the change is committed
+        job_id, event = self.pk, progress_event(self)
+        transaction.on_commit(lambda: bump_status_version(job_id))
+        transaction.on_commit(lambda: publish_progress(event))
+
+    def delete(self, *args, **kwargs):
+        job_id = self.pk
+        deleted = super().delete(*args, **kwargs)
+        transaction.on_commit(lambda: forget_status([job_id]))
+        return deleted
+
     @property
     def progress_percent(self):
         if self.total_rows and self.total_rows > 0:
@@ -78,13 +101,51 @@ class ImportJob(models.Model):
         self.save()
 
 
+class ImportProfile(models.Model):
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        related_name='import_profile'
+    )
+    bulk_by_default = models.BooleanField(default=False)
+
+    class Meta:
+        db_table = 'import_profiles'
+
+    def __str__(self):
+        return f'Import profile for {self.user}'
+
+
 class ImportRowError(models.Model):
+    MISSING_FIELD = 'MISSING_FIELD'
+    INSUFFICIENT_COLUMNS = 'INSUFFICIENT_COLUMNS'
+    INVALID_YEAR = 'INVALID_YEAR'
+    DUPLICATE_ISBN = 'DUPLICATE_ISBN'
+    INVALID_VALUE = 'INVALID_VALUE'
+    DATABASE_ERROR = 'DATABASE_ERROR'
+    UNEXPECTED_ERROR = 'UNEXPECTED_ERROR'
+
+    CODE_CHOICES = [
+        (MISSING_FIELD, 'Missing required field'),
+        (INSUFFICIENT_COLUMNS, 'Insufficient columns'),
+        (INVALID_YEAR, 'Invalid publication year'),
+        (DUPLICATE_ISBN, 'Duplicate ISBN'),
+        (INVALID_VALUE, 'Invalid value'),
+        (DATABASE_ERROR, 'Database error'),
+        (UNEXPECTED_ERROR, 'Unexpected error'),
+    ]
+
     import_job = models.ForeignKey(
         ImportJob,
         on_delete=models.CASCADE,
         related_name='errors'
     )
     row_number = models.IntegerField()
+    code = models.CharField(
+        max_length=32,
+        choices=CODE_CHOICES,
+        default=UNEXPECTED_ERROR
+    )
     raw_data = models.TextField()
     error_message = models.TextField()
     created_at = models.DateTimeField(default=timezone.now)
@@ -93,8 +154,92 @@ class ImportRowError(models.Model):
         db_table = 'import_row_errors'
         indexes = [
             models.Index(fields=['import_job', 'row_number']),
+            models.Index(fields=['import_job', 'code']),
         ]
         ordering = ['row_number']
 
     def __str__(self):
-        return f'Row {self.row_number}: {self.error_message}'
\ No newline at end of file
+        return f'Row {self.row_number}: {self.error_message}'
+
+
+class ImportErrorSummary(models.Model):
+    """Per job and error code: how many rows failed, and where."""
+
+    import_job = models.ForeignKey(
+        ImportJob,
+        on_delete=models.CASCADE,
+        related_name='error_summaries'
+    )
+    code = models.CharField(max_length=32, choices=ImportRowError.CODE_CHOICES)
+    count = models.IntegerField(default=0)
+    # Inclusive [first, last] row number runs, e.g. [[2, 5000], [5002, 5002]]
+    row_ranges = models.JSONField(default=list)
+    ranges_truncated = models.BooleanField(default=False)
+    sample_message = models.TextField(blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'import_error_summaries'
+        constraints = [
+            models.UniqueConstraint(fields=['import_job', 'code'], name='unique_import_error_summary'),
+        ]
+        ordering = ['-count']
+
+    def __str__(self):
+        return f'{self.code}: {self.count} rows'
+
+
+class ImportJobPerformance(models.Model):
+    """Where the time of one import run went, recorded when the job finishes."""
+
+    import_job = models.OneToOneField(
+        ImportJob,
+        on_delete=models.CASCADE,
+        related_name='performance'
+    )
+    rows = models.IntegerField(default=0)
+    bytes_processed = models.BigIntegerField(default=0)
+    rows_per_second = models.FloatField(null=True, blank=True)
+    # created_at -> started_at
+    queue_wait_seconds = models.FloatField(null=True, blank=True)
+    # started_at -> finished_at
+    duration_seconds = models.FloatField(null=True, blank=True)
+    parse_seconds = models.FloatField(default=0)
+    validate_seconds = models.FloatField(default=0)
+    write_seconds = models.FloatField(default=0)
+    recorded_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        db_table = 'import_job_performance'
+
+    def __str__(self):
+        return f'{self.import_job_id}: {self.rows_per_second} rows/s'
+
+
+class ImportStatsRollup(models.Model):
+    """
+    Hourly pre-aggregated import statistics behind /api/imports/stats/.
+
+    Distributions are kept as log-scale histograms (bucket index -> count) so
+    percentiles over any range of hours can be computed by merging buckets.
+    """
+
+    bucket_start = models.DateTimeField(unique=True)
+    jobs = models.IntegerField(default=0)
+    succeeded = models.IntegerField(default=0)
+    failed = models.IntegerField(default=0)
+    rows = models.BigIntegerField(default=0)
+    bytes_processed = models.BigIntegerField(default=0)
+    parse_seconds = models.FloatField(default=0)
+    validate_seconds = models.FloatField(default=0)
+    write_seconds = models.FloatField(default=0)
+    rows_per_second_histogram = models.JSONField(default=dict)
+    queue_wait_histogram = models.JSONField(default=dict)
+    duration_histogram = models.JSONField(default=dict)
+
+    class Meta:
+        db_table = 'import_stats_rollups'
+        ordering = ['bucket_start']
+
+    def __str__(self):
+        return f'{self.bucket_start:%Y-%m-%d %H:00}: {self.jobs} jobs'
@@ -1,16 +1,49 @@
 from rest_framework import serializers
+from django.db.models import Prefetch
 from django.utils import timezone
-from .models import ImportJob, ImportRowError
+from apps.core.serializers import SparseFieldsetMixin
+from .models import ImportErrorSummary, ImportJob, ImportJobPerformance, ImportProfile, ImportRowError
 
 
 class ImportRowErrorSerializer(serializers.ModelSerializer):
     class Meta:
         model = ImportRowError
-        fields = ['row_number', 'raw_data', 'error_message', 'created_at']
+        fields = ['row_number', 'code', 'raw_data', 'error_message', 'created_at']
         read_only_fields = fields
 
 
-class ImportJobSerializer(serializers.ModelSerializer):
+class ImportErrorSummarySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ImportErrorSummary
+        fields = ['code', 'count', 'row_ranges', 'ranges_truncated', 'sample_message']
+        read_only_fields = fields
+
+
+class ImportJobPerformanceSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ImportJobPerformance
+        fields = [
+            'rows',
+            'bytes_processed',
+            'rows_per_second',
+            'queue_wait_seconds',
+            'duration_seconds',
+            'parse_seconds',
+            'validate_seconds',
+            'write_seconds',
+        ]
+        read_only_fields = fields
+
+
+def errors_preview_prefetch(limit: int) -> Prefetch:
+    """Error previews for a whole page of jobs in one query (sliced with ROW_NUMBER() per job)."""
+    preview = ImportRowError.objects.order_by('row_number', 'id')[:limit]
+    return Prefetch('errors', queryset=preview, to_attr='preview_errors')
+
+
+class ImportJobSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    ERRORS_PREVIEW_LIMIT = 5
+
     progress_percent = serializers.SerializerMethodField()
     errors_preview = serializers.SerializerMethodField()
     duration = serializers.SerializerMethodField()
@@ -28,18 +61,34 @@ class ImportJobSerializer(serializers.ModelSerializer):
             'progress_percent',
             'errors_preview',
             'duration',
+            'peak_memory_bytes',
             'created_at',
             'started_at',
             'finished_at',
             'celery_task_id',
         ]
         read_only_fields = fields
+        # Columns read by the computed fields, for ?fields= projections
+        field_sources = {
+            'progress_percent': ['total_rows', 'processed_rows'],
+            'errors_preview': [],
+            'duration': ['started_at', 'finished_at'],
+        }
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # The job list only carries previews when asked for (?include=errors_preview)
+        if not self.context.get('include_errors_preview', True):
+            self.fields.pop('errors_preview', None)
 
     def get_progress_percent(self, obj) -> float:
         return obj.progress_percent
 
     def get_errors_preview(self, obj) -> list:
-        errors = obj.errors.all()[:5]  # Preview of first 5 errors
+        # Prefetched for the whole page by ImportJobViewSet; otherwise one query per job
+        errors = getattr(obj, 'preview_errors', None)
+        if errors is None:
+            errors = obj.errors.all()[:self.ERRORS_PREVIEW_LIMIT]
         return ImportRowErrorSerializer(errors, many=True).data
 
     def get_duration(self, obj) -> str:
@@ -58,10 +107,11 @@ class ImportJobCreateSerializer(serializers.ModelSerializer):
         max_length=255,
         allow_empty_file=False
     )
+    bulk = serializers.BooleanField(write_only=True, allow_null=True, default=None)
 
     class Meta:
         model = ImportJob
-        fields = ['file']
+        fields = ['file', 'bulk']
         read_only_fields = ['id', 'status', 'created_at']
 
     def validate_file(self, file):
@@ -86,11 +136,21 @@ class ImportJobCreateSerializer(serializers.ModelSerializer):
     def create(self, validated_data):
         request = self.context.get('request')
         file = validated_data.pop('file')
+        uploader = request.user if request and request.user.is_authenticated else None
+
+        is_bulk = validated_data.pop('bulk', None)
+        if is_bulk is None:
+            # Fall back to the uploader's default
+            profile = ImportProfile.objects.filter(user=uploader).first() if uploader else None
+            is_bulk = bool(profile and profile.bulk_by_default)
 
         import_job = ImportJob(
             filename=file.name,
             file_path=self._save_uploaded_file(file),
-            uploader=request.user if request and request.user.is_authenticated else None
+            file_size=file.size,
+            status=validated_data.get('status', ImportJob.PENDING),
+            is_bulk=is_bulk,
+            uploader=uploader
         )
         import_job.save()
 
@@ -109,9 +169,14 @@ class ImportJobCreateSerializer(serializers.ModelSerializer):
         return file_path
 
 
-class ImportJobStatusSerializer(serializers.ModelSerializer):
+class ImportJobStatusSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    ERRORS_PREVIEW_LIMIT = 10
+
     progress_percent = serializers.SerializerMethodField()
     errors_preview = serializers.SerializerMethodField()
+    error_summary = ImportErrorSummarySerializer(source='error_summaries', many=True, read_only=True)
+    # Null until the job has finished
+    performance = ImportJobPerformanceSerializer(read_only=True, allow_null=True)
 
     class Meta:
         model = ImportJob
@@ -125,6 +190,8 @@ class ImportJobStatusSerializer(serializers.ModelSerializer):
             'error_count',
             'progress_percent',
             'errors_preview',
+            'error_summary',
+            'performance',
             'created_at',
             'started_at',
             'finished_at',
@@ -135,5 +202,7 @@ class ImportJobStatusSerializer(serializers.ModelSerializer):
         return obj.progress_percent
 
     def get_errors_preview(self, obj) -> list:
-        errors = obj.errors.all()[:10]
+        errors = getattr(obj, 'preview_errors', None)
+        if errors is None:
+            errors = obj.errors.all()[:self.ERRORS_PREVIEW_LIMIT]
         return ImportRowErrorSerializer(errors, many=True).data
\ No newline at end of file
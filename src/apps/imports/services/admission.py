@@ -0,0 +1,70 @@
+import logging
+from dataclasses import dataclass
+from django.conf import settings
+from django.db.models import Sum
+from apps.imports.models import ImportJob
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class AdmissionDecision:
+    ADMIT = 'admit'
+    DEFER = 'defer'
+    REJECT = 'reject'
+
+    action: str
+    reason: str = ''
+    retry_after: int = 0
+
+
+class AdmissionController:
+    """Check the import backlog against the configured limits before accepting a file."""
+
+    # Jobs that have been accepted but not finished yet.
+    QUEUED_STATUSES = [ImportJob.PENDING, ImportJob.PROCESSING]
+    UNFINISHED_STATUSES = QUEUED_STATUSES + [ImportJob.DEFERRED]
+
+    def __init__(self):
+        self.max_jobs = settings.IMPORT_MAX_PENDING_JOBS
+        self.max_bytes = settings.IMPORT_MAX_PENDING_BYTES
+        self.defer_when_busy = settings.IMPORT_DEFER_WHEN_BUSY
+        self.retry_after = settings.IMPORT_RETRY_AFTER_SECONDS
+
+    def queued_job_count(self) -> int:
+        return ImportJob.objects.filter(status__in=self.QUEUED_STATUSES).count()
+
+    def unfinished_bytes(self) -> int:
+        result = ImportJob.objects.filter(
+            status__in=self.UNFINISHED_STATUSES
+        ).aggregate(total=Sum('file_size'))
+        return result['total'] or 0
+
+    def available_slots(self) -> int:
+        return max(self.max_jobs - self.queued_job_count(), 0)
+
+    def check(self, incoming_bytes: int = 0) -> AdmissionDecision:
+        # Deferred uploads still sit on the uploads volume, so the byte limit
+        # is enforced by rejecting rather than deferring.
+        if self.max_bytes and self.unfinished_bytes() + incoming_bytes > self.max_bytes:
+            logger.warning("Import backlog byte limit reached, rejecting upload")
+            return AdmissionDecision(
+                AdmissionDecision.REJECT,
+                reason="Import storage backlog is full.",
+                retry_after=self.retry_after
+            )
+
+        if self.max_jobs and self.queued_job_count() >= self.max_jobs:
+            if self.defer_when_busy:
+                return AdmissionDecision(
+                    AdmissionDecision.DEFER,
+                    reason="Import queue is busy. Job deferred."
+                )
+            logger.warning("Import backlog job limit reached, rejecting upload")
+            return AdmissionDecision(
+                AdmissionDecision.REJECT,
+                reason="Too many pending imports.",
+                retry_after=self.retry_after
+            )
+
+        return AdmissionDecision(AdmissionDecision.ADMIT)
@@ -0,0 +1,267 @@
+import csv
+import logging
+import os
+import platform
+import random
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional
+from unittest import mock
+import django
+from django.db import connection
+from django.utils import timezone
+from apps.books.models import Book
+from apps.core.utils import current_rss_bytes
+from apps.imports.models import ImportJob
+
+logger = logging.getLogger(__name__)
+
+ISBN_PREFIX = 'BENCH'
+
+FIRST_NAMES = ['Jane', 'John', 'Ada', 'Alan', 'Grace', 'Linus', 'Barbara', 'Ken']
+LAST_NAMES = ['Austen', 'Smith', 'Lovelace', 'Turing', 'Hopper', 'Torvalds', 'Liskov', 'Thompson']
+NON_ASCII_NAMES = ['Gabriel García Márquez', 'Fyodor Dostoyevsky', 'Émile Zola', 'Søren Kierkegaard',
+                   'Jiří Šotola', 'Ōe Kenzaburō', 'Halldór Laxness', 'Wisława Szymborska']
+TITLE_WORDS = ['History', 'Garden', 'Night', 'River', 'Machine', 'Shadow', 'Letters', 'Empire',
+               'Silence', 'Journey', 'Winter', 'Atlas']
+
+
+@dataclass
+class SyntheticCSVGenerator:
+    """
+    Stream a synthetic book CSV to disk.
+
+    Rows are derived from their index, so duplicates can point back at earlier rows
+    without keeping them in memory and the same seed always yields the same file.
+    """
+
+    rows: int
+    duplicate_rate: float = 0.0
+    error_rate: float = 0.0
+    non_ascii_rate: float = 0.0
+    encoding: str = 'utf-8'
+    seed: int = 42
+    isbn_prefix: str = ISBN_PREFIX
+
+    def write(self, path: str) -> str:
+        rng = random.Random(self.seed)
+
+        with open(path, 'w', encoding=self.encoding, errors='replace', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(['title', 'author', 'isbn', 'publication_year'])
+
+            for index in range(self.rows):
+                roll = rng.random()
+                if roll < self.error_rate:
+                    writer.writerow(self._invalid_row(rng, index))
+                elif index and roll < self.error_rate + self.duplicate_rate:
+                    writer.writerow(self._valid_row(rng, index, isbn_index=rng.randrange(index)))
+                else:
+                    writer.writerow(self._valid_row(rng, index))
+
+        return path
+
+    def _isbn(self, index: int) -> str:
+        return f'{self.isbn_prefix}{index:012d}'
+
+    def _valid_row(self, rng: random.Random, index: int, isbn_index: Optional[int] = None) -> List[str]:
+        if rng.random() < self.non_ascii_rate:
+            author = rng.choice(NON_ASCII_NAMES)
+        else:
+            author = f'{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}'
+        title = f'{rng.choice(TITLE_WORDS)} of the {rng.choice(TITLE_WORDS)} {index}'
+        isbn = self._isbn(index if isbn_index is None else isbn_index)
+        return [title, author, isbn, str(rng.randint(1800, 2024))]
+
+    def _invalid_row(self, rng: random.Random, index: int) -> List[str]:
+        row = self._valid_row(rng, index)
+        kind = rng.randrange(3)
+        if kind == 0:
+            row[1] = ''  # Missing author
+        elif kind == 1:
+            row[3] = 'unknown'  # Unparseable year
+        else:
+            row[3] = '3000'  # Year out of range
+        return row
+
+
+class QueryCounter:
+    """``connection.execute_wrapper`` hook that counts queries without storing them."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+@dataclass
+class BenchmarkResult:
+    mode: str
+    rows: int
+    duplicate_rate: float
+    error_rate: float
+    non_ascii_rate: float
+    encoding: str
+    seconds: float
+    rows_per_second: float
+    queries: int
+    queries_per_1k_rows: float
+    peak_rss_mb: float
+    success_count: int
+    error_count: int
+    status: str
+
+    @property
+    def key(self) -> str:
+        return (
+            f'{self.mode}:{self.rows}:{self.duplicate_rate}:{self.error_rate}:'
+            f'{self.non_ascii_rate}:{self.encoding}'
+        )
+
+
+class PeakRSSSampler:
+    """
+    Highest RSS of this process while the block runs, sampled on a thread.
+
+    Unlike ``ru_maxrss`` it starts over for every run, so a small run after a large
+    one is not charged the large one's peak (``current_rss_bytes`` only falls back
+    to the high-water mark where ``/proc`` is unavailable).
+    """
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.peak_bytes = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+
+    def __enter__(self) -> 'PeakRSSSampler':
+        self.peak_bytes = current_rss_bytes()
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.peak_bytes = max(self.peak_bytes, current_rss_bytes())
+
+    def _sample(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.peak_bytes = max(self.peak_bytes, current_rss_bytes())
+
+    @property
+    def peak_mb(self) -> float:
+        return round(self.peak_bytes / (1024 * 1024), 1)
+
+
+@dataclass
+class ImportBenchmark:
+    """Run CSVImporter or the full process_csv_import task over a generated file."""
+
+    generator: SyntheticCSVGenerator
+    mode: str = 'task'
+    keep_data: bool = False
+
+    MODES = ['importer', 'task']
+
+    def run(self, work_dir: str) -> BenchmarkResult:
+        path = self.generator.write(
+            os.path.join(work_dir, f'bench_{self.generator.rows}_{self.generator.seed}.csv')
+        )
+        job = ImportJob.objects.create(
+            filename=os.path.basename(path),
+            file_path=path,
+            file_size=os.path.getsize(path)
+        )
+
+        counter = QueryCounter()
+        memory = PeakRSSSampler()
+        started = time.perf_counter()
+        try:
+            with connection.execute_wrapper(counter), memory:
+                self._execute(job)
+        except Exception as exc:
+            # The failed job is still reported; its status shows what happened
+            logger.error(f"Benchmark import of {path} failed: {exc}")
+        finally:
+            seconds = time.perf_counter() - started
+            os.unlink(path)
+
+        job.refresh_from_db()
+        result = BenchmarkResult(
+            mode=self.mode,
+            rows=self.generator.rows,
+            duplicate_rate=self.generator.duplicate_rate,
+            error_rate=self.generator.error_rate,
+            non_ascii_rate=self.generator.non_ascii_rate,
+            encoding=self.generator.encoding,
+            seconds=round(seconds, 3),
+            rows_per_second=round(self.generator.rows / seconds, 1) if seconds else 0.0,
+            queries=counter.count,
+            queries_per_1k_rows=round(counter.count * 1000 / max(self.generator.rows, 1), 1),
+            peak_rss_mb=memory.peak_mb,
+            success_count=job.success_count,
+            error_count=job.error_count,
+            status=job.status,
+        )
+        if not self.keep_data:
+            self.cleanup(job)
+        return result
+
+    def _execute(self, job: ImportJob) -> None:
+        from apps.imports.services.csv_importer import CSVImporter
+        from apps.imports.tasks import process_csv_import
+
+        if self.mode == 'importer':
+            job.mark_started()
+            success_count, error_count = CSVImporter(job).process_file()
+            job.mark_completed(success_count, error_count)
+        else:
+            # A finished task releases the next deferred jobs; real uploads must not be
+            # sent to Celery by a benchmark
+            with mock.patch('apps.imports.tasks._release_next'):
+                process_csv_import(job.id)
+
+    def cleanup(self, job: ImportJob) -> None:
+        Book.objects.filter(isbn__startswith=self.generator.isbn_prefix).delete()
+        job.delete()
+
+
+def build_baseline(results: List[BenchmarkResult]) -> Dict:
+    return {
+        'generated_at': timezone.now().isoformat(),
+        'database': connection.vendor,
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'results': [asdict(result) for result in results],
+    }
+
+
+def compare_to_baseline(results: List[BenchmarkResult], baseline: Dict,
+                        tolerance: float = 0.1) -> List[str]:
+    """Return a description of every metric that regressed by more than ``tolerance``."""
+    previous = {}
+    for row in baseline.get('results', []):
+        previous[BenchmarkResult(**row).key] = row
+
+    regressions = []
+    for result in results:
+        old = previous.get(result.key)
+        if not old:
+            continue
+
+        if result.rows_per_second < old['rows_per_second'] * (1 - tolerance):
+            regressions.append(
+                f"{result.key} rows/sec {old['rows_per_second']} -> {result.rows_per_second}"
+            )
+        if result.queries_per_1k_rows > old['queries_per_1k_rows'] * (1 + tolerance):
+            regressions.append(
+                f"{result.key} queries/1k rows {old['queries_per_1k_rows']} -> {result.queries_per_1k_rows}"
+            )
+        if result.peak_rss_mb > old['peak_rss_mb'] * (1 + tolerance):
+            regressions.append(
+                f"{result.key} peak RSS MB {old['peak_rss_mb']} -> {result.peak_rss_mb}"
+            )
+    return regressions
@@ -0,0 +1,117 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import List, Sequence, Tuple
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import connection, models, transaction
+from apps.core.utils import keyset_chunks
+from apps.imports.models import ImportJob
+from apps.imports.services.status_cache import forget_status
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CleanupBatch:
+    jobs: int
+    related_rows: int
+    files: int
+    seconds: float
+
+
+@dataclass
+class CleanupReport:
+    batches: List[CleanupBatch] = field(default_factory=list)
+
+    @property
+    def deleted_jobs(self) -> int:
+        return sum(batch.jobs for batch in self.batches)
+
+
+class ImportJobCleanup:
+    """
+    Delete finished import jobs created before ``cutoff``, a batch at a time.
+
+    Each batch is a short transaction: the finished jobs are locked (rows already
+    locked, e.g. by a retry, are skipped), their cascaded rows and then the jobs are
+    removed with set-based DELETEs instead of Django's collector, which would load
+    every related row into memory. Upload files are removed after the commit on a
+    thread pool, so a failed file delete never leaves a job half-deleted.
+    """
+
+    FINISHED_STATUSES = [ImportJob.SUCCESS, ImportJob.FAILURE]
+
+    def __init__(self, cutoff: datetime, batch_size: int = None, file_workers: int = None):
+        self.cutoff = cutoff
+        self.batch_size = batch_size or settings.IMPORT_CLEANUP_BATCH_SIZE
+        self.file_workers = file_workers or settings.IMPORT_CLEANUP_FILE_WORKERS
+
+    def expired(self):
+        return ImportJob.objects.filter(status__in=self.FINISHED_STATUSES, created_at__lt=self.cutoff)
+
+    def run(self) -> CleanupReport:
+        report = CleanupReport()
+        batches = keyset_chunks(self.expired(), batch_size=self.batch_size, values=('id',), flat=True)
+
+        with ThreadPoolExecutor(max_workers=self.file_workers) as pool:
+            for batch_ids in batches:
+                started = time.monotonic()
+                jobs, related_rows, file_paths = self._delete_batch(batch_ids)
+                removed = sum(pool.map(self._delete_file, file_paths))
+
+                batch = CleanupBatch(jobs, related_rows, removed, round(time.monotonic() - started, 3))
+                report.batches.append(batch)
+                logger.info(
+                    f"Cleanup batch {len(report.batches)}: {batch.jobs} jobs, "
+                    f"{batch.related_rows} related rows, {batch.files} files in {batch.seconds}s"
+                )
+
+        logger.info(f"Cleaned up {report.deleted_jobs} old import jobs in {len(report.batches)} batches")
+        return report
+
+    def _delete_batch(self, batch_ids: Sequence[int]) -> Tuple[int, int, List[str]]:
+        with transaction.atomic():
+            # Re-check the status under lock: a job retried since selection is kept
+            locked = list(
+                self.expired().filter(id__in=batch_ids)
+                .select_for_update(skip_locked=True)
+                .values_list('id', 'file_path')
+            )
+            if not locked:
+                return 0, 0, []
+
+            job_ids = [job_id for job_id, _ in locked]
+            related_rows = sum(
+                self._delete_where(relation.related_model._meta.db_table, relation.field.column, job_ids)
+                for relation in ImportJob._meta.related_objects
+                if relation.on_delete is models.CASCADE
+            )
+            jobs = self._delete_where(ImportJob._meta.db_table, ImportJob._meta.pk.column, job_ids)
+            # The raw DELETEs skip ImportJob.delete, which drops the cached status
+            transaction.on_commit(lambda: forget_status(job_ids))
+
+        return jobs, related_rows, [file_path for _, file_path in locked if file_path]
+
+    @staticmethod
+    def _delete_where(table: str, column: str, ids: Sequence[int]) -> int:
+        placeholders = ', '.join(['%s'] * len(ids))
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {connection.ops.quote_name(table)} '
+                f'WHERE {connection.ops.quote_name(column)} IN ({placeholders})',
+                list(ids)
+            )
+            return cursor.rowcount
+
+    @staticmethod
+    def _delete_file(file_path: str) -> bool:
+        try:
+            if default_storage.exists(file_path):
+                default_storage.delete(file_path)
+                return True
+        except Exception as exc:
+            logger.error(f"Failed to delete import file {file_path}: {exc}")
+        return False
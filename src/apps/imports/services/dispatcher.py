@@ -0,0 +1,124 @@
+import logging
+from itertools import zip_longest
+from typing import Dict, List, Optional
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Min
+from apps.imports.models import ImportJob, User
+from apps.imports.services.admission import AdmissionController
+from apps.imports.services.status_cache import bump_status_version
+
+logger = logging.getLogger(__name__)
+
+
+class FairShareDispatcher:
+    """
+    Hand deferred import jobs to Celery fairly across uploaders.
+
+    Each uploader may have at most ``IMPORT_MAX_ACTIVE_JOBS_PER_USER`` jobs queued or
+    processing at a time; the rest wait as DEFERRED. Free slots are filled round-robin,
+    starting with the uploader who has been waiting longest. Bulk jobs are left to the
+    off-peak scheduler.
+    """
+
+    def __init__(self):
+        self.per_user_limit = settings.IMPORT_MAX_ACTIVE_JOBS_PER_USER
+        self.admission = AdmissionController()
+
+    def submit(self, job: ImportJob) -> ImportJob:
+        """Dispatch a freshly accepted job now if its uploader is under the limit."""
+        if job.is_bulk:
+            return job
+
+        if dispatch_job(job.id, per_user_limit=self.per_user_limit):
+            job.status = ImportJob.PENDING
+        return job
+
+    def dispatch(self) -> int:
+        """Fill the free capacity with deferred jobs, one uploader at a time."""
+        slots = self.admission.available_slots()
+        if not slots:
+            return 0
+
+        active = self._active_counts()
+        waiting = (
+            ImportJob.objects.filter(status=ImportJob.DEFERRED, is_bulk=False)
+            .values('uploader_id')
+            .annotate(oldest=Min('created_at'))
+            .order_by('oldest')
+        )
+
+        queues = []
+        for row in waiting:
+            allowance = min(self.per_user_limit - active.get(row['uploader_id'], 0), slots)
+            if allowance > 0:
+                queues.append(self._deferred_ids(row['uploader_id'], allowance))
+
+        dispatched = 0
+        for job_id in self._round_robin(queues):
+            if dispatched >= slots:
+                break
+            if dispatch_job(job_id, per_user_limit=self.per_user_limit):
+                dispatched += 1
+
+        if dispatched:
+            logger.info(f"Dispatched {dispatched} deferred import jobs")
+        return dispatched
+
+    def _active_counts(self) -> Dict:
+        rows = (
+            ImportJob.objects.filter(status__in=AdmissionController.QUEUED_STATUSES, is_bulk=False)
+            .order_by()
+            .values('uploader_id')
+            .annotate(active=Count('id'))
+        )
+        return {row['uploader_id']: row['active'] for row in rows}
+
+    def _deferred_ids(self, uploader_id, limit: int) -> List[int]:
+        return list(
+            ImportJob.objects.filter(status=ImportJob.DEFERRED, is_bulk=False, uploader_id=uploader_id)
+            .order_by('created_at', 'id')
+            .values_list('id', flat=True)[:limit]
+        )
+
+    @staticmethod
+    def _round_robin(queues: List[List[int]]):
+        for batch in zip_longest(*queues):
+            for job_id in batch:
+                if job_id is not None:
+                    yield job_id
+
+
+def dispatch_job(job_id: int, per_user_limit: Optional[int] = None) -> bool:
+    """
+    Move a deferred job to PENDING and enqueue it; False if someone else already did,
+    or, with ``per_user_limit``, if its uploader already has that many jobs queued.
+    """
+    from apps.imports.tasks import process_csv_import
+
+    with transaction.atomic():
+        if per_user_limit is not None and not _under_user_limit(job_id, per_user_limit):
+            return False
+        # Conditional update so concurrent dispatchers never send a job twice
+        updated = ImportJob.objects.filter(
+            id=job_id, status=ImportJob.DEFERRED
+        ).update(status=ImportJob.PENDING)
+    if updated:
+        bump_status_version(job_id)
+        process_csv_import.delay(job_id)
+    return bool(updated)
+
+
+def _under_user_limit(job_id: int, per_user_limit: int) -> bool:
+    """Whether the job's uploader has a free slot; call inside the dispatching transaction."""
+    uploader_id = ImportJob.objects.filter(id=job_id).values_list('uploader_id', flat=True).first()
+    if uploader_id is not None:
+        # Locks the uploader until the dispatch commits, so concurrent uploads and
+        # dispatcher runs cannot both count the same last free slot
+        list(User.objects.select_for_update().filter(pk=uploader_id).values_list('pk', flat=True))
+    active = ImportJob.objects.filter(
+        uploader_id=uploader_id,
+        status__in=AdmissionController.QUEUED_STATUSES,
+        is_bulk=False
+    ).count()
+    return active < per_user_limit
@@ -0,0 +1,61 @@
+import csv
+import json
+from typing import Iterator, Tuple
+from apps.core.utils import keyset_iterator
+from apps.imports.models import ImportJob, ImportRowError
+
+EXPORT_FIELDS = ['row_number', 'code', 'error_message', 'raw_data', 'created_at']
+
+
+class Echo:
+    """File-like object whose write() hands the line back for streaming."""
+
+    def write(self, value):
+        return value
+
+
+class ErrorReportExporter:
+    """Stream every ImportRowError of a job as CSV or NDJSON in constant memory."""
+
+    FORMATS = {
+        'csv': 'text/csv',
+        'ndjson': 'application/x-ndjson',
+    }
+
+    def __init__(self, import_job: ImportJob, batch_size: int = 2000):
+        self.import_job = import_job
+        self.batch_size = batch_size
+
+    def iter_rows(self) -> Iterator[Tuple]:
+        # Keyset pagination on the (import_job, row_number) index; id breaks ties
+        return keyset_iterator(
+            ImportRowError.objects.filter(import_job=self.import_job),
+            ordering=('row_number', 'id'),
+            batch_size=self.batch_size,
+            values=('row_number', 'code', 'error_message', 'raw_data', 'created_at'),
+            server_side=True,
+        )
+
+    def stream(self, output: str = 'csv') -> Iterator[str]:
+        if output == 'ndjson':
+            return self._ndjson()
+        return self._csv()
+
+    def filename(self, output: str = 'csv') -> str:
+        return f'import_{self.import_job.id}_errors.{output}'
+
+    def _csv(self) -> Iterator[str]:
+        writer = csv.writer(Echo())
+        yield writer.writerow(EXPORT_FIELDS)
+        for row_number, code, error_message, raw_data, created_at in self.iter_rows():
+            yield writer.writerow([row_number, code, error_message, raw_data, created_at.isoformat()])
+
+    def _ndjson(self) -> Iterator[str]:
+        for row_number, code, error_message, raw_data, created_at in self.iter_rows():
+            yield json.dumps({
+                'row_number': row_number,
+                'code': code,
+                'error_message': error_message,
+                'raw_data': raw_data,
+                'created_at': created_at.isoformat(),
+            }) + '\n'
@@ -0,0 +1,61 @@
+from dataclasses import dataclass, field
+from typing import Dict, List
+from django.conf import settings
+from apps.imports.models import ImportErrorSummary, ImportJob
+
+
+@dataclass
+class CodeAggregate:
+    count: int = 0
+    row_ranges: List[List[int]] = field(default_factory=list)
+    ranges_truncated: bool = False
+    sample_message: str = ''
+
+
+class ErrorAggregator:
+    """
+    Fold row errors into one summary per error code.
+
+    Only the first ``IMPORT_ERROR_SAMPLES_PER_CODE`` errors of each code are worth
+    storing as full ImportRowError rows; the rest are counted and folded into
+    row-number ranges, capped at ``IMPORT_ERROR_MAX_RANGES`` runs per code.
+    """
+
+    def __init__(self, import_job: ImportJob):
+        self.import_job = import_job
+        self.samples_per_code = settings.IMPORT_ERROR_SAMPLES_PER_CODE
+        self.max_ranges = settings.IMPORT_ERROR_MAX_RANGES
+        self.aggregates: Dict[str, CodeAggregate] = {}
+        self._dirty = set()
+
+    def record(self, code: str, row_number: int, message: str) -> bool:
+        """Count the error; True if its full row should still be stored as a sample."""
+        aggregate = self.aggregates.setdefault(code, CodeAggregate(sample_message=message))
+        aggregate.count += 1
+        self._dirty.add(code)
+
+        ranges = aggregate.row_ranges
+        if ranges and ranges[-1][1] + 1 == row_number:
+            ranges[-1][1] = row_number
+        elif len(ranges) < self.max_ranges:
+            ranges.append([row_number, row_number])
+        else:
+            aggregate.ranges_truncated = True
+
+        return aggregate.count <= self.samples_per_code
+
+    def flush(self) -> None:
+        """Write the codes that changed since the last flush."""
+        for code in self._dirty:
+            aggregate = self.aggregates[code]
+            ImportErrorSummary.objects.update_or_create(
+                import_job=self.import_job,
+                code=code,
+                defaults={
+                    'count': aggregate.count,
+                    'row_ranges': aggregate.row_ranges,
+                    'ranges_truncated': aggregate.ranges_truncated,
+                    'sample_message': aggregate.sample_message,
+                }
+            )
+        self._dirty.clear()
@@ -0,0 +1,60 @@
+import logging
+from datetime import datetime, time
+from typing import List, Optional, Tuple
+from django.conf import settings
+from django.utils import timezone
+from apps.imports.models import ImportJob
+from apps.imports.services.admission import AdmissionController
+from apps.imports.services.dispatcher import dispatch_job
+
+logger = logging.getLogger(__name__)
+
+
+def parse_window(value: str) -> Tuple[time, time]:
+    """Parse an ``HH:MM-HH:MM`` window; the end may wrap past midnight."""
+    start, end = value.strip().split('-')
+    return time.fromisoformat(start.strip()), time.fromisoformat(end.strip())
+
+
+def in_off_peak_window(windows: List[str], now: Optional[datetime] = None) -> bool:
+    current = timezone.localtime(now or timezone.now()).time()
+
+    for window in windows:
+        start, end = parse_window(window)
+        if start <= end:
+            if start <= current < end:
+                return True
+        elif current >= start or current < end:
+            return True
+    return False
+
+
+class BulkImportScheduler:
+    """Release deferred bulk imports only inside the configured off-peak windows."""
+
+    def __init__(self):
+        self.windows = settings.IMPORT_BULK_WINDOWS
+        self.max_concurrent = settings.IMPORT_BULK_MAX_CONCURRENT_JOBS
+
+    def release(self, now: Optional[datetime] = None) -> int:
+        if not in_off_peak_window(self.windows, now):
+            return 0
+
+        running = ImportJob.objects.filter(
+            status__in=AdmissionController.QUEUED_STATUSES,
+            is_bulk=True
+        ).count()
+        slots = self.max_concurrent - running
+        if slots <= 0:
+            return 0
+
+        job_ids = list(
+            ImportJob.objects.filter(status=ImportJob.DEFERRED, is_bulk=True)
+            .order_by('created_at', 'id')
+            .values_list('id', flat=True)[:slots]
+        )
+        released = sum(1 for job_id in job_ids if dispatch_job(job_id))
+
+        if released:
+            logger.info(f"Released {released} bulk import jobs in off-peak window")
+        return released
@@ -0,0 +1,194 @@
+import logging
+import re
+from datetime import date, datetime, time, timedelta
+from typing import List, Optional, Tuple
+from django.db import connection, transaction
+from django.db.models import QuerySet
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+UPPER_BOUND_RE = re.compile(r"TO \('([^']+)'\)")
+
+
+def partition_name(table: str, day: date) -> str:
+    return f'{table}_p{day:%Y%m%d}'
+
+
+def partition_bounds(day: date) -> Tuple[datetime, datetime]:
+    start = datetime.combine(day, time.min, tzinfo=timezone.utc)
+    return start, start + timedelta(days=1)
+
+
+class PartitionManager:
+    """
+    Daily range partitions on ``created_at`` for an append-only table.
+
+    Only PostgreSQL is partitioned; on other backends (SQLite in tests) every
+    operation is a no-op and the plain table created by Django is used as is.
+    Retention then drops whole partitions instead of running large DELETEs.
+    """
+
+    def __init__(self, table: str = 'import_row_errors', parent_table: str = 'import_jobs',
+                 parent_column: str = 'import_job_id'):
+        self.table = table
+        self.parent_table = parent_table
+        self.parent_column = parent_column
+
+    @property
+    def is_supported(self) -> bool:
+        return connection.vendor == 'postgresql'
+
+    def is_partitioned(self) -> bool:
+        if not self.is_supported:
+            return False
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT 1 FROM pg_partitioned_table pt "
+                "JOIN pg_class c ON c.oid = pt.partrelid WHERE c.relname = %s",
+                [self.table]
+            )
+            return cursor.fetchone() is not None
+
+    def convert(self) -> bool:
+        """
+        Turn the plain table into a partitioned one.
+
+        The existing table is kept, attached as a single legacy partition covering
+        everything up to tomorrow, so no rows are copied and it is dropped like any
+        other partition once it falls out of retention.
+        """
+        if not self.is_supported or self.is_partitioned():
+            return False
+
+        legacy = f'{self.table}_legacy'
+        sequence = f'{self.table}_part_id_seq'
+        boundary = timezone.now().date() + timedelta(days=1)
+        boundary_start, _ = partition_bounds(boundary)
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f'ALTER TABLE {self.table} RENAME TO {legacy}')
+            cursor.execute(
+                f'CREATE TABLE {self.table} (LIKE {legacy} INCLUDING DEFAULTS) '
+                f'PARTITION BY RANGE (created_at)'
+            )
+            # The legacy id is an identity column; continue its numbering from a plain sequence
+            cursor.execute(f'CREATE SEQUENCE IF NOT EXISTS {sequence} OWNED BY {self.table}.id')
+            cursor.execute(f"SELECT setval('{sequence}', COALESCE((SELECT MAX(id) FROM {legacy}), 0) + 1, false)")
+            cursor.execute(f"ALTER TABLE {self.table} ALTER COLUMN id SET DEFAULT nextval('{sequence}')")
+            # Unique constraints on a partitioned table must include the partition key
+            cursor.execute(f'ALTER TABLE {self.table} ADD PRIMARY KEY (id, created_at)')
+            cursor.execute(
+                f'ALTER TABLE {self.table} ADD CONSTRAINT {self.table}_{self.parent_column}_fk '
+                f'FOREIGN KEY ({self.parent_column}) REFERENCES {self.parent_table} (id) '
+                f'DEFERRABLE INITIALLY DEFERRED'
+            )
+            cursor.execute(f'CREATE INDEX ON {self.table} ({self.parent_column}, row_number)')
+            cursor.execute(f'CREATE INDEX ON {self.table} ({self.parent_column}, code)')
+            # A partition cannot keep an identity column its parent lacks; the ids now
+            # come from the sequence above
+            cursor.execute(f'ALTER TABLE {legacy} ALTER COLUMN id DROP IDENTITY IF EXISTS')
+            cursor.execute(
+                f'ALTER TABLE {self.table} ATTACH PARTITION {legacy} '
+                f'FOR VALUES FROM (MINVALUE) TO (%s)',
+                [boundary_start]
+            )
+            cursor.execute(f'CREATE TABLE IF NOT EXISTS {self.table}_default PARTITION OF {self.table} DEFAULT')
+
+        self.ensure_partitions(start=boundary)
+        logger.info(f"Converted {self.table} to a partitioned table")
+        return True
+
+    def ensure_partitions(self, days_ahead: int = 7, start: Optional[date] = None) -> List[str]:
+        """Create the daily partitions from ``start`` (today) through ``days_ahead`` days."""
+        if not self.is_partitioned():
+            return []
+
+        start = start or timezone.now().date()
+        existing = {name for name, _ in self.partitions()}
+        created = []
+
+        with connection.cursor() as cursor:
+            for offset in range(days_ahead + 1):
+                day = start + timedelta(days=offset)
+                name = partition_name(self.table, day)
+                if name in existing:
+                    continue
+                lower, upper = partition_bounds(day)
+                cursor.execute(
+                    f'CREATE TABLE IF NOT EXISTS {name} PARTITION OF {self.table} '
+                    f'FOR VALUES FROM (%s) TO (%s)',
+                    [lower, upper]
+                )
+                created.append(name)
+
+        if created:
+            logger.info(f"Created {len(created)} partitions of {self.table}")
+        return created
+
+    def holds_other_parents(self, name: str, upper: datetime, deletable_parents: QuerySet) -> bool:
+        """Whether partition ``name`` (ending at ``upper``) has rows of parents outside ``deletable_parents``."""
+        conditions, params = ['created_at < %s'], [connection.ops.adapt_datetimefield_value(upper)]
+        if not name.endswith('_legacy'):
+            # Daily partitions; the legacy one reaches back to MINVALUE
+            conditions.append('created_at >= %s')
+            params.append(connection.ops.adapt_datetimefield_value(upper - timedelta(days=1)))
+        parents_sql, parents_params = deletable_parents.values('pk').query.sql_with_params()
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT 1 FROM {self.table} WHERE {' AND '.join(conditions)} "
+                f"AND {self.parent_column} NOT IN ({parents_sql}) LIMIT 1",
+                [*params, *parents_params]
+            )
+            return cursor.fetchone() is not None
+
+    def partitions(self) -> List[Tuple[str, Optional[datetime]]]:
+        """Attached partitions with their upper bound (None for the default partition)."""
+        if not self.is_supported:
+            return []
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT child.relname, pg_get_expr(child.relpartbound, child.oid) "
+                "FROM pg_inherits i "
+                "JOIN pg_class parent ON parent.oid = i.inhparent "
+                "JOIN pg_class child ON child.oid = i.inhrelid "
+                "WHERE parent.relname = %s ORDER BY child.relname",
+                [self.table]
+            )
+            rows = cursor.fetchall()
+
+        partitions = []
+        for name, bound in rows:
+            match = UPPER_BOUND_RE.search(bound or '')
+            partitions.append((name, datetime.fromisoformat(match.group(1)) if match else None))
+        return partitions
+
+    def drop_expired(self, retention_days: int, detach_only: bool = False,
+                     deletable_parents: Optional[QuerySet] = None) -> List[str]:
+        """
+        Drop (or just detach) every partition whose rows are all older than the retention.
+
+        With ``deletable_parents`` (the parent rows retention deletes anyway), a
+        partition that still holds rows of any other parent is kept: dropping it
+        would empty e.g. the error report of a job the cleanup deliberately keeps.
+        """
+        cutoff = timezone.now() - timedelta(days=retention_days)
+        expired = [
+            name for name, upper in self.partitions()
+            if upper is not None and upper <= cutoff
+            and not (deletable_parents is not None and self.holds_other_parents(name, upper, deletable_parents))
+        ]
+
+        with connection.cursor() as cursor:
+            for name in expired:
+                if detach_only:
+                    cursor.execute(f'ALTER TABLE {self.table} DETACH PARTITION {name}')
+                else:
+                    cursor.execute(f'DROP TABLE {name}')
+
+        if expired:
+            action = 'Detached' if detach_only else 'Dropped'
+            logger.info(f"{action} {len(expired)} expired partitions of {self.table}")
+        return expired
@@ -0,0 +1,168 @@
+import math
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Optional, Sequence
+from django.db import transaction
+from django.utils import timezone
+from apps.imports.models import ImportJob, ImportJobPerformance, ImportStatsRollup
+from apps.imports.services.status_cache import bump_status_version
+
+STATS_WINDOWS = {
+    '1h': timedelta(hours=1),
+    '24h': timedelta(hours=24),
+    '7d': timedelta(days=7),
+    '30d': timedelta(days=30),
+}
+
+PERCENTILES = (0.5, 0.9, 0.95, 0.99)
+
+
+class LogHistogram:
+    """
+    Log-scale histogram stored as ``{bucket index: count}``.
+
+    Buckets grow by a factor of 2**(1/4), so a percentile read back from merged
+    buckets is within about 10% of the exact value. Zero and negative values
+    share the ``"z"`` bucket.
+    """
+
+    BASE = 2 ** 0.25
+    ZERO = 'z'
+
+    @classmethod
+    def bucket(cls, value: float) -> str:
+        if value <= 0:
+            return cls.ZERO
+        return str(math.floor(math.log(value, cls.BASE)))
+
+    @classmethod
+    def add(cls, histogram: Dict[str, int], value: Optional[float]) -> None:
+        if value is None:
+            return
+        key = cls.bucket(value)
+        histogram[key] = histogram.get(key, 0) + 1
+
+    @classmethod
+    def merge(cls, histograms: Iterable[Dict[str, int]]) -> Dict[str, int]:
+        merged: Dict[str, int] = {}
+        for histogram in histograms:
+            for key, count in histogram.items():
+                merged[key] = merged.get(key, 0) + count
+        return merged
+
+    @classmethod
+    def percentiles(cls, histogram: Dict[str, int], quantiles: Sequence[float] = PERCENTILES) -> Dict[str, float]:
+        total = sum(histogram.values())
+        if not total:
+            return {f'p{round(q * 100)}': None for q in quantiles}
+
+        ordered = sorted(histogram.items(), key=lambda item: -math.inf if item[0] == cls.ZERO else int(item[0]))
+        result = {}
+        for quantile in quantiles:
+            rank = quantile * total
+            seen = 0
+            for key, count in ordered:
+                seen += count
+                if seen >= rank:
+                    result[f'p{round(quantile * 100)}'] = cls._midpoint(key)
+                    break
+        return result
+
+    @classmethod
+    def _midpoint(cls, key: str) -> float:
+        if key == cls.ZERO:
+            return 0.0
+        # Geometric middle of [BASE**i, BASE**(i+1))
+        return round(cls.BASE ** (int(key) + 0.5), 3)
+
+
+def _seconds_between(start: Optional[datetime], end: Optional[datetime]) -> Optional[float]:
+    if not start or not end:
+        return None
+    return max((end - start).total_seconds(), 0.0)
+
+
+def record_job_performance(import_job: ImportJob, importer=None) -> ImportJobPerformance:
+    """
+    Store the performance record of a finished run and fold it into its hourly rollup.
+
+    Retried jobs overwrite their record; the rollups count every finished run.
+    """
+    duration = _seconds_between(import_job.started_at, import_job.finished_at)
+    rows = import_job.processed_rows or 0
+    timings = importer.timings if importer else {}
+
+    performance, _ = ImportJobPerformance.objects.update_or_create(
+        import_job=import_job,
+        defaults={
+            'rows': rows,
+            'bytes_processed': importer.bytes_processed if importer else 0,
+            'rows_per_second': round(rows / duration, 2) if duration else None,
+            'queue_wait_seconds': _seconds_between(import_job.created_at, import_job.started_at),
+            'duration_seconds': duration,
+            'parse_seconds': timings.get('parse', 0.0),
+            'validate_seconds': timings.get('validate', 0.0),
+            'write_seconds': timings.get('write', 0.0),
+            'recorded_at': timezone.now(),
+        }
+    )
+    _add_to_rollup(import_job, performance)
+    # The finished job's cached status snapshot predates this record
+    bump_status_version(import_job.pk)
+    return performance
+
+
+def _add_to_rollup(import_job: ImportJob, performance: ImportJobPerformance) -> None:
+    finished = import_job.finished_at or timezone.now()
+    bucket_start = finished.replace(minute=0, second=0, microsecond=0)
+
+    with transaction.atomic():
+        ImportStatsRollup.objects.get_or_create(bucket_start=bucket_start)
+        # Workers finishing in the same hour update the same row
+        rollup = ImportStatsRollup.objects.select_for_update().get(bucket_start=bucket_start)
+
+        rollup.jobs += 1
+        if import_job.status == ImportJob.SUCCESS:
+            rollup.succeeded += 1
+        else:
+            rollup.failed += 1
+        rollup.rows += performance.rows
+        rollup.bytes_processed += performance.bytes_processed
+        rollup.parse_seconds += performance.parse_seconds
+        rollup.validate_seconds += performance.validate_seconds
+        rollup.write_seconds += performance.write_seconds
+        LogHistogram.add(rollup.rows_per_second_histogram, performance.rows_per_second)
+        LogHistogram.add(rollup.queue_wait_histogram, performance.queue_wait_seconds)
+        LogHistogram.add(rollup.duration_histogram, performance.duration_seconds)
+        rollup.save()
+
+
+def import_stats(window: str, now: Optional[datetime] = None) -> dict:
+    """Aggregate the hourly rollups of the last ``window`` (a key of STATS_WINDOWS)."""
+    now = now or timezone.now()
+    since = (now - STATS_WINDOWS[window]).replace(minute=0, second=0, microsecond=0)
+    rollups = list(ImportStatsRollup.objects.filter(bucket_start__gte=since))
+
+    def total(field):
+        return sum(getattr(rollup, field) for rollup in rollups)
+
+    def distribution(field):
+        return LogHistogram.percentiles(LogHistogram.merge(getattr(rollup, field) for rollup in rollups))
+
+    return {
+        'window': window,
+        'since': since,
+        'until': now,
+        'jobs': total('jobs'),
+        'succeeded': total('succeeded'),
+        'failed': total('failed'),
+        'rows': total('rows'),
+        'bytes_processed': total('bytes_processed'),
+        'phase_seconds': {
+            'parse': round(total('parse_seconds'), 3),
+            'validate': round(total('validate_seconds'), 3),
+            'write': round(total('write_seconds'), 3),
+        },
+        'rows_per_second': distribution('rows_per_second_histogram'),
+        'queue_wait_seconds': distribution('queue_wait_histogram'),
+        'duration_seconds': distribution('duration_histogram'),
+    }
@@ -0,0 +1,134 @@
+import asyncio
+import json
+import logging
+import time
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from typing import Dict, Optional, Set
+import redis
+import redis.asyncio as aioredis
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+_publisher: Optional[redis.Redis] = None
+_broker: Optional['ProgressBroker'] = None
+# monotonic() before which publishing is skipped, after Redis failed
+_publish_paused_until = 0.0
+
+
+def progress_channel(job_id) -> str:
+    return f'imports:progress:{job_id}'
+
+
+def progress_event(job) -> dict:
+    """The payload pushed to SSE subscribers whenever a job is saved."""
+    return {
+        'id': job.pk,
+        'status': job.status,
+        'total_rows': job.total_rows,
+        'processed_rows': job.processed_rows,
+        'success_count': job.success_count,
+        'error_count': job.error_count,
+        'progress_percent': job.progress_percent,
+    }
+
+
+def publish_progress(event: dict) -> None:
+    """
+    Publish a job's progress from the worker; best effort, never fails the import.
+
+    After a failure publishing is skipped for IMPORT_EVENTS_RETRY_SECONDS, so an
+    unreachable Redis costs one timeout per period instead of one per job save.
+    """
+    global _publisher, _publish_paused_until
+
+    if not settings.IMPORT_EVENTS_ENABLED or time.monotonic() < _publish_paused_until:
+        return
+    try:
+        if _publisher is None:
+            _publisher = redis.Redis.from_url(
+                settings.IMPORT_EVENTS_REDIS_URL, socket_connect_timeout=1, socket_timeout=1
+            )
+        _publisher.publish(progress_channel(event['id']), json.dumps(event))
+    except Exception as exc:
+        _publish_paused_until = time.monotonic() + settings.IMPORT_EVENTS_RETRY_SECONDS
+        logger.warning(
+            f"Could not publish progress of import job {event['id']}, "
+            f"pausing for {settings.IMPORT_EVENTS_RETRY_SECONDS}s: {exc}"
+        )
+
+
+class ProgressBroker:
+    """
+    Fan progress events out to the SSE streams of one web process.
+
+    The process holds a single Redis pub/sub connection whatever the number of
+    subscribers: a job's channel is subscribed while at least one stream follows it,
+    and one reader task hands each message to the in-memory queue of every stream.
+    Queues are small and drop their oldest event when full, since only the latest
+    progress matters to a slow client.
+    """
+
+    QUEUE_SIZE = 32
+
+    def __init__(self, url: str):
+        self.url = url
+        self.loop = asyncio.get_running_loop()
+        self.listeners: Dict[int, Set[asyncio.Queue]] = defaultdict(set)
+        self._pubsub = None
+        self._reader: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+
+    @asynccontextmanager
+    async def subscribe(self, job_id: int):
+        queue = asyncio.Queue(maxsize=self.QUEUE_SIZE)
+        async with self._lock:
+            if self._pubsub is None:
+                self._pubsub = aioredis.Redis.from_url(self.url).pubsub()
+            if not self.listeners[job_id]:
+                await self._pubsub.subscribe(progress_channel(job_id))
+            self.listeners[job_id].add(queue)
+            if self._reader is None or self._reader.done():
+                self._reader = asyncio.create_task(self._read())
+
+        try:
+            yield queue
+        finally:
+            async with self._lock:
+                self.listeners[job_id].discard(queue)
+                if not self.listeners[job_id]:
+                    del self.listeners[job_id]
+                    await self._pubsub.unsubscribe(progress_channel(job_id))
+
+    async def _read(self) -> None:
+        while self.listeners:
+            try:
+                message = await self._pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+            except Exception as exc:
+                logger.warning(f"Progress subscription failed, retrying: {exc}")
+                await asyncio.sleep(1)
+                continue
+            if message is None:
+                continue
+
+            try:
+                event = json.loads(message['data'])
+                job_id = event['id']
+            except (TypeError, ValueError, KeyError) as exc:
+                logger.warning(f"Ignoring malformed progress message on {message.get('channel')}: {exc}")
+                continue
+            for queue in list(self.listeners.get(job_id, ())):
+                if queue.full():
+                    queue.get_nowait()
+                queue.put_nowait(event)
+
+
+def get_broker() -> ProgressBroker:
+    """The broker of the running event loop (one per ASGI worker process)."""
+    global _broker
+
+    loop = asyncio.get_running_loop()
+    if _broker is None or _broker.loop is not loop:
+        _broker = ProgressBroker(settings.IMPORT_EVENTS_REDIS_URL)
+    return _broker
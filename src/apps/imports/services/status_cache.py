@@ -0,0 +1,91 @@
+import hashlib
+import json
+import logging
+from typing import Optional, Tuple
+from uuid import uuid4
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+
+def bump_status_version(job_id) -> None:
+    """Invalidate the cached status snapshot of a job after its progress or state changed."""
+    try:
+        cache.set(
+            StatusSnapshotCache.version_key(job_id), uuid4().hex,
+            timeout=settings.IMPORT_STATUS_CACHE_TERMINAL_TTL
+        )
+    except Exception as exc:
+        # The snapshot then simply lives out its (short) TTL; never fail the write
+        logger.warning(f"Could not bump status version of import job {job_id}: {exc}")
+
+
+def forget_status(job_ids) -> None:
+    """Drop the cached status of deleted jobs, so their snapshots are not served any longer."""
+    try:
+        cache.delete_many([
+            key for job_id in job_ids
+            for key in (StatusSnapshotCache.version_key(job_id), StatusSnapshotCache.snapshot_key(job_id))
+        ])
+    except Exception as exc:
+        logger.warning(f"Could not drop the status cache of {len(job_ids)} deleted import jobs: {exc}")
+
+
+class StatusSnapshotCache:
+    """
+    Serialized import job status, cached per job and tagged with a version.
+
+    Writers replace the version on every change (``bump_status_version``); a snapshot
+    is only served while it was built under the current version, so the version and
+    the snapshot come back from a single ``get_many`` round trip. Active jobs are kept
+    for ``IMPORT_STATUS_CACHE_TTL`` seconds as a safety net, finished jobs for
+    ``IMPORT_STATUS_CACHE_TERMINAL_TTL``.
+    """
+
+    @staticmethod
+    def version_key(job_id) -> str:
+        return f'imports:status-version:{job_id}'
+
+    @staticmethod
+    def snapshot_key(job_id) -> str:
+        return f'imports:status:{job_id}'
+
+    @staticmethod
+    def etag_for(data) -> str:
+        payload = json.dumps(data, sort_keys=True, default=str).encode()
+        return f'"{hashlib.md5(payload).hexdigest()}"'
+
+    async def aget(self, job_id) -> Tuple[Optional[str], Optional[dict]]:
+        """Current version and the snapshot, if one is cached for that version."""
+        try:
+            cached = await cache.aget_many(self._keys(job_id))
+        except Exception as exc:
+            logger.warning(f"Status cache unavailable: {exc}")
+            return None, None
+        return self._current(job_id, cached)
+
+    async def astore(self, job_id, version: Optional[str], data, terminal: bool) -> dict:
+        snapshot = self._snapshot(version, data)
+        try:
+            await cache.aset(self.snapshot_key(job_id), snapshot, timeout=self._timeout(terminal))
+        except Exception as exc:
+            logger.warning(f"Status cache unavailable: {exc}")
+        return snapshot
+
+    def _keys(self, job_id):
+        return [self.version_key(job_id), self.snapshot_key(job_id)]
+
+    def _current(self, job_id, cached: dict) -> Tuple[Optional[str], Optional[dict]]:
+        version = cached.get(self.version_key(job_id))
+        snapshot = cached.get(self.snapshot_key(job_id))
+        if snapshot is None or snapshot['version'] != version:
+            return version, None
+        return version, snapshot
+
+    def _snapshot(self, version: Optional[str], data) -> dict:
+        return {'version': version, 'etag': self.etag_for(data), 'data': data}
+
+    @staticmethod
+    def _timeout(terminal: bool) -> int:
+        return settings.IMPORT_STATUS_CACHE_TERMINAL_TTL if terminal else settings.IMPORT_STATUS_CACHE_TTL
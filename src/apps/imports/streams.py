@@ -0,0 +1,57 @@
+import asyncio
+import json
+import time
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from apps.core.async_views import api_error, authenticate
+
+from .models import ImportJob
+from .services.progress_events import get_broker, progress_event
+
+
+def format_sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def job_event_stream(job_id: int):
+    """
+    Server-Sent Events for one job: a ``status`` event whenever the status changes,
+    ``progress`` events in between, and ``end`` once the job has finished.
+    """
+    keepalive = settings.IMPORT_EVENTS_KEEPALIVE_SECONDS
+    deadline = time.monotonic() + settings.IMPORT_EVENTS_MAX_STREAM_SECONDS
+
+    async with get_broker().subscribe(job_id) as events:
+        # Read the job only once subscribed, so no change between the two is missed
+        event = progress_event(await ImportJob.objects.aget(pk=job_id))
+        last_status = None
+
+        while True:
+            if event is not None:
+                yield format_sse('status' if event['status'] != last_status else 'progress', event)
+                last_status = event['status']
+                if last_status in ImportJob.TERMINAL_STATUSES:
+                    yield format_sse('end', {'id': job_id, 'status': last_status})
+                    return
+
+            if time.monotonic() >= deadline:
+                # EventSource clients reconnect on their own; this bounds abandoned streams
+                return
+            try:
+                event = await asyncio.wait_for(events.get(), timeout=keepalive)
+            except asyncio.TimeoutError:
+                event = None
+                yield ": keepalive\n\n"
+
+
+async def import_job_events(request, pk: int):
+    """GET /api/imports/jobs/<pk>/events/ - live progress of an import job over SSE."""
+    if await authenticate(request) is None:
+        return api_error("Authentication credentials were not provided.", 401)
+    if not await ImportJob.objects.filter(pk=pk).aexists():
+        return api_error("Not found.", 404)
+
+    response = StreamingHttpResponse(job_event_stream(pk), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
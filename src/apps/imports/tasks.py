@@ -1,15 +1,19 @@
 import logging
 from celery import shared_task
-from django.utils import timezone
-from django.core.files.storage import default_storage
 from .models import ImportJob
+from .services.cleanup import ImportJobCleanup
 from .services.csv_importer import CSVImporter
+from .services.dispatcher import FairShareDispatcher
+from .services.off_peak import BulkImportScheduler
+from .services.partitions import PartitionManager
+from .services.performance import record_job_performance
 
 logger = logging.getLogger(__name__)
 
 
 @shared_task(bind=True, max_retries=3, default_retry_delay=60)
 def process_csv_import(self, job_id: int) -> None:
+    importer = None
 
     try:
         import_job = ImportJob.objects.get(id=job_id)
@@ -32,12 +36,16 @@ def process_csv_import(self, job_id: int) -> None:
 
         # Mark as completed
         import_job.mark_completed(success_count, error_count)
+        _record_performance(import_job, importer)
 
         logger.info(
             f"Completed CSV import for job {job_id}. "
             f"Success: {success_count}, Errors: {error_count}"
         )
 
+        # Hand the freed slot to the next deferred job
+        _release_next(import_job)
+
     except ImportJob.DoesNotExist:
         logger.error(f"ImportJob {job_id} not found")
         raise
@@ -48,6 +56,8 @@ def process_csv_import(self, job_id: int) -> None:
         try:
             import_job = ImportJob.objects.get(id=job_id)
             import_job.mark_failed()
+            _record_performance(import_job, importer)
+            _release_next(import_job)
         except ImportJob.DoesNotExist:
             pass
 
@@ -60,33 +70,59 @@ def process_csv_import(self, job_id: int) -> None:
 
 
 @shared_task
-def cleanup_completed_imports(days_old: int = 7) -> None:
+def cleanup_completed_imports(days_old: int = 7) -> int:
 
     from django.utils import timezone
     from datetime import timedelta
 
     cutoff_date = timezone.now() - timedelta(days=days_old)
 
-    old_jobs = ImportJob.objects.filter(
-        status__in=[ImportJob.SUCCESS, ImportJob.FAILURE],
-        created_at__lt=cutoff_date
-    )
+    cleanup = ImportJobCleanup(cutoff_date)
+    # On PostgreSQL whole days of row errors go at once; the batches below then have little left.
+    # Only days whose rows all belong to jobs this cleanup deletes: kept jobs keep their errors
+    PartitionManager().drop_expired(days_old, deletable_parents=cleanup.expired())
 
-    deleted_count = 0
-    for job in old_jobs:
-        try:
-            # Delete associated file
-            if job.file_path and default_storage.exists(job.file_path):
-                default_storage.delete(job.file_path)
+    return cleanup.run().deleted_jobs
+
+
+@shared_task
+def create_error_partitions() -> int:
+
+    from django.conf import settings
 
-            # Delete the job (cascades to ImportRowError)
-            job.delete()
-            deleted_count += 1
+    return len(PartitionManager().ensure_partitions(settings.IMPORT_ERROR_PARTITIONS_AHEAD))
 
-        except Exception as exc:
-            logger.error(f"Failed to cleanup import job {job.id}: {exc}")
 
-    logger.info(f"Cleaned up {deleted_count} old import jobs")
+@shared_task
+def release_deferred_imports() -> int:
+
+    return FairShareDispatcher().dispatch()
+
+
+@shared_task
+def release_bulk_imports() -> int:
+
+    return BulkImportScheduler().release()
+
+
+def _record_performance(import_job: ImportJob, importer=None) -> None:
+    # Statistics must never turn a finished import into a failed or retried one
+    try:
+        record_job_performance(import_job, importer)
+    except Exception as exc:
+        logger.warning(f"Could not record performance of import job {import_job.id}: {exc}")
+
+
+def _release_next(import_job: ImportJob) -> None:
+    # Like statistics: a failed dispatch must not fail or retry the finished import;
+    # the periodic release tasks pick the waiting jobs up instead
+    try:
+        if import_job.is_bulk:
+            BulkImportScheduler().release()
+        else:
+            FairShareDispatcher().dispatch()
+    except Exception as exc:
+        logger.warning(f"Could not release the jobs waiting on import job {import_job.id}: {exc}")
 
 
 @shared_task
@@ -1,16 +1,25 @@
 from rest_framework import viewsets, status
+from rest_framework.exceptions import Throttled
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.views import APIView
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from django.db.models import Q
 
 from .models import ImportJob, ImportRowError
 from .serializers import (
+    ImportErrorSummarySerializer,
     ImportJobCreateSerializer,
     ImportJobSerializer,
     ImportJobStatusSerializer,
     ImportRowErrorSerializer
 )
+from .services.admission import AdmissionController, AdmissionDecision
+from .services.dispatcher import FairShareDispatcher
+from .services.error_export import ErrorReportExporter
+from .services.off_peak import BulkImportScheduler
+from .services.performance import STATS_WINDOWS, import_stats
 from .tasks import process_csv_import
 
 
@@ -31,19 +40,44 @@ class ImportJobViewSet(viewsets.ModelViewSet):
         return ImportJobSerializer
 
     def perform_create(self, serializer):
-        job = serializer.save()
-        process_csv_import.delay(job.id)
+        decision = AdmissionController().check(
+            incoming_bytes=serializer.validated_data['file'].size
+        )
+        if decision.action == AdmissionDecision.REJECT:
+            raise Throttled(wait=decision.retry_after, detail=decision.reason)
+
+        # Every job starts deferred; the dispatcher hands it to Celery right away
+        # unless the backlog or the uploader's fair share is used up.
+        job = serializer.save(status=ImportJob.DEFERRED)
+        if decision.action != AdmissionDecision.ADMIT:
+            return job
+
+        if job.is_bulk:
+            BulkImportScheduler().release()
+            job.refresh_from_db(fields=['status'])
+        else:
+            FairShareDispatcher().submit(job)
         return job
 
     def create(self, request, *args, **kwargs):
-        job = self.perform_create(self.get_serializer(data=request.data))
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        job = self.perform_create(serializer)
+
+        if job.status == ImportJob.DEFERRED:
+            message = "File accepted. Processing deferred until capacity frees up."
+            response_status = status.HTTP_202_ACCEPTED
+        else:
+            message = "File accepted. Processing started."
+            response_status = status.HTTP_201_CREATED
+
         return Response(
             {
                 "job_id": job.id,
                 "status": job.status,
-                "message": "File accepted. Processing started."
+                "message": message
             },
-            status=status.HTTP_201_CREATED
+            status=response_status
         )
 
     # Custom Actions for retry/cancel
@@ -56,12 +90,35 @@ class ImportJobViewSet(viewsets.ModelViewSet):
     def cancel(self, request, pk=None):
         job = get_object_or_404(
             ImportJob,
-            Q(status=ImportJob.PENDING) | Q(status=ImportJob.PROCESSING),
+            Q(status=ImportJob.PENDING) | Q(status=ImportJob.DEFERRED) | Q(status=ImportJob.PROCESSING),
             id=pk
         )
         job.mark_failed()
         return Response({"message": "Job cancelled"}, status=200)
 
+    def error_summary(self, request, pk=None):
+        """Per error code counts and row ranges for the job."""
+        job = self.get_object()
+        serializer = ImportErrorSummarySerializer(job.error_summaries.all(), many=True)
+        return Response({"error_count": job.error_count, "summary": serializer.data})
+
+    def export_errors(self, request, pk=None):
+        """Stream every row error of the job as CSV (default) or NDJSON."""
+        output = request.query_params.get("output", "csv")
+        if output not in ErrorReportExporter.FORMATS:
+            return Response(
+                {"detail": f"Unsupported output '{output}'. Use one of: csv, ndjson."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        exporter = ErrorReportExporter(self.get_object())
+        response = StreamingHttpResponse(
+            exporter.stream(output),
+            content_type=ErrorReportExporter.FORMATS[output]
+        )
+        response["Content-Disposition"] = f'attachment; filename="{exporter.filename(output)}"'
+        return response
+
 
 class ImportErrorViewSet(viewsets.ReadOnlyModelViewSet):
     """
@@ -75,3 +132,22 @@ class ImportErrorViewSet(viewsets.ReadOnlyModelViewSet):
         job_id = self.kwargs.get("job_id")
         job = get_object_or_404(ImportJob, id=job_id)
         return job.errors.all().order_by("row_number")
+
+
+class ImportStatsView(APIView):
+    """
+    Import throughput over a time window (``?window=1h|24h|7d|30d``, default 24h).
+
+    Read from the hourly rollups written as jobs finish, never from import_jobs.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        window = request.query_params.get("window", "24h")
+        if window not in STATS_WINDOWS:
+            return Response(
+                {"detail": f"Unknown window '{window}'. Choose one of: {', '.join(STATS_WINDOWS)}."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return Response(import_stats(window))
@@ -25,11 +25,26 @@ app.conf.beat_schedule = {
         'task': 'apps.imports.tasks.cleanup_completed_imports',
         'schedule': 86400,  # Daily
     },
+    'create-error-partitions': {
+        'task': 'apps.imports.tasks.create_error_partitions',
+        'schedule': 86400,  # Daily
+    },
+    'release-deferred-imports': {
+        'task': 'apps.imports.tasks.release_deferred_imports',
+        'schedule': 60,
+    },
+    'release-bulk-imports': {
+        'task': 'apps.imports.tasks.release_bulk_imports',
+        'schedule': 300,
+    },
 }
 
 app.conf.task_routes = {
     'apps.imports.tasks.process_csv_import': {'queue': 'imports'},
     'apps.imports.tasks.cleanup_completed_imports': {'queue': 'maintenance'},
+    'apps.imports.tasks.create_error_partitions': {'queue': 'maintenance'},
+    'apps.imports.tasks.release_deferred_imports': {'queue': 'maintenance'},
+    'apps.imports.tasks.release_bulk_imports': {'queue': 'maintenance'},
 }
 
 @app.task(bind=True)
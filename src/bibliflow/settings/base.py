@@ -20,10 +20,12 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
 
     # Third party apps
     'drf_spectacular',
     'rest_framework',
+    'rest_framework.authtoken',
     'corsheaders',
     'django_celery_results',
 
@@ -106,7 +108,7 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.IsAuthenticated',
     ],
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_PAGINATION_CLASS': 'apps.core.pagination.EstimatedCountPagination',
     'PAGE_SIZE': 20,
     'DEFAULT_RENDERER_CLASSES': [
         'rest_framework.renderers.JSONRenderer',
@@ -147,6 +149,59 @@ ALLOWED_CSV_MIME_TYPES = env.list('ALLOWED_CSV_MIME_TYPES', default=[
     'application/csv'
 ])
 
+# Import admission control
+IMPORT_MAX_PENDING_JOBS = env.int('IMPORT_MAX_PENDING_JOBS', default=500)
+IMPORT_MAX_PENDING_BYTES = env.int('IMPORT_MAX_PENDING_BYTES', default=10737418240)  # 10GB
+IMPORT_DEFER_WHEN_BUSY = env.bool('IMPORT_DEFER_WHEN_BUSY', default=False)
+IMPORT_RETRY_AFTER_SECONDS = env.int('IMPORT_RETRY_AFTER_SECONDS', default=60)
+IMPORT_MAX_ACTIVE_JOBS_PER_USER = env.int('IMPORT_MAX_ACTIVE_JOBS_PER_USER', default=2)
+
+# Off-peak bulk imports (windows are HH:MM-HH:MM in TIME_ZONE)
+IMPORT_BULK_WINDOWS = env.list('IMPORT_BULK_WINDOWS', default=['22:00-06:00'])
+IMPORT_BULK_MAX_CONCURRENT_JOBS = env.int('IMPORT_BULK_MAX_CONCURRENT_JOBS', default=1)
+IMPORT_BULK_MAX_ROWS_PER_SECOND = env.int('IMPORT_BULK_MAX_ROWS_PER_SECOND', default=0)  # 0 = unlimited
+
+# Import error storage: full rows kept per error code, row-number runs kept per code
+IMPORT_ERROR_SAMPLES_PER_CODE = env.int('IMPORT_ERROR_SAMPLES_PER_CODE', default=100)
+IMPORT_ERROR_MAX_RANGES = env.int('IMPORT_ERROR_MAX_RANGES', default=1000)
+IMPORT_ERROR_PARTITIONS_AHEAD = env.int('IMPORT_ERROR_PARTITIONS_AHEAD', default=7)  # days, PostgreSQL only
+
+# Retention cleanup of finished import jobs
+IMPORT_CLEANUP_BATCH_SIZE = env.int('IMPORT_CLEANUP_BATCH_SIZE', default=500)
+IMPORT_CLEANUP_FILE_WORKERS = env.int('IMPORT_CLEANUP_FILE_WORKERS', default=8)
+
+# Cached import status snapshots (seconds); finished jobs no longer change
+IMPORT_STATUS_CACHE_TTL = env.int('IMPORT_STATUS_CACHE_TTL', default=30)
+IMPORT_STATUS_CACHE_TERMINAL_TTL = env.int('IMPORT_STATUS_CACHE_TERMINAL_TTL', default=86400)
+
+# Live import progress over Server-Sent Events (Redis pub/sub, ASGI only)
+IMPORT_EVENTS_ENABLED = env.bool('IMPORT_EVENTS_ENABLED', default=True)
+IMPORT_EVENTS_REDIS_URL = env('IMPORT_EVENTS_REDIS_URL', default=env('REDIS_URL', default='redis://redis:6379/0'))
+IMPORT_EVENTS_KEEPALIVE_SECONDS = env.int('IMPORT_EVENTS_KEEPALIVE_SECONDS', default=15)
+IMPORT_EVENTS_MAX_STREAM_SECONDS = env.int('IMPORT_EVENTS_MAX_STREAM_SECONDS', default=3600)
+IMPORT_EVENTS_RETRY_SECONDS = env.int('IMPORT_EVENTS_RETRY_SECONDS', default=30)
+
+# List pagination: above this many rows (PostgreSQL planner estimate) counts are estimated, not exact
+API_COUNT_ESTIMATE_THRESHOLD = env.int('API_COUNT_ESTIMATE_THRESHOLD', default=10000)
+
+# Book search: PostgreSQL text search configuration used by the search_vector trigger
+BOOK_SEARCH_CONFIG = env('BOOK_SEARCH_CONFIG', default='english')
+
+# Cached book list/detail responses, invalidated by a catalog version on every Book write
+BOOK_RESPONSE_CACHE_TTL = env.int('BOOK_RESPONSE_CACHE_TTL', default=300)  # seconds
+
+# Most operations accepted by one POST /api/books/bulk/
+BOOK_BULK_MAX_OPERATIONS = env.int('BOOK_BULK_MAX_OPERATIONS', default=1000)
+
+# Most ISBNs accepted by one POST /api/books/isbn-lookup/
+BOOK_ISBN_LOOKUP_MAX = env.int('BOOK_ISBN_LOOKUP_MAX', default=5000)
+
+# Title/author typeahead (/api/books/autocomplete/)
+BOOK_AUTOCOMPLETE_MIN_LENGTH = env.int('BOOK_AUTOCOMPLETE_MIN_LENGTH', default=2)
+BOOK_AUTOCOMPLETE_LIMIT = env.int('BOOK_AUTOCOMPLETE_LIMIT', default=10)
+BOOK_AUTOCOMPLETE_MAX_LIMIT = env.int('BOOK_AUTOCOMPLETE_MAX_LIMIT', default=25)
+BOOK_AUTOCOMPLETE_CACHE_TTL = env.int('BOOK_AUTOCOMPLETE_CACHE_TTL', default=60)  # seconds
+
 # Cache configuration
 CACHES = {
     'default': {
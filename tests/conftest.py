@@ -4,11 +4,25 @@ import csv
 from django.contrib.auth import get_user_model
 from django.core.files.uploadedfile import SimpleUploadedFile
 from apps.books.models import Book
-from apps.imports.models import ImportJob
+from apps.imports.models import ImportJob, ImportRowError
 
 User = get_user_model()
 
 
+@pytest.fixture(autouse=True)
+def locmem_cache(settings):
+    """Tests run without Redis; give every test a fresh in-process cache"""
+    settings.CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+    from django.core.cache import cache
+    cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def no_progress_events(settings):
+    """Tests run without Redis; progress is not published unless a test opts in"""
+    settings.IMPORT_EVENTS_ENABLED = False
+
+
 @pytest.fixture
 def user():
     return User.objects.create_user(
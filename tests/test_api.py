@@ -1,4 +1,6 @@
+import io
 import pytest
+from unittest.mock import patch
 from django.urls import reverse
 from rest_framework import status
 from apps.books.models import Book
@@ -257,4 +259,1312 @@ class TestAPIPaginationAndFiltering:
 
         assert response.status_code == status.HTTP_200_OK
         assert len(response.data) == 1
-        assert response.data[0]['title'] == 'Python Guide'
\ No newline at end of file
+        assert response.data[0]['title'] == 'Python Guide'
+
+
+@pytest.mark.django_db
+class TestImportAdmissionControl:
+    @pytest.fixture(autouse=True)
+    def upload_dir(self, settings, tmp_path):
+        settings.MEDIA_ROOT = str(tmp_path)
+
+    def test_create_import_under_limit(self, authenticated_client, sample_csv_file):
+        """Test upload is admitted and queued when the backlog is small"""
+        url = reverse('imports-jobs-list')
+        with patch('apps.imports.views.process_csv_import.delay') as mock_delay:
+            response = authenticated_client.post(url, {'file': sample_csv_file}, format='multipart')
+
+        assert response.status_code == status.HTTP_201_CREATED
+        job = ImportJob.objects.get(id=response.data['job_id'])
+        assert job.status == ImportJob.PENDING
+        assert job.file_size == sample_csv_file.size
+        mock_delay.assert_called_once_with(job.id)
+
+    def test_create_import_rejected_when_backlog_full(self, settings, authenticated_client,
+                                                      sample_csv_file, import_job):
+        """Test upload is rejected with 429 and Retry-After when the backlog is full"""
+        settings.IMPORT_MAX_PENDING_JOBS = 1
+        settings.IMPORT_RETRY_AFTER_SECONDS = 120
+
+        url = reverse('imports-jobs-list')
+        with patch('apps.imports.views.process_csv_import.delay') as mock_delay:
+            response = authenticated_client.post(url, {'file': sample_csv_file}, format='multipart')
+
+        assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert response['Retry-After'] == '120'
+        assert ImportJob.objects.count() == 1
+        mock_delay.assert_not_called()
+
+    def test_create_import_rejected_when_bytes_exceeded(self, settings, authenticated_client,
+                                                        sample_csv_file, import_job):
+        """Test byte limit rejects even when deferring is enabled"""
+        settings.IMPORT_MAX_PENDING_BYTES = 1000
+        settings.IMPORT_DEFER_WHEN_BUSY = True
+        import_job.file_size = 990
+        import_job.save()
+
+        url = reverse('imports-jobs-list')
+        response = authenticated_client.post(url, {'file': sample_csv_file}, format='multipart')
+
+        assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+
+    def test_create_import_deferred_when_busy(self, settings, authenticated_client,
+                                              sample_csv_file, import_job):
+        """Test upload is accepted as deferred when deferring is enabled"""
+        settings.IMPORT_MAX_PENDING_JOBS = 1
+        settings.IMPORT_DEFER_WHEN_BUSY = True
+
+        url = reverse('imports-jobs-list')
+        with patch('apps.imports.views.process_csv_import.delay') as mock_delay:
+            response = authenticated_client.post(url, {'file': sample_csv_file}, format='multipart')
+
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        assert response.data['status'] == ImportJob.DEFERRED
+        mock_delay.assert_not_called()
+
+    def test_create_import_deferred_over_fair_share(self, settings, authenticated_client,
+                                                    sample_csv_file, import_job):
+        """Test uploads beyond the uploader's fair share wait as deferred"""
+        settings.IMPORT_MAX_ACTIVE_JOBS_PER_USER = 1
+
+        url = reverse('imports-jobs-list')
+        with patch('apps.imports.views.process_csv_import.delay') as mock_delay:
+            response = authenticated_client.post(url, {'file': sample_csv_file}, format='multipart')
+
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        assert response.data['status'] == ImportJob.DEFERRED
+        mock_delay.assert_not_called()
+
+    def test_create_bulk_import_from_uploader_default(self, settings, user, authenticated_client,
+                                                      sample_csv_file):
+        """Test uploads inherit the uploader's bulk default and wait for the off-peak window"""
+        from apps.imports.models import ImportProfile
+
+        settings.IMPORT_BULK_WINDOWS = []
+        ImportProfile.objects.create(user=user, bulk_by_default=True)
+
+        url = reverse('imports-jobs-list')
+        with patch('apps.imports.views.process_csv_import.delay') as mock_delay:
+            response = authenticated_client.post(url, {'file': sample_csv_file}, format='multipart')
+
+        assert response.status_code == status.HTTP_202_ACCEPTED
+        job = ImportJob.objects.get(id=response.data['job_id'])
+        assert job.is_bulk
+        assert job.status == ImportJob.DEFERRED
+        mock_delay.assert_not_called()
+
+
+@pytest.mark.django_db
+class TestImportErrorExport:
+    def _url(self, job):
+        return f'/api/imports/jobs/{job.id}/errors/export/'
+
+    def test_export_errors_csv(self, authenticated_client, import_job, import_row_errors):
+        """Test every row error is streamed as CSV"""
+        response = authenticated_client.get(self._url(import_job))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response['Content-Type'] == 'text/csv'
+        assert 'attachment' in response['Content-Disposition']
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        assert lines[0] == 'row_number,code,error_message,raw_data,created_at'
+        assert [line.split(',')[0] for line in lines[1:]] == ['1', '2', '3']
+
+    def test_export_errors_ndjson(self, authenticated_client, import_job, import_row_errors):
+        """Test every row error is streamed as NDJSON"""
+        import json
+
+        response = authenticated_client.get(self._url(import_job), {'output': 'ndjson'})
+
+        assert response.status_code == status.HTTP_200_OK
+        records = [json.loads(line) for line in b''.join(response.streaming_content).splitlines()]
+        assert [r['row_number'] for r in records] == [1, 2, 3]
+        assert records[0]['error_message'] == 'error_0'
+
+    def test_export_errors_unknown_output(self, authenticated_client, import_job):
+        """Test unsupported output formats are rejected"""
+        response = authenticated_client.get(self._url(import_job), {'output': 'xml'})
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_exporter_walks_every_batch(self, import_job):
+        """Test keyset batches neither skip nor repeat rows, including duplicate row numbers"""
+        from apps.imports.services.error_export import ErrorReportExporter
+
+        for row_number in [5, 1, 3, 3, 2, 4, 3]:
+            ImportRowError.objects.create(
+                import_job=import_job,
+                row_number=row_number,
+                raw_data='raw',
+                error_message='bad'
+            )
+
+        rows = list(ErrorReportExporter(import_job, batch_size=2).iter_rows())
+
+        assert [row[0] for row in rows] == [1, 2, 3, 3, 3, 4, 5]
+
+
+@pytest.mark.django_db
+class TestImportErrorSummaryAPI:
+    def test_error_summary_endpoint(self, authenticated_client, import_job):
+        """Test the summary endpoint serves the stored aggregates"""
+        from apps.imports.models import ImportErrorSummary
+
+        ImportErrorSummary.objects.create(
+            import_job=import_job,
+            code=ImportRowError.MISSING_FIELD,
+            count=300000,
+            row_ranges=[[2, 300001]],
+            sample_message='Missing required field: author'
+        )
+
+        response = authenticated_client.get(f'/api/imports/jobs/{import_job.id}/errors/summary/')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['summary'][0]['code'] == ImportRowError.MISSING_FIELD
+        assert response.data['summary'][0]['count'] == 300000
+        assert response.data['summary'][0]['row_ranges'] == [[2, 300001]]
+
+    def test_status_includes_error_summary(self, authenticated_client, import_job):
+        """Test the job status response carries the error summary"""
+        from apps.imports.models import ImportErrorSummary
+
+        ImportErrorSummary.objects.create(
+            import_job=import_job,
+            code=ImportRowError.DUPLICATE_ISBN,
+            count=2,
+            row_ranges=[[3, 4]]
+        )
+
+        response = authenticated_client.get(reverse('imports-jobs-detail', kwargs={'pk': import_job.id}))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['error_summary'][0]['count'] == 2
+
+
+@pytest.mark.django_db
+class TestImportJobListPreviews:
+    def _jobs_with_errors(self, user, count):
+        for i in range(count):
+            job = ImportJob.objects.create(filename=f'job_{i}.csv', file_path=f'imports/job_{i}.csv', uploader=user)
+            for row_number in range(8, 1, -1):
+                ImportRowError.objects.create(
+                    import_job=job, row_number=row_number, raw_data='', error_message=f'Row {row_number} failed'
+                )
+
+    def test_list_omits_previews_by_default(self, authenticated_client, user):
+        """Test the job list skips error previews unless they are requested"""
+        self._jobs_with_errors(user, 2)
+
+        response = authenticated_client.get(reverse('imports-jobs-list'))
+
+        assert response.status_code == status.HTTP_200_OK
+        assert all('errors_preview' not in job for job in response.data['results'])
+
+    def test_list_previews_are_batched(self, authenticated_client, user, django_assert_num_queries):
+        """Test previews for a whole page cost one query, whatever the page size"""
+        self._jobs_with_errors(user, 2)
+        url = reverse('imports-jobs-list') + '?include=errors_preview'
+
+        # count, page of jobs, one prefetch for every job's previews
+        with django_assert_num_queries(3):
+            response = authenticated_client.get(url)
+        assert len(response.data['results']) == 2
+
+        self._jobs_with_errors(user, 10)
+        with django_assert_num_queries(3):
+            response = authenticated_client.get(url)
+
+        assert len(response.data['results']) == 12
+        for job in response.data['results']:
+            assert [error['row_number'] for error in job['errors_preview']] == [2, 3, 4, 5, 6]
+
+
+@pytest.mark.django_db
+class TestImportStatusCache:
+    def test_unchanged_status_is_not_modified(self, authenticated_client, import_job, django_assert_num_queries):
+        """Test a repeated poll with the ETag gets a 304 without touching the database"""
+        url = reverse('imports-jobs-detail', kwargs={'pk': import_job.id})
+
+        response = authenticated_client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        etag = response['ETag']
+
+        with django_assert_num_queries(0):
+            response = authenticated_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response['ETag'] == etag
+
+    def test_progress_invalidates_snapshot(self, authenticated_client, import_job,
+                                           django_capture_on_commit_callbacks):
+        """Test a progress update changes the ETag and the served data"""
+        url = reverse('imports-jobs-detail', kwargs={'pk': import_job.id})
+        etag = authenticated_client.get(url)['ETag']
+
+        with django_capture_on_commit_callbacks(execute=True):
+            import_job.processed_rows = 50
+            import_job.save()
+
+        response = authenticated_client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == status.HTTP_200_OK
+        assert response['ETag'] != etag
+        assert response.data['processed_rows'] == 50
+
+    def test_deleted_job_is_not_served_from_cache(self, authenticated_client, import_job,
+                                                  django_capture_on_commit_callbacks):
+        """Test deleting a job drops its cached snapshot"""
+        url = reverse('imports-jobs-detail', kwargs={'pk': import_job.id})
+        assert authenticated_client.get(url).status_code == status.HTTP_200_OK
+
+        with django_capture_on_commit_callbacks(execute=True):
+            assert authenticated_client.delete(url).status_code == status.HTTP_204_NO_CONTENT
+
+        assert authenticated_client.get(url).status_code == status.HTTP_404_NOT_FOUND
+
+    def test_finished_jobs_are_cached_longer(self, authenticated_client, completed_import_job, settings):
+        """Test terminal jobs use the long TTL"""
+        from django.core.cache.backends.locmem import LocMemCache
+
+        settings.IMPORT_STATUS_CACHE_TERMINAL_TTL = 3600
+        with patch.object(LocMemCache, 'aset') as mock_set:
+            authenticated_client.get(reverse('imports-jobs-detail', kwargs={'pk': completed_import_job.id}))
+
+        assert mock_set.call_args.kwargs['timeout'] == 3600
+
+
+@pytest.mark.django_db
+class TestImportProgressEvents:
+    class FakeBroker:
+        """Stands in for Redis pub/sub: hands out a queue pre-filled with events"""
+
+        def __init__(self, events):
+            self.events = events
+
+        def subscribe(self, job_id):
+            import asyncio
+            from contextlib import asynccontextmanager
+
+            @asynccontextmanager
+            async def subscription():
+                queue = asyncio.Queue()
+                for event in self.events:
+                    queue.put_nowait(event)
+                yield queue
+
+            return subscription()
+
+    def _stream(self, client, url):
+        from asgiref.sync import async_to_sync
+
+        async def consume():
+            response = await client.get(url)
+            if not response.streaming:
+                return response, ''
+            return response, ''.join([
+                chunk.decode() if isinstance(chunk, bytes) else chunk
+                async for chunk in response.streaming_content
+            ])
+
+        return async_to_sync(consume)()
+
+    def test_stream_pushes_progress_until_finished(self, user, processing_import_job):
+        """Test the SSE stream sends status and progress events and ends with the job"""
+        from django.test import AsyncClient
+
+        base = {'id': processing_import_job.id, 'total_rows': 100, 'success_count': 0, 'error_count': 0}
+        broker = self.FakeBroker([
+            {**base, 'status': ImportJob.PROCESSING, 'processed_rows': 50, 'progress_percent': 50.0},
+            {**base, 'status': ImportJob.SUCCESS, 'processed_rows': 100, 'progress_percent': 100.0},
+        ])
+        client = AsyncClient()
+        client.force_login(user)
+
+        with patch('apps.imports.streams.get_broker', return_value=broker):
+            response, body = self._stream(client, f'/api/imports/jobs/{processing_import_job.id}/events/')
+
+        assert response['Content-Type'] == 'text/event-stream'
+        events = [block.split('\n')[0] for block in body.strip().split('\n\n')]
+        assert events == ['event: status', 'event: progress', 'event: status', 'event: end']
+        assert '"processed_rows": 100' in body
+
+    def test_stream_requires_authentication(self, processing_import_job):
+        """Test anonymous clients cannot subscribe"""
+        from django.test import AsyncClient
+
+        response, _ = self._stream(AsyncClient(), f'/api/imports/jobs/{processing_import_job.id}/events/')
+
+        assert response.status_code == 401
+
+    def test_save_publishes_progress(self, import_job, settings, django_capture_on_commit_callbacks):
+        """Test every committed job save is published on the job's channel"""
+        import json
+
+        settings.IMPORT_EVENTS_ENABLED = True
+        with patch('apps.imports.services.progress_events._publisher') as mock_publisher:
+            with django_capture_on_commit_callbacks(execute=True):
+                import_job.processed_rows = 10
+                import_job.save()
+
+        channel, payload = mock_publisher.publish.call_args.args
+        assert channel == f'imports:progress:{import_job.id}'
+        assert json.loads(payload)['processed_rows'] == 10
+
+    def test_publish_pauses_after_redis_failure(self, settings):
+        """Test a failed publish skips publishing for IMPORT_EVENTS_RETRY_SECONDS"""
+        from apps.imports.services import progress_events
+
+        settings.IMPORT_EVENTS_ENABLED = True
+        settings.IMPORT_EVENTS_RETRY_SECONDS = 30
+        event = {'id': 1}
+        with patch.object(progress_events, '_publisher') as mock_publisher, \
+                patch.object(progress_events, '_publish_paused_until', 0.0), \
+                patch('apps.imports.services.progress_events.time.monotonic', return_value=1000.0) as now:
+            mock_publisher.publish.side_effect = ConnectionError('down')
+            progress_events.publish_progress(event)
+            progress_events.publish_progress(event)
+            assert mock_publisher.publish.call_count == 1
+
+            mock_publisher.publish.side_effect = None
+            now.return_value = 1031.0
+            progress_events.publish_progress(event)
+            assert mock_publisher.publish.call_count == 2
+
+    def test_broker_skips_malformed_messages(self):
+        """Test a bad pub/sub message is logged and skipped without stopping the reader"""
+        import asyncio
+        import json
+        from unittest.mock import AsyncMock, MagicMock
+        from apps.imports.services.progress_events import ProgressBroker
+
+        async def read():
+            broker = ProgressBroker('redis://localhost:6379/0')
+            queue = asyncio.Queue()
+            broker.listeners[7].add(queue)
+            messages = [
+                {'channel': b'imports:progress:7', 'data': b'not json'},
+                {'channel': b'imports:progress:7', 'data': b'{"status": "PROCESSING"}'},
+                {'channel': b'imports:progress:7', 'data': json.dumps({'id': 7, 'processed_rows': 5})},
+            ]
+
+            async def get_message(**kwargs):
+                if messages:
+                    return messages.pop(0)
+                broker.listeners.clear()
+                return None
+
+            broker._pubsub = MagicMock(get_message=AsyncMock(side_effect=get_message))
+            await broker._read()
+            return queue
+
+        queue = asyncio.run(read())
+        assert queue.qsize() == 1
+        assert queue.get_nowait()['processed_rows'] == 5
+
+
+@pytest.mark.django_db
+class TestAsyncReadViews:
+    def test_book_retrieve(self, authenticated_client, sample_book):
+        """Test the async book detail returns the DRF payload"""
+        response = authenticated_client.get(f'/api/books/{sample_book.id}/')
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response['Content-Type'] == 'application/json'
+        assert response.data['isbn'] == sample_book.isbn
+        assert set(response.data) == {'id', 'title', 'author', 'isbn', 'publication_year', 'created_at', 'updated_at'}
+
+    def test_missing_objects_and_anonymous_clients(self, api_client, authenticated_client):
+        """Test 404 for unknown ids and 401 without credentials, as with the viewsets"""
+        assert authenticated_client.get('/api/books/999999/').status_code == status.HTTP_404_NOT_FOUND
+        assert authenticated_client.get('/api/imports/jobs/abc/').status_code == status.HTTP_404_NOT_FOUND
+        api_client.force_authenticate(user=None)
+        assert api_client.get('/api/imports/jobs/').status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_job_list_pagination(self, authenticated_client, user):
+        """Test the async job list keeps PageNumberPagination's envelope"""
+        for i in range(25):
+            ImportJob.objects.create(filename=f'job_{i}.csv', file_path=f'imports/job_{i}.csv', uploader=user)
+
+        first = authenticated_client.get('/api/imports/jobs/')
+        second = authenticated_client.get(first.data['next'])
+
+        assert first.data['count'] == 25
+        assert len(first.data['results']) == 20
+        assert first.data['previous'] is None
+        assert len(second.data['results']) == 5
+        assert second.data['next'] is None
+        assert authenticated_client.get('/api/imports/jobs/?page=3').status_code == status.HTTP_404_NOT_FOUND
+
+    @pytest.fixture
+    def token_client(self, user):
+        """A client like any non-browser one: token auth, no session, CSRF checks on"""
+        from rest_framework.authtoken.models import Token
+        from rest_framework.test import APIClient
+
+        client = APIClient(enforce_csrf_checks=True)
+        client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=user).key}')
+        return client
+
+    def test_token_writes_through_async_urls(self, token_client, sample_book, import_job, sample_csv_file,
+                                             settings, tmp_path):
+        """Test writes on async read URLs are not refused by Django's CSRF middleware"""
+        settings.MEDIA_ROOT = str(tmp_path)
+        book_url = f'/api/books/{sample_book.id}/'
+        assert token_client.get(book_url).status_code == status.HTTP_200_OK
+        assert token_client.patch(book_url, {'title': 'Renamed'}, format='json').status_code == status.HTTP_200_OK
+        assert token_client.delete(book_url).status_code == status.HTTP_204_NO_CONTENT
+
+        with patch('apps.imports.views.FairShareDispatcher.submit'):
+            response = token_client.post('/api/imports/jobs/', {'file': sample_csv_file}, format='multipart')
+        assert response.status_code in (status.HTTP_201_CREATED, status.HTTP_202_ACCEPTED)
+
+        response = token_client.delete(f'/api/imports/jobs/{import_job.id}/')
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+
+    def test_session_writes_still_need_csrf(self, user, sample_book):
+        """Test session-authenticated writes keep DRF's CSRF check"""
+        from rest_framework.test import APIClient
+
+        client = APIClient(enforce_csrf_checks=True)
+        client.login(username='testuser', password='testpass123')
+        response = client.patch(f'/api/books/{sample_book.id}/', {'title': 'Renamed'}, format='json')
+
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+        assert 'CSRF' in response.json()['detail']
+
+    def test_reads_apply_configured_throttles(self, authenticated_client, sample_book):
+        """Test async reads are throttled like the DRF views"""
+        from rest_framework.throttling import UserRateThrottle
+        from apps.books.async_views import BookDetailView
+
+        class OnePerMinute(UserRateThrottle):
+            rate = '1/min'
+
+        url = f'/api/books/{sample_book.id}/'
+        with patch.object(BookDetailView, 'throttle_classes', [OnePerMinute]):
+            assert authenticated_client.get(url).status_code == status.HTTP_200_OK
+            response = authenticated_client.get(url)
+
+        assert response.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+        assert int(response['Retry-After']) > 0
+
+    def test_writes_still_reach_the_viewset(self, authenticated_client, sample_book):
+        """Test non-GET methods on an async read URL are handled by the DRF viewset"""
+        response = authenticated_client.patch(f'/api/books/{sample_book.id}/', {'title': 'Renamed'}, format='json')
+
+        assert response.status_code == status.HTTP_200_OK
+        sample_book.refresh_from_db()
+        assert sample_book.title == 'Renamed'
+
+
+@pytest.mark.django_db
+class TestImportStatsAPI:
+    url = '/api/imports/stats/'
+
+    def _rollup(self, hours_ago, **fields):
+        from datetime import timedelta
+        from django.utils import timezone
+        from apps.imports.models import ImportStatsRollup
+
+        bucket_start = (timezone.now() - timedelta(hours=hours_ago)).replace(minute=0, second=0, microsecond=0)
+        return ImportStatsRollup.objects.create(bucket_start=bucket_start, **fields)
+
+    def test_stats_aggregate_rollups_in_window(self, authenticated_client, django_assert_num_queries):
+        """Test the default 24h window sums rollups and merges their histograms in one query"""
+        self._rollup(0, jobs=2, succeeded=2, rows=300, rows_per_second_histogram={'20': 2})
+        self._rollup(5, jobs=1, failed=1, rows=10, rows_per_second_histogram={'40': 1})
+        self._rollup(48, jobs=7, succeeded=7, rows=9000)
+
+        with django_assert_num_queries(1):
+            response = authenticated_client.get(self.url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['window'] == '24h'
+        assert response.data['jobs'] == 3
+        assert response.data['succeeded'] == 2
+        assert response.data['failed'] == 1
+        assert response.data['rows'] == 310
+        assert response.data['rows_per_second']['p50'] < response.data['rows_per_second']['p99']
+
+    def test_longer_window(self, authenticated_client):
+        """Test a longer window includes older rollups"""
+        self._rollup(0, jobs=2)
+        self._rollup(48, jobs=7)
+
+        response = authenticated_client.get(self.url, {'window': '7d'})
+        assert response.data['jobs'] == 9
+
+    def test_unknown_window_is_rejected(self, authenticated_client):
+        """Test an unsupported window is a 400"""
+        response = authenticated_client.get(self.url, {'window': '2w'})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_stats_require_authentication(self, api_client):
+        """Test anonymous users cannot read stats"""
+        response = api_client.get(self.url)
+        assert response.status_code in [status.HTTP_401_UNAUTHORIZED, status.HTTP_403_FORBIDDEN]
+
+    def test_status_includes_performance(self, authenticated_client, completed_import_job):
+        """Test the job status carries the performance record once recorded"""
+        from apps.imports.services.performance import record_job_performance
+
+        url = reverse('imports-jobs-detail', kwargs={'pk': completed_import_job.id})
+        assert authenticated_client.get(url).data['performance'] is None
+
+        record_job_performance(completed_import_job)
+
+        response = authenticated_client.get(url)
+        assert response.data['performance']['rows'] == 100
+
+
+@pytest.mark.django_db
+class TestBookCursorPagination:
+    url = '/api/books/'
+
+    @pytest.fixture
+    def books(self):
+        # Duplicate and missing years exercise the id tie-breaker and NULL ordering
+        return [
+            Book.objects.create(
+                title=f'Book {i:02d}',
+                author=f'Author {i % 3}',
+                isbn=f'97800000{i:02d}',
+                publication_year=None if i % 5 == 0 else 2000 + i % 4
+            )
+            for i in range(45)
+        ]
+
+    def _walk(self, client, params):
+        ids, response = [], client.get(self.url, params)
+        while True:
+            assert response.status_code == status.HTTP_200_OK
+            ids += [book['id'] for book in response.data['results']]
+            if not response.data['next']:
+                return ids
+            response = client.get(response.data['next'])
+
+    @pytest.mark.parametrize('ordering', ['title', '-author', 'publication_year', '-publication_year', '-created_at'])
+    def test_pages_cover_every_book_once_in_order(self, authenticated_client, books, ordering):
+        """Test walking the cursors returns each book exactly once, in the requested order"""
+        name = ordering.lstrip('-')
+        descending = ordering.startswith('-')
+        present = sorted(
+            (book for book in books if getattr(book, name) is not None),
+            key=lambda book: (getattr(book, name), book.id), reverse=descending
+        )
+        missing = sorted(
+            (book for book in books if getattr(book, name) is None), key=lambda book: book.id, reverse=descending
+        )
+
+        ids = self._walk(authenticated_client, {'ordering': ordering})
+        assert ids == [book.id for book in present + missing]
+
+    def test_previous_link_returns_previous_page(self, authenticated_client, books):
+        """Test the previous cursor of the second page gives the first page back"""
+        first = authenticated_client.get(self.url, {'ordering': 'publication_year'})
+        assert first.data['previous'] is None
+        second = authenticated_client.get(first.data['next'])
+
+        back = authenticated_client.get(second.data['previous'])
+        assert [book['id'] for book in back.data['results']] == [book['id'] for book in first.data['results']]
+        assert back.data['next'] is not None
+
+    def test_deep_page_runs_no_count_or_offset(self, authenticated_client, books):
+        """Test a page is a single keyset query without COUNT or OFFSET"""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        first = authenticated_client.get(self.url, {'ordering': 'title'})
+        with CaptureQueriesContext(connection) as queries:
+            response = authenticated_client.get(first.data['next'])
+
+        assert response.status_code == status.HTTP_200_OK
+        assert 'count' not in response.data
+        assert len(queries) == 1
+        sql = queries[0]['sql'].upper()
+        assert 'COUNT(' not in sql
+        assert 'OFFSET' not in sql
+
+    def test_cursor_is_tied_to_its_ordering(self, authenticated_client, books):
+        """Test a cursor issued for one ordering is rejected under another"""
+        next_url = authenticated_client.get(self.url, {'ordering': 'title'}).data['next']
+        response = authenticated_client.get(next_url.replace('ordering=title', 'ordering=author'))
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_invalid_cursor(self, authenticated_client):
+        """Test a garbled cursor is a 404"""
+        response = authenticated_client.get(self.url, {'cursor': 'not-a-cursor'})
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+class TestBookSearch:
+    url = '/api/books/'
+
+    def test_isbn_query_is_exact_lookup(self, authenticated_client):
+        """Test a valid ISBN, hyphenated or not on either side, is an exact lookup instead of a text search"""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        book = Book.objects.create(title='Data', author='Someone', isbn='0-306-40615-2')
+        Book.objects.create(title='Other', author='Someone', isbn='90306406152')
+        with CaptureQueriesContext(connection) as queries:
+            response = authenticated_client.get(self.url, {'search': '0306406152'})
+
+        assert [book['id'] for book in response.data['results']] == [book.id]
+        assert 'LIKE' not in queries[-1]['sql'].upper()
+
+    def test_isbn_shaped_queries_fall_back_to_text_search(self, authenticated_client):
+        """Test digit runs that are not a stored valid ISBN still get the normal search"""
+        prefixed = Book.objects.create(title='C', author='K&R', isbn='9780131103627')
+        titled = Book.objects.create(title='Notes on 0306406152', author='Someone', isbn='1111111111')
+
+        # Ten digits of an ISBN-13 prefix: shaped like an ISBN-10, but the checksum fails
+        response = authenticated_client.get(self.url, {'search': '9780131103'})
+        assert [book['id'] for book in response.data['results']] == [prefixed.id]
+
+        # A valid ISBN no book is stored under
+        response = authenticated_client.get(self.url, {'search': '0306406152'})
+        assert [book['id'] for book in response.data['results']] == [titled.id]
+
+    def test_sqlite_falls_back_to_icontains(self, authenticated_client):
+        """Test every term must match some field, as with DRF's SearchFilter"""
+        Book.objects.create(title='Python Guide', author='John Doe', isbn='1111111111')
+        Book.objects.create(title='Django Book', author='Jane Python', isbn='2222222222')
+
+        response = authenticated_client.get(self.url, {'search': 'python doe'})
+        assert [book['title'] for book in response.data['results']] == ['Python Guide']
+
+    def test_postgres_query_uses_indexed_operators(self):
+        """Test the PostgreSQL query matches via tsvector and trigram operators and ranks hits"""
+        from django.db import connection
+        from django.db.backends.postgresql.base import DatabaseWrapper
+        from apps.books.search import full_text_search
+
+        postgres = DatabaseWrapper(
+            {**connection.settings_dict, 'ENGINE': 'django.db.backends.postgresql'}, alias='postgres'
+        )
+        queryset = full_text_search(Book.objects.all(), 'gatsby')
+        sql, _ = queryset.query.get_compiler(connection=postgres).as_sql()
+
+        assert '"books"."search_vector" @@ (websearch_to_tsquery(' in sql
+        assert '"books"."title" %%> ' in sql
+        assert '"books"."author" %%> ' in sql
+        assert 'LIKE' not in sql
+        assert 'AS "search_rank"' in sql
+
+        # Digits may be part of an ISBN
+        queryset = full_text_search(Book.objects.all(), '978-0306')
+        sql, params = queryset.query.get_compiler(connection=postgres).as_sql()
+        assert '"books"."isbn"::text LIKE' in sql
+        assert '%9780306%' in params
+
+    def test_ranked_results_default_to_relevance(self):
+        """Test a ranked search is ordered best match first unless an ordering is requested"""
+        from unittest.mock import Mock
+        from django.db.models import Value
+        from rest_framework.request import Request
+        from rest_framework.test import APIRequestFactory
+        from apps.books.filters import BookOrderingFilter
+        from apps.books.views import BookViewSet
+
+        queryset = Book.objects.annotate(search_rank=Value(1.0))
+        view = Mock(spec=BookViewSet, ordering=BookViewSet.ordering, ordering_fields=BookViewSet.ordering_fields)
+
+        request = Request(APIRequestFactory().get('/api/books/', {'search': 'x'}))
+        assert BookOrderingFilter().get_ordering(request, queryset, view) == ['-search_rank']
+
+        request = Request(APIRequestFactory().get('/api/books/', {'search': 'x', 'ordering': 'title'}))
+        assert BookOrderingFilter().get_ordering(request, queryset, view) == ['title']
+
+    def test_normalize_isbn(self):
+        """Test ISBN detection accepts ISBN-10/13 with separators and rejects other text"""
+        from apps.books.search import normalize_isbn
+
+        assert normalize_isbn('0-306-40615-x') == '030640615X'
+        assert normalize_isbn('978 0 306 40615 7') == '9780306406157'
+        assert normalize_isbn('12345') is None
+        assert normalize_isbn('The Great Gatsby') is None
+
+    def test_is_valid_isbn(self):
+        """Test ISBN-10 and ISBN-13 check digits"""
+        from apps.books.search import is_valid_isbn
+
+        assert is_valid_isbn('030640615X') is False
+        assert is_valid_isbn('0306406152') is True
+        assert is_valid_isbn('080442957X') is True
+        assert is_valid_isbn('9780306406157') is True
+        assert is_valid_isbn('9780131103') is False
+
+
+@pytest.mark.django_db
+class TestBookAutocomplete:
+    url = '/api/books/autocomplete/'
+
+    @pytest.fixture
+    def catalog(self):
+        for i, (title, author) in enumerate([
+            ('The Left Hand of Darkness', 'Ursula K. Le Guin'),
+            ('The Lathe of Heaven', 'Ursula K. Le Guin'),
+            ('the left hand of darkness', 'ursula k. le guin'),
+            ('Leviathan Wakes', 'James S. A. Corey'),
+            ('Dune', 'Frank Herbert'),
+        ]):
+            Book.objects.create(title=title, author=author, isbn=f'97800000000{i}')
+
+    def test_titles_and_authors_for_prefix(self, authenticated_client, catalog):
+        """Test completions are case-insensitive, distinct and in alphabetical order"""
+        response = authenticated_client.get(self.url, {'q': 'the l'})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data['titles'] == ['The Lathe of Heaven', 'The Left Hand of Darkness']
+        assert response.data['authors'] == []
+
+        response = authenticated_client.get(self.url, {'q': 'URSULA'})
+        assert response.data['authors'] == ['Ursula K. Le Guin']
+
+    def test_limit(self, authenticated_client, catalog):
+        """Test the number of completions per field is capped by limit"""
+        response = authenticated_client.get(self.url, {'q': 'th', 'limit': 1})
+        assert response.data['titles'] == ['The Lathe of Heaven']
+
+        response = authenticated_client.get(self.url, {'q': 'th', 'limit': 'many'})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_popular_prefix_is_served_from_cache(self, authenticated_client, catalog, django_assert_num_queries):
+        """Test a repeated prefix costs no database query"""
+        first = authenticated_client.get(self.url, {'q': 'Le'})
+        with django_assert_num_queries(0):
+            second = authenticated_client.get(self.url, {'q': ' le '})
+        assert second.data['titles'] == first.data['titles'] == ['Leviathan Wakes']
+
+    def test_short_prefix_does_not_query(self, authenticated_client, catalog, django_assert_num_queries):
+        """Test prefixes below the minimum length return nothing without a query"""
+        with django_assert_num_queries(0):
+            response = authenticated_client.get(self.url, {'q': 'l'})
+        assert response.data == {'query': 'l', 'titles': [], 'authors': []}
+
+    def test_requires_authentication(self, api_client):
+        """Test anonymous users are refused"""
+        assert api_client.get(self.url, {'q': 'le'}).status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_read_only(self, authenticated_client):
+        """Test writes are not allowed"""
+        assert authenticated_client.post(self.url, {}).status_code == status.HTTP_405_METHOD_NOT_ALLOWED
+
+
+@pytest.mark.django_db
+class TestEstimatedCounts:
+    @pytest.fixture
+    def jobs(self, user):
+        return [
+            ImportJob.objects.create(filename=f'job_{i}.csv', file_path=f'imports/job_{i}.csv', uploader=user)
+            for i in range(25)
+        ]
+
+    def test_small_results_are_counted_exactly(self, authenticated_client, jobs):
+        """Test results below the threshold report an exact count"""
+        response = authenticated_client.get('/api/imports/jobs/')
+
+        assert response.data['count'] == 25
+        assert response.data['count_estimated'] is False
+
+    def test_large_results_use_the_planner_estimate(self, authenticated_client, jobs, django_assert_num_queries):
+        """Test a large estimate replaces COUNT(*) and page bounds come from the rows"""
+        with patch('apps.core.pagination.planner_estimate', return_value=1_000_000):
+            with django_assert_num_queries(1):
+                first = authenticated_client.get('/api/imports/jobs/')
+            second = authenticated_client.get(first.data['next'])
+            beyond = authenticated_client.get('/api/imports/jobs/?page=3')
+
+        assert first.data['count'] == 1_000_000
+        assert first.data['count_estimated'] is True
+        assert len(second.data['results']) == 5
+        assert second.data['next'] is None
+        assert beyond.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_estimate_below_threshold_counts(self, jobs, settings):
+        """Test a small estimate still runs the exact count"""
+        from apps.core.pagination import estimated_count
+
+        settings.API_COUNT_ESTIMATE_THRESHOLD = 100
+        with patch('apps.core.pagination.planner_estimate', return_value=30):
+            assert estimated_count(ImportJob.objects.all()) == (25, False)
+
+    def test_sync_paginator(self, jobs):
+        """Test the DRF paginator pages by rows when the count is estimated"""
+        from apps.core.pagination import EstimatedCountPaginator
+
+        with patch('apps.core.pagination.planner_estimate', return_value=1_000_000):
+            paginator = EstimatedCountPaginator(ImportJob.objects.order_by('id'), 20)
+            assert paginator.count_estimated is True
+            assert paginator.page(1).has_next() is True
+            last = paginator.page(2)
+
+        assert len(last.object_list) == 5
+        assert last.has_next() is False
+
+    def test_no_estimate_off_postgres(self, jobs):
+        """Test SQLite has no planner estimate"""
+        from apps.core.pagination import planner_estimate
+
+        assert planner_estimate(ImportJob.objects.filter(status=ImportJob.PENDING)) is None
+
+
+@pytest.mark.django_db
+class TestBookResponseCache:
+    list_url = '/api/books/'
+
+    def test_list_is_served_from_cache(self, authenticated_client, sample_book, django_assert_num_queries):
+        """Test a repeated list request costs no query, whatever the parameter order"""
+        first = authenticated_client.get(self.list_url + '?ordering=title&search=')
+        assert first['X-Cache'] == 'MISS'
+
+        with django_assert_num_queries(0):
+            second = authenticated_client.get(self.list_url + '?search=&ordering=title%20')
+        assert second['X-Cache'] == 'HIT'
+        assert second.data == first.data
+
+    def test_detail_is_served_from_cache(self, authenticated_client, sample_book, django_assert_num_queries):
+        """Test the async detail view caches its payload too"""
+        url = f'/api/books/{sample_book.id}/'
+        authenticated_client.get(url)
+        with django_assert_num_queries(0):
+            response = authenticated_client.get(url)
+        assert response['X-Cache'] == 'HIT'
+        assert response.data['title'] == sample_book.title
+
+    def test_book_writes_invalidate(self, authenticated_client, staff_client, sample_book,
+                                    django_capture_on_commit_callbacks):
+        """Test saves, API updates and set-based writes all bump the catalog version"""
+        url = f'/api/books/{sample_book.id}/'
+
+        def titles():
+            return [book['title'] for book in authenticated_client.get(self.list_url).data['results']]
+
+        assert titles() == ['Test Book']
+        with django_capture_on_commit_callbacks(execute=True):
+            Book.objects.bulk_create([Book(title='Bulk Book', author='A', isbn='5555555555')])
+        assert titles() == ['Bulk Book', 'Test Book']
+
+        with django_capture_on_commit_callbacks(execute=True):
+            Book.objects.filter(isbn='5555555555').update(title='Renamed Bulk')
+        assert titles() == ['Renamed Bulk', 'Test Book']
+
+        authenticated_client.get(url)
+        with django_capture_on_commit_callbacks(execute=True):
+            staff_client.patch(url, {'title': 'Patched'}, format='json')
+        assert authenticated_client.get(url).data['title'] == 'Patched'
+
+        with django_capture_on_commit_callbacks(execute=True):
+            Book.objects.all().delete()
+        assert titles() == []
+
+    def test_import_bumps_once_per_progress_update(self, import_job, temp_csv_file,
+                                                   django_capture_on_commit_callbacks):
+        """Test an import does not bump the catalog version for every row"""
+        from apps.imports.services.csv_importer import CSVImporter
+
+        import_job.file_path = temp_csv_file
+        import_job.save()
+        with patch('apps.books.response_cache.bump_catalog_version') as bump:
+            with django_capture_on_commit_callbacks(execute=True):
+                CSVImporter(import_job).process_file()
+
+        assert Book.objects.count() == 2
+        assert bump.call_count == 1
+
+    def test_metrics(self, authenticated_client, staff_client, sample_book):
+        """Test hits and misses are counted and exposed to staff"""
+        url = '/api/books/cache/stats/'
+        before = staff_client.get(url).data
+
+        authenticated_client.get(self.list_url)
+        authenticated_client.get(self.list_url)
+        after = staff_client.get(url).data
+
+        assert after['hits'] - before['hits'] == 1
+        assert after['misses'] - before['misses'] == 1
+        assert 0 < after['hit_rate'] <= 1
+
+
+@pytest.mark.django_db
+class TestBookListFastPath:
+    def test_list_matches_serializer(self, authenticated_client, sample_book):
+        """Test the values() list payload is what BookListSerializer produces"""
+        from apps.books.serializers import BookListSerializer
+
+        Book.objects.create(title='Untitled Year', author='Anon', isbn='6666666666')
+        response = authenticated_client.get('/api/books/?ordering=title')
+
+        expected = BookListSerializer(Book.objects.order_by('title', 'pk'), many=True).data
+        assert response.json()['results'] == expected
+
+    def test_cursor_over_values_rows(self, authenticated_client):
+        """Test keyset cursors work when the ordering field is not a list field"""
+        Book.objects.bulk_create([
+            Book(title=f'Book {i}', author='A', isbn=f'97800000000{i:02d}') for i in range(5)
+        ])
+        seen, url = [], '/api/books/?ordering=-created_at'
+        with patch('apps.core.pagination.KeysetCursorPagination.page_size', 2):
+            while url:
+                body = authenticated_client.get(url).json()
+                seen += [book['isbn'] for book in body['results']]
+                url = body['next']
+        assert sorted(seen) == sorted(Book.objects.values_list('isbn', flat=True))
+
+    def test_renderer_matches_json_renderer(self):
+        """Test FastJSONRenderer renders the same bytes as JSONRenderer"""
+        import datetime
+        import decimal
+        from django.utils.translation import gettext_lazy
+        from rest_framework.renderers import JSONRenderer
+        from apps.core.renderers import FastJSONRenderer
+
+        data = {
+            'title': 'Éditions line', 'when': datetime.datetime(2024, 5, 1, 12, 0, 0, 123456),
+            'price': decimal.Decimal('9.50'), 'label': gettext_lazy('Not found.'), 1: [None, True],
+        }
+        assert FastJSONRenderer().render(data) == JSONRenderer().render(data)
+        assert FastJSONRenderer().render({'n': 2 ** 70}) == JSONRenderer().render({'n': 2 ** 70})
+        assert FastJSONRenderer().render(data, 'application/json; indent=4') == \
+            JSONRenderer().render(data, 'application/json; indent=4')
+
+    def test_renderer_without_orjson(self):
+        """Test the renderer falls back to json when orjson is not installed"""
+        from rest_framework.renderers import JSONRenderer
+        from apps.core.renderers import FastJSONRenderer
+
+        with patch('apps.core.renderers.orjson', None):
+            assert FastJSONRenderer().render({'a': 'é'}) == JSONRenderer().render({'a': 'é'})
+
+    def test_book_views_keep_configured_renderers(self, authenticated_client, sample_book):
+        """Test FastJSONRenderer goes ahead of DEFAULT_RENDERER_CLASSES instead of replacing them"""
+        from rest_framework.settings import api_settings
+        from apps.books.views import BookViewSet
+        from apps.core.renderers import FastJSONRenderer
+
+        assert BookViewSet.renderer_classes[0] is FastJSONRenderer
+        assert BookViewSet.renderer_classes[1:] == list(api_settings.DEFAULT_RENDERER_CLASSES)
+
+        response = authenticated_client.get('/api/books/', HTTP_ACCEPT='application/json')
+        assert response.status_code == 200
+        assert response.accepted_renderer.__class__ is FastJSONRenderer
+
+
+@pytest.mark.django_db
+class TestSparseFieldsets:
+    def test_book_list_selects_only_requested_columns(self, authenticated_client, sample_book):
+        """Test ?fields= trims the book list and its SELECT"""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        with CaptureQueriesContext(connection) as queries:
+            response = authenticated_client.get('/api/books/?fields=isbn,title')
+
+        assert response.json()['results'] == [{'isbn': '1234567890', 'title': 'Test Book'}]
+        select = queries.captured_queries[-1]['sql']
+        assert '"author"' not in select and '"publication_year"' not in select
+
+    def test_unknown_field_is_rejected(self, authenticated_client, sample_book, import_job):
+        """Test unknown names answer 400 on every endpoint"""
+        for url in ['/api/books/', f'/api/books/{sample_book.id}/', '/api/imports/jobs/',
+                    f'/api/imports/jobs/{import_job.id}/']:
+            response = authenticated_client.get(url + '?fields=id,secret')
+            assert response.status_code == status.HTTP_400_BAD_REQUEST, url
+            assert 'secret' in response.json()['fields'][0]
+
+    def test_book_detail(self, authenticated_client, sample_book):
+        """Test the async detail loads and returns only the requested fields"""
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        with CaptureQueriesContext(connection) as queries:
+            response = authenticated_client.get(f'/api/books/{sample_book.id}/?fields=title')
+
+        assert response.json() == {'title': 'Test Book'}
+        assert '"author"' not in queries.captured_queries[-1]['sql']
+
+    def test_job_list_skips_unrequested_method_fields(self, authenticated_client, import_job):
+        """Test computed fields that were not asked for are never evaluated"""
+        from apps.imports.serializers import ImportJobSerializer
+
+        with patch.object(ImportJobSerializer, 'get_duration', side_effect=AssertionError), \
+                patch.object(ImportJobSerializer, 'get_errors_preview', side_effect=AssertionError):
+            response = authenticated_client.get('/api/imports/jobs/?fields=id,status,progress_percent')
+
+        assert response.json()['results'] == [{'id': import_job.id, 'status': 'PENDING', 'progress_percent': 0}]
+
+    def test_job_list_errors_preview_on_request(self, authenticated_client, import_job):
+        """Test naming errors_preview in ?fields= includes it without ?include="""
+        ImportRowError.objects.create(import_job=import_job, row_number=2, error_message='Bad ISBN')
+
+        results = authenticated_client.get('/api/imports/jobs/?fields=id,errors_preview').json()['results']
+
+        assert results[0]['errors_preview'][0]['error_message'] == 'Bad ISBN'
+
+    def test_job_status_trims_snapshot(self, authenticated_client, import_job):
+        """Test the status view trims its cached snapshot with its own ETag"""
+        url = f'/api/imports/jobs/{import_job.id}/'
+        full = authenticated_client.get(url)
+        sparse = authenticated_client.get(url + '?fields=status,progress_percent')
+
+        assert sparse.json() == {'status': 'PENDING', 'progress_percent': 0}
+        assert sparse['ETag'] != full['ETag']
+        not_modified = authenticated_client.get(url + '?fields=status,progress_percent',
+                                                HTTP_IF_NONE_MATCH=sparse['ETag'])
+        assert not_modified.status_code == status.HTTP_304_NOT_MODIFIED
+
+
+@pytest.mark.django_db
+class TestBookBulkAPI:
+    url = '/api/books/bulk/'
+
+    def test_mixed_operations(self, authenticated_client, sample_book):
+        """Test creates, updates and deletes are applied with a result per item"""
+        doomed = Book.objects.create(title='Old', author='A', isbn='7777777777')
+        response = authenticated_client.post(self.url, [
+            {'op': 'create', 'data': {'title': 'New', 'author': 'B', 'isbn': '8888888888', 'publication_year': 2001}},
+            {'op': 'update', 'id': sample_book.id, 'data': {'title': 'Corrected'}},
+            {'op': 'delete', 'id': doomed.id},
+            # The ISBN of a book deleted in the same request can be reused
+            {'op': 'create', 'data': {'title': 'Reissue', 'author': 'A', 'isbn': '7777777777'}},
+        ], format='json')
+
+        assert response.status_code == status.HTTP_200_OK
+        body = response.json()
+        assert (body['created'], body['updated'], body['deleted'], body['errors']) == (2, 1, 1, 0)
+        assert [r['status'] for r in body['results']] == ['created', 'updated', 'deleted', 'created']
+        assert Book.objects.get(pk=body['results'][0]['id']).title == 'New'
+        sample_book.refresh_from_db()
+        assert sample_book.title == 'Corrected' and sample_book.author == 'Test Author'
+        assert not Book.objects.filter(pk=doomed.id).exists()
+
+    def test_invalid_items_are_reported_and_skipped(self, authenticated_client, sample_book):
+        """Test per-item errors without failing the valid items"""
+        response = authenticated_client.post(self.url, [
+            {'op': 'create', 'data': {'title': 'Dup', 'author': 'A', 'isbn': sample_book.isbn}},
+            {'op': 'create', 'data': {'title': 'Twice', 'author': 'A', 'isbn': '9999999999'}},
+            {'op': 'create', 'data': {'title': 'Twice again', 'author': 'A', 'isbn': '9999999999'}},
+            {'op': 'update', 'id': 999999, 'data': {'title': 'Ghost'}},
+            {'op': 'update', 'id': sample_book.id, 'data': {'publication_year': 3000}},
+            {'op': 'rename', 'id': sample_book.id},
+            {'op': 'delete', 'id': 'one'},
+        ], format='json')
+
+        results = response.json()['results']
+        assert [r['status'] for r in results] == ['error', 'created', 'error', 'error', 'error', 'error', 'error']
+        assert 'isbn' in results[0]['errors'] and 'isbn' in results[2]['errors']
+        assert 'id' in results[3]['errors'] and 'publication_year' in results[4]['errors']
+        assert Book.objects.count() == 2
+
+    def test_queries_do_not_grow_with_batch_size(self, authenticated_client, django_assert_max_num_queries):
+        """Test a batch costs a fixed number of queries, not one per row"""
+        def payload(n, offset):
+            return [
+                {'op': 'create', 'data': {'title': f'Book {i}', 'author': 'A', 'isbn': f'97810000{i:05d}'}}
+                for i in range(offset, offset + n)
+            ]
+
+        with django_assert_max_num_queries(6):
+            authenticated_client.post(self.url, payload(3, 0), format='json')
+        with django_assert_max_num_queries(6):
+            response = authenticated_client.post(self.url, payload(300, 100), format='json')
+        assert response.json()['created'] == 300
+
+    def test_limits(self, authenticated_client, settings):
+        """Test the body must be a non-empty array of at most BOOK_BULK_MAX_OPERATIONS"""
+        settings.BOOK_BULK_MAX_OPERATIONS = 2
+        assert authenticated_client.post(self.url, {'op': 'create'}, format='json').status_code == 400
+        assert authenticated_client.post(self.url, [], format='json').status_code == 400
+        too_many = [{'op': 'delete', 'id': i} for i in range(3)]
+        assert authenticated_client.post(self.url, too_many, format='json').status_code == 400
+
+    def test_bumps_catalog_version_once(self, authenticated_client, sample_book, django_capture_on_commit_callbacks):
+        """Test a whole batch invalidates cached book responses with one version bump"""
+        with patch('apps.books.response_cache.bump_catalog_version') as bump:
+            with django_capture_on_commit_callbacks(execute=True):
+                authenticated_client.post(self.url, [
+                    {'op': 'create', 'data': {'title': 'New', 'author': 'B', 'isbn': '8888888888'}},
+                    {'op': 'update', 'id': sample_book.id, 'data': {'title': 'Corrected'}},
+                ], format='json')
+        assert bump.call_count == 1
+
+
+@pytest.mark.django_db
+class TestBookISBNLookup:
+    url = '/api/books/isbn-lookup/'
+
+    def test_finds_books_in_one_query(self, authenticated_client, django_assert_num_queries):
+        """Test hyphenated and ISBN-10/13 counterparts match, in a single query"""
+        Book.objects.create(title='Dune', author='Frank Herbert', isbn='0441013597')
+        Book.objects.create(title='Neuromancer', author='William Gibson', isbn='9780441569595')
+        isbns = ['978-0-441-01359-3', '0-441-56959-5', '9780000000002']
+
+        with django_assert_num_queries(1):
+            response = authenticated_client.post(self.url, {'isbns': isbns}, format='json')
+
+        body = response.json()
+        assert (body['requested'], body['found']) == (3, 2)
+        assert body['books']['978-0-441-01359-3']['title'] == 'Dune'
+        assert body['books']['0-441-56959-5']['isbn'] == '9780441569595'
+        assert set(body['books']['0-441-56959-5']) == {'id', 'title', 'author', 'isbn', 'publication_year'}
+        assert body['missing'] == ['9780000000002']
+
+    def test_matches_stored_isbns_with_hyphens(self, authenticated_client):
+        """Test books stored hyphenated are found by any spelling of their ISBN"""
+        Book.objects.create(title='Dune', author='Frank Herbert', isbn='978-0-441-01359-3')
+        isbns = ['9780441013593', '0-441-01359-7', '978 0 441 01359 3']
+
+        body = authenticated_client.post(self.url, {'isbns': isbns}, format='json').json()
+
+        assert body['found'] == 3
+        assert {book['title'] for book in body['books'].values()} == {'Dune'}
+
+    def test_bare_isbn_lookup_uses_the_model_index(self):
+        """Test the bare ISBN comparison is served by the books_isbn_bare index from Book.Meta"""
+        from django.db import connection
+        from apps.books.isbn_lookup import BARE_ISBN, isbn_filter
+
+        assert 'books_isbn_bare' in connection.introspection.get_constraints(connection.cursor(), 'books')
+        queryset = Book.objects.annotate(bare_isbn=BARE_ISBN).filter(
+            isbn_filter(['9780441013593'], connection.vendor)
+        ).order_by()
+        assert 'books_isbn_bare' in queryset.explain()
+
+    def test_repeated_isbns_are_counted_once(self, authenticated_client, sample_book):
+        """Test found and missing count each distinct ISBN once, like the books keys"""
+        isbns = [sample_book.isbn, sample_book.isbn, '9780000000002', '9780000000002']
+
+        body = authenticated_client.post(self.url, {'isbns': isbns}, format='json').json()
+
+        assert (body['requested'], body['found']) == (2, 1)
+        assert list(body['books']) == [sample_book.isbn]
+        assert body['missing'] == ['9780000000002']
+
+    def test_bitmap_output(self, authenticated_client, sample_book):
+        """Test the compact form sets one bit per requested ISBN, in order"""
+        import base64
+
+        isbns = ['0000000000'] * 8 + [sample_book.isbn]
+        response = authenticated_client.post(self.url + '?output=bitmap', {'isbns': isbns}, format='json')
+
+        body = response.json()
+        assert body['found'] == 1
+        assert base64.b64decode(body['bitmap']) == bytes([0x00, 0x80])
+
+    def test_long_lists(self, authenticated_client, sample_book):
+        """Test lists beyond one IN list are batched"""
+        isbns = [f'97800000{i:05d}' for i in range(1200)] + [sample_book.isbn]
+        response = authenticated_client.post(self.url, {'isbns': isbns}, format='json')
+        assert response.json()['found'] == 1
+
+    def test_postgres_uses_an_array_join_for_long_lists(self):
+        """Test a long list is one array parameter on PostgreSQL, not thousands"""
+        from django.db import connection
+        from django.db.backends.postgresql.base import DatabaseWrapper
+        from apps.books.isbn_lookup import BARE_ISBN, isbn_filter
+
+        postgres = DatabaseWrapper(
+            {**connection.settings_dict, 'ENGINE': 'django.db.backends.postgresql'}, alias='postgres'
+        )
+        candidates = [f'97800000{i:05d}' for i in range(2000)]
+        queryset = Book.objects.annotate(bare_isbn=BARE_ISBN).filter(isbn_filter(candidates, 'postgresql'))
+        sql, params = queryset.query.get_compiler(connection=postgres).as_sql()
+
+        assert 'IN (SELECT unnest(%s::text[]))' in sql
+        assert params[-1] == candidates
+        assert sum(isinstance(param, list) for param in params) == 1
+
+    def test_invalid_requests(self, authenticated_client, settings):
+        """Test malformed bodies, unknown outputs and oversized lists answer 400"""
+        settings.BOOK_ISBN_LOOKUP_MAX = 2
+        assert authenticated_client.post(self.url, {'isbns': []}, format='json').status_code == 400
+        assert authenticated_client.post(self.url, {'isbns': [1]}, format='json').status_code == 400
+        assert authenticated_client.post(self.url, {'isbns': ['1', '2', '3']}, format='json').status_code == 400
+        assert authenticated_client.post(self.url + '?output=xml', {'isbns': ['1']}, format='json').status_code == 400
+
+
+@pytest.mark.django_db
+class TestCatalogExport:
+    url = '/api/books/export/'
+
+    @staticmethod
+    def body(response):
+        return b''.join(response.streaming_content)
+
+    def test_csv(self, authenticated_client, sample_book):
+        """Test the export streams a header and every book"""
+        import csv
+        import io
+
+        Book.objects.create(title='Ébauche, "drafts"', author='Other', isbn='2222222222')
+        response = authenticated_client.get(self.url)
+
+        assert response['Content-Type'] == 'text/csv'
+        assert 'books.csv' in response['Content-Disposition']
+        rows = list(csv.reader(io.StringIO(self.body(response).decode())))
+        assert rows[0] == ['id', 'title', 'author', 'isbn', 'publication_year', 'created_at', 'updated_at']
+        assert [row[1] for row in rows[1:]] == ['Test Book', 'Ébauche, "drafts"']
+        assert rows[2][4] == ''
+
+    def test_ndjson_filtered_like_the_list(self, authenticated_client, sample_book):
+        """Test filterset_fields apply to the export"""
+        import json
+
+        Book.objects.create(title='Other', author='Someone Else', isbn='2222222222')
+        response = authenticated_client.get(self.url + '?output=ndjson&author=Test%20Author')
+
+        records = [json.loads(line) for line in self.body(response).decode().splitlines()]
+        assert [record['isbn'] for record in records] == [sample_book.isbn]
+        assert records[0]['publication_year'] == 2023
+
+    def test_gzip(self, authenticated_client, sample_book):
+        """Test ?compress=gzip streams a gzip file"""
+        import gzip
+
+        response = authenticated_client.get(self.url + '?output=ndjson&compress=gzip')
+
+        assert response['Content-Type'] == 'application/gzip'
+        assert 'books.ndjson.gz' in response['Content-Disposition']
+        assert sample_book.isbn in gzip.decompress(self.body(response)).decode()
+
+    def test_invalid_parameters(self, authenticated_client):
+        """Test unknown outputs and compressions answer 400"""
+        assert authenticated_client.get(self.url + '?output=xml').status_code == 400
+        assert authenticated_client.get(self.url + '?compress=zip').status_code == 400
+
+    def test_exporter_walks_every_batch(self):
+        """Test batches smaller than the catalog still export every row once"""
+        from apps.books.export import CatalogExporter
+
+        Book.objects.bulk_create([Book(title=f'B{i}', author='A', isbn=f'97811{i:08d}') for i in range(25)])
+        chunks = list(CatalogExporter(batch_size=10).stream('ndjson'))
+
+        assert len(chunks) == 3
+        assert sum(chunk.count('\n') for chunk in chunks) == 25
+
+    def test_command(self, tmp_path, sample_book):
+        """Test export_books writes a (gzipped) file with the list filters"""
+        import gzip
+        from django.core.management import call_command
+
+        Book.objects.create(title='Other', author='Someone Else', isbn='2222222222')
+        path = tmp_path / 'books.csv.gz'
+        call_command('export_books', output=str(path), gzip=True, author='Someone Else', stderr=io.StringIO())
+
+        lines = gzip.decompress(path.read_bytes()).decode().splitlines()
+        assert len(lines) == 2 and '2222222222' in lines[1]
+
+    def test_command_rejects_invalid_filters(self, tmp_path):
+        """Test filter values the API would reject end in a CommandError, not a traceback"""
+        from django.core.management import CommandError, call_command
+
+        with pytest.raises(CommandError, match='--publication-year'):
+            call_command('export_books', output=str(tmp_path / 'books.csv'), publication_year='abc')
+
+    def test_ndjson_without_orjson_matches(self, sample_book):
+        """Test the json fallback writes the same NDJSON bytes as orjson"""
+        from apps.books.export import CatalogExporter
+
+        with_orjson = ''.join(CatalogExporter().stream('ndjson'))
+        with patch('apps.books.export.orjson', None):
+            assert ''.join(CatalogExporter().stream('ndjson')) == with_orjson
@@ -0,0 +1,129 @@
+import csv
+import io
+import json
+import pytest
+from unittest.mock import patch
+from django.core.management import call_command
+from apps.books.models import Book
+from apps.imports.models import ImportJob
+from apps.imports.services.benchmark import (
+    BenchmarkResult,
+    ImportBenchmark,
+    PeakRSSSampler,
+    SyntheticCSVGenerator,
+    compare_to_baseline
+)
+
+
+class TestSyntheticCSVGenerator:
+    def test_generates_requested_rows(self, tmp_path):
+        """Test generator writes a header plus the requested number of rows"""
+        path = SyntheticCSVGenerator(rows=500).write(str(tmp_path / 'books.csv'))
+
+        with open(path, encoding='utf-8') as f:
+            rows = list(csv.reader(f))
+
+        assert rows[0] == ['title', 'author', 'isbn', 'publication_year']
+        assert len(rows) == 501
+
+    def test_duplicate_and_error_mix(self, tmp_path):
+        """Test generated files contain roughly the configured duplicate and error rates"""
+        path = SyntheticCSVGenerator(rows=2000, duplicate_rate=0.2, error_rate=0.1).write(
+            str(tmp_path / 'books.csv')
+        )
+
+        with open(path, encoding='utf-8') as f:
+            rows = list(csv.DictReader(f))
+
+        isbns = [row['isbn'] for row in rows]
+        duplicates = len(isbns) - len(set(isbns))
+        invalid = sum(1 for row in rows if not row['author'] or row['publication_year'] in ('unknown', '3000'))
+
+        assert 300 < duplicates < 500
+        assert 150 < invalid < 250
+
+    def test_same_seed_same_file(self, tmp_path):
+        """Test generation is reproducible for a given seed"""
+        first = SyntheticCSVGenerator(rows=100, error_rate=0.3).write(str(tmp_path / 'a.csv'))
+        second = SyntheticCSVGenerator(rows=100, error_rate=0.3).write(str(tmp_path / 'b.csv'))
+
+        with open(first) as a, open(second) as b:
+            assert a.read() == b.read()
+
+
+@pytest.mark.django_db
+class TestBenchmarkImportsCommand:
+    def test_writes_baseline_and_cleans_up(self, tmp_path):
+        """Test the benchmark records machine-readable results and removes its data"""
+        output = tmp_path / 'baseline.json'
+
+        call_command(
+            'benchmark_imports',
+            rows=[50],
+            mode=['importer', 'task'],
+            error_rate=0.1,
+            output=str(output)
+        )
+
+        baseline = json.loads(output.read_text())
+        assert [r['mode'] for r in baseline['results']] == ['importer', 'task']
+        for result in baseline['results']:
+            assert result['rows'] == 50
+            assert result['success_count'] + result['error_count'] == 50
+            assert result['queries'] > 0
+        assert not Book.objects.exists()
+        assert not ImportJob.objects.exists()
+
+    def test_peak_rss_is_measured_per_run(self):
+        """Test a run is not charged the peak of an earlier, larger run"""
+        mb = 1024 * 1024
+        with patch('apps.imports.services.benchmark.current_rss_bytes', return_value=300 * mb):
+            with PeakRSSSampler() as large:
+                pass
+        with patch('apps.imports.services.benchmark.current_rss_bytes', return_value=60 * mb):
+            with PeakRSSSampler() as small:
+                pass
+
+        assert (large.peak_mb, small.peak_mb) == (300.0, 60.0)
+
+    def test_task_mode_leaves_deferred_jobs_alone(self, tmp_path, user):
+        """Test benchmarking the task does not dispatch real deferred uploads"""
+        waiting = ImportJob.objects.create(
+            filename='waiting.csv', file_path='/tmp/waiting.csv', uploader=user, status=ImportJob.DEFERRED
+        )
+
+        with patch('apps.imports.tasks.process_csv_import.delay') as mock_delay:
+            result = ImportBenchmark(SyntheticCSVGenerator(rows=20), mode='task').run(str(tmp_path))
+
+        assert result.success_count == 20
+        mock_delay.assert_not_called()
+        waiting.refresh_from_db()
+        assert waiting.status == ImportJob.DEFERRED
+
+    def test_compare_flags_regressions(self):
+        """Test throughput drops beyond the tolerance are reported"""
+        result = BenchmarkResult(
+            mode='task', rows=1000, duplicate_rate=0.0, error_rate=0.0, non_ascii_rate=0.0,
+            encoding='utf-8', seconds=2.0, rows_per_second=500.0, queries=3000,
+            queries_per_1k_rows=3000.0, peak_rss_mb=80.0, success_count=1000,
+            error_count=0, status='SUCCESS'
+        )
+        baseline = {'results': [dict(result.__dict__, rows_per_second=1000.0)]}
+
+        regressions = compare_to_baseline([result], baseline, tolerance=0.1)
+
+        assert len(regressions) == 1
+        assert 'rows/sec' in regressions[0]
+
+
+@pytest.mark.django_db
+class TestBenchmarkBookSerializationCommand:
+    def test_reports_speedup_and_cleans_up(self, sample_book):
+        """Test every path renders the same page and synthetic books are rolled back"""
+        out = io.StringIO()
+        call_command('benchmark_book_serialization', page_size=[5, 30], repeat=2, stdout=out)
+
+        lines = out.getvalue().strip().splitlines()
+        assert 'values+orjson ms' in lines[0]
+        assert [line.split()[0] for line in lines[1:]] == ['5', '30']
+        assert list(Book.objects.all()) == [sample_book]
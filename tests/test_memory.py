@@ -0,0 +1,95 @@
+import logging
+import pytest
+from apps.books.export import CatalogExporter
+from apps.books.models import Book
+from apps.core.utils import traced_memory
+from apps.imports.models import ImportJob, ImportRowError
+from apps.imports.services.benchmark import SyntheticCSVGenerator
+from apps.imports.services.csv_importer import CSVImporter, MAX_ERROR_TEXT_LENGTH
+
+# Peak Python heap allowed for a single import, whatever the file size or error rate
+MEMORY_BUDGET_BYTES = 4 * 1024 * 1024
+
+
+def profile_import(tmp_path, user, **generator_options):
+    """Import a generated file and return the traced peak heap usage in bytes"""
+    generator = SyntheticCSVGenerator(**generator_options)
+    path = generator.write(str(tmp_path / f"profile_{generator.rows}_{generator.error_rate}.csv"))
+    job = ImportJob.objects.create(filename='profile.csv', file_path=path, uploader=user)
+
+    # pytest keeps every captured log record, which would be counted against the importer
+    importer_logger = logging.getLogger('apps.imports.services.csv_importer')
+    previous_level = importer_logger.level
+    importer_logger.setLevel(logging.ERROR)
+    try:
+        with traced_memory() as memory:
+            CSVImporter(job).process_file()
+    finally:
+        importer_logger.setLevel(previous_level)
+
+    return memory.peak_bytes
+
+
+@pytest.mark.django_db
+class TestImportMemoryBudget:
+    @pytest.mark.parametrize('error_rate', [0.0, 0.5, 1.0])
+    def test_peak_memory_within_budget(self, tmp_path, user, error_rate):
+        """Test import peak memory stays under the budget for clean and error-heavy files"""
+        peak = profile_import(tmp_path, user, rows=3000, error_rate=error_rate)
+
+        assert peak < MEMORY_BUDGET_BYTES
+
+    def test_peak_memory_does_not_grow_with_file_size(self, settings, tmp_path, user):
+        """Test a file several times larger does not need proportionally more memory"""
+        # Error row ranges are held per code up to this cap, so keep it below both file sizes
+        settings.IMPORT_ERROR_MAX_RANGES = 50
+        small = profile_import(tmp_path, user, rows=500, error_rate=0.5, seed=1)
+        large = profile_import(tmp_path, user, rows=5000, error_rate=0.5, seed=2)
+
+        assert large < small * 2 + 256 * 1024
+
+    def test_oversized_error_row_is_truncated(self, tmp_path, user):
+        """Test a huge malformed row is stored truncated without buffering it whole"""
+        path = tmp_path / 'huge.csv'
+        valid_rows = ''.join(f'Book {i},Author {i},HUGE{i:08d},2000\n' for i in range(30))
+        path.write_text('title,author,isbn,publication_year\n' + valid_rows + 'x' * 100000 + ',,,\n')
+        job = ImportJob.objects.create(filename='huge.csv', file_path=str(path), uploader=user)
+
+        CSVImporter(job).process_file()
+
+        error = ImportRowError.objects.get(import_job=job)
+        assert len(error.raw_data) <= MAX_ERROR_TEXT_LENGTH
+
+    def test_peak_memory_recorded_on_job(self, tmp_path, user):
+        """Test the importer records the worker's peak memory on the job"""
+        path = SyntheticCSVGenerator(rows=200).write(str(tmp_path / 'small.csv'))
+        job = ImportJob.objects.create(filename='small.csv', file_path=path, uploader=user)
+
+        CSVImporter(job).process_file()
+
+        job.refresh_from_db()
+        assert job.peak_memory_bytes > 0
+
+
+def profile_export(rows, output):
+    """Stream an export of ``rows`` books and return the traced peak heap usage in bytes"""
+    Book.objects.all().delete()
+    Book.objects.bulk_create(
+        [Book(title=f'Book {i}', author=f'Author {i}', isbn=f'97812{i:08d}') for i in range(rows)],
+        batch_size=1000
+    )
+    with traced_memory() as memory:
+        for _ in CatalogExporter(batch_size=500).stream(output, compress=True):
+            pass
+    return memory.peak_bytes
+
+
+@pytest.mark.django_db
+class TestCatalogExportMemory:
+    @pytest.mark.parametrize('output', ['csv', 'ndjson'])
+    def test_peak_memory_does_not_grow_with_catalog_size(self, output):
+        """Test a catalog ten times larger streams in about the same memory"""
+        small = profile_export(1000, output)
+        large = profile_export(10000, output)
+
+        assert large < small * 2 + 256 * 1024
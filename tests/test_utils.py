@@ -0,0 +1,66 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from apps.books.models import Book
+from apps.core.utils import chunked_queryset, keyset_chunks, keyset_iterator
+
+
+@pytest.fixture
+def books():
+    return [
+        Book.objects.create(
+            title=f'Book {i}',
+            author=f'Author {i % 3}',
+            isbn=f'97800000000{i:02d}',
+            publication_year=2000 + i % 4
+        )
+        for i in range(10)
+    ]
+
+
+@pytest.mark.django_db
+class TestKeysetIterator:
+    def test_walks_every_row_once_by_primary_key(self, books):
+        """Every row comes back once, in primary key order"""
+        result = list(keyset_iterator(Book.objects.all(), batch_size=3))
+
+        assert [book.pk for book in result] == sorted(book.pk for book in books)
+
+    def test_batches_without_offset(self, books):
+        """Batches are bounded by LIMIT and continue from the last key, never OFFSET"""
+        with CaptureQueriesContext(connection) as queries:
+            list(keyset_iterator(Book.objects.all(), batch_size=4))
+
+        assert len(queries) == 3
+        assert not any('OFFSET' in query['sql'] for query in queries)
+
+    def test_non_unique_ordering_with_projection(self, books):
+        """A non-unique ordering is made unique with the primary key; values_list projection"""
+        rows = list(keyset_iterator(
+            Book.objects.all(), ordering=('-publication_year',), batch_size=2, values=('publication_year', 'isbn')
+        ))
+
+        expected = list(Book.objects.order_by('-publication_year', 'pk').values_list('publication_year', 'isbn'))
+        assert rows == expected
+
+    def test_server_side_flat_values(self, books):
+        """Server-side mode streams the same rows"""
+        isbns = list(keyset_iterator(Book.objects.all(), batch_size=3, values=('isbn',), flat=True, server_side=True))
+
+        assert isbns == list(Book.objects.order_by('pk').values_list('isbn', flat=True))
+
+    def test_chunks_tolerate_deleting_yielded_rows(self, books):
+        """The caller may delete each chunk before asking for the next one"""
+        seen = []
+        for chunk in keyset_chunks(Book.objects.all(), batch_size=4, values=('pk',), flat=True):
+            seen.extend(chunk)
+            Book.objects.filter(pk__in=chunk).delete()
+
+        assert len(seen) == 10
+        assert not Book.objects.exists()
+
+    def test_chunked_queryset_uses_keyset_chunks(self, books):
+        """The legacy helper keeps its signature"""
+        chunks = list(chunked_queryset(Book.objects.all(), chunk_size=4))
+
+        assert [len(chunk) for chunk in chunks] == [4, 4, 2]